@@ -18,6 +18,7 @@ import signal
 import sys
 import time
 from dataclasses import dataclass
+from functools import partial
 from logging import DEBUG, ERROR, INFO, WARN
 from typing import Callable, ContextManager, Optional, Tuple, Type, Union
 
@@ -37,6 +38,7 @@ from flwr.common.constant import (
     TRANSPORT_TYPES,
     ErrorCode,
 )
+from flwr.common.grpc import GrpcCompression
 from flwr.common.logger import log, warn_deprecated_feature
 from flwr.common.message import Error
 from flwr.common.retry_invoker import RetryInvoker, RetryState, exponential
@@ -81,6 +83,7 @@ def start_client(
     ] = None,
     max_retries: Optional[int] = None,
     max_wait_time: Optional[float] = None,
+    grpc_compression: Optional[GrpcCompression] = None,
 ) -> None:
     """Start a Flower client node which connects to a Flower server.
 
@@ -122,6 +125,11 @@ def start_client(
         The maximum duration before the client stops trying to
         connect to the server in case of connection error.
         If set to None, there is no limit to the total time.
+    grpc_compression : Optional[GrpcCompression] (default: None)
+        Compress gRPC messages larger than its threshold with its algorithm
+        (see `flwr.common.grpc.GrpcCompression`). Only used by the
+        'grpc-bidi' and 'grpc-rere' transports. When None, nothing is
+        compressed.
 
     Examples
     --------
@@ -166,6 +174,7 @@ def start_client(
         authentication_keys=authentication_keys,
         max_retries=max_retries,
         max_wait_time=max_wait_time,
+        grpc_compression=grpc_compression,
     )
     event(EventType.START_CLIENT_LEAVE)
 
@@ -189,6 +198,7 @@ def _start_client_internal(
     ] = None,
     max_retries: Optional[int] = None,
     max_wait_time: Optional[float] = None,
+    grpc_compression: Optional[GrpcCompression] = None,
 ) -> None:
     """Start a Flower client node which connects to a Flower server.
 
@@ -232,6 +242,11 @@ def _start_client_internal(
         The maximum duration before the client stops trying to
         connect to the server in case of connection error.
         If set to None, there is no limit to the total time.
+    grpc_compression : Optional[GrpcCompression] (default: None)
+        Compress gRPC messages larger than its threshold with its algorithm
+        (see `flwr.common.grpc.GrpcCompression`). Only used by the
+        'grpc-bidi' and 'grpc-rere' transports. When None, nothing is
+        compressed.
     """
     if insecure is None:
         insecure = root_certificates is None
@@ -262,7 +277,7 @@ def _start_client_internal(
 
     # Initialize connection context manager
     connection, address, connection_error_type = _init_connection(
-        transport, server_address
+        transport, server_address, grpc_compression
     )
 
     run_tracker = _RunTracker()
@@ -436,6 +451,7 @@ def start_numpy_client(
     root_certificates: Optional[bytes] = None,
     insecure: Optional[bool] = None,
     transport: Optional[str] = None,
+    grpc_compression: Optional[GrpcCompression] = None,
 ) -> None:
     """Start a Flower NumPyClient which connects to a gRPC server.
 
@@ -472,6 +488,11 @@ def start_numpy_client(
         - 'grpc-bidi': gRPC, bidirectional streaming
         - 'grpc-rere': gRPC, request-response (experimental)
         - 'rest': HTTP (experimental)
+    grpc_compression : Optional[GrpcCompression] (default: None)
+        Compress gRPC messages larger than its threshold with its algorithm
+        (see `flwr.common.grpc.GrpcCompression`). Only used by the
+        'grpc-bidi' and 'grpc-rere' transports. When None, nothing is
+        compressed.
 
     Examples
     --------
@@ -526,10 +547,15 @@ def start_numpy_client(
         root_certificates=root_certificates,
         insecure=insecure,
         transport=transport,
+        grpc_compression=grpc_compression,
     )
 
 
-def _init_connection(transport: Optional[str], server_address: str) -> Tuple[
+def _init_connection(
+    transport: Optional[str],
+    server_address: str,
+    grpc_compression: Optional[GrpcCompression] = None,
+) -> Tuple[
     Callable[
         [
             str,
@@ -576,11 +602,15 @@ def _init_connection(transport: Optional[str], server_address: str) -> Tuple[
                 "When using the REST API, please provide `https://` or "
                 "`http://` before the server address (e.g. `http://127.0.0.1:8080`)"
             )
+        if grpc_compression is not None:
+            log(WARN, "`grpc_compression` is ignored by the REST transport.")
         connection, error_type = http_request_response, RequestsConnectionError
     elif transport == TRANSPORT_TYPE_GRPC_RERE:
-        connection, error_type = grpc_request_response, RpcError
+        connection = partial(grpc_request_response, compression=grpc_compression)
+        error_type = RpcError
     elif transport == TRANSPORT_TYPE_GRPC_BIDI:
-        connection, error_type = grpc_connection, RpcError
+        connection = partial(grpc_connection, compression=grpc_compression)
+        error_type = RpcError
     else:
         raise ValueError(
             f"Unknown transport type: {transport} (possible: {TRANSPORT_TYPES})"
@@ -35,7 +35,7 @@ from flwr.common import (
 from flwr.common import recordset_compat as compat
 from flwr.common import serde
 from flwr.common.constant import MessageType, MessageTypeLegacy
-from flwr.common.grpc import create_channel
+from flwr.common.grpc import GrpcCompression, create_channel
 from flwr.common.logger import log
 from flwr.common.retry_invoker import RetryInvoker
 from flwr.proto.transport_pb2 import (  # pylint: disable=E0611
@@ -67,6 +67,7 @@ def grpc_connection(  # pylint: disable=R0913, R0915
     authentication_keys: Optional[  # pylint: disable=unused-argument
         Tuple[ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey]
     ] = None,
+    compression: Optional[GrpcCompression] = None,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[Message]],
@@ -101,6 +102,10 @@ def grpc_connection(  # pylint: disable=R0913, R0915
         The PEM-encoded root certificates as a byte string or a path string.
         If provided, a secure connection using the certificates will be
         established to an SSL-enabled Flower server.
+    compression : Optional[GrpcCompression] (default: None)
+        Compress the messages sent to the server. gRPC Python can only set the
+        compression of a request stream once, so every message of the stream is
+        compressed, whatever its size.
 
     Returns
     -------
@@ -137,7 +142,10 @@ def grpc_connection(  # pylint: disable=R0913, R0915
     )
     stub = FlowerServiceStub(channel)
 
-    server_message_iterator: Iterator[ServerMessage] = stub.Join(iter(queue.get, None))
+    server_message_iterator: Iterator[ServerMessage] = stub.Join(
+        iter(queue.get, None),
+        compression=compression.algorithm if compression is not None else None,
+    )
 
     def receive() -> Message:
         # Receive ServerMessage proto
@@ -226,6 +234,8 @@ def grpc_connection(  # pylint: disable=R0913, R0915
             raise ValueError(f"Invalid message type: {message_type}")
 
         # Send ClientMessage proto
+        if compression is not None:
+            compression.record(msg_proto, compressed=True)
         return queue.put(msg_proto, block=False)
 
     try:
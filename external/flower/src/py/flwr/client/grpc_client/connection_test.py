@@ -18,14 +18,16 @@
 import concurrent.futures
 import socket
 from contextlib import closing
-from typing import Iterator, cast
+from typing import Iterator, Optional, cast
 from unittest.mock import patch
 
 import grpc
+import pytest
 
 from flwr.common import DEFAULT_TTL, ConfigsRecord, Message, Metadata, RecordSet
 from flwr.common import recordset_compat as compat
 from flwr.common.constant import MessageTypeLegacy
+from flwr.common.grpc import GrpcCompression
 from flwr.common.retry_invoker import RetryInvoker, exponential
 from flwr.common.typing import Code, GetPropertiesRes, Status
 from flwr.proto.transport_pb2 import (  # pylint: disable=E0611
@@ -110,7 +112,8 @@ def mock_join(  # type: ignore # pylint: disable=invalid-name
     # pylint: enable=line-too-long
     mock_join,
 )
-def test_integration_connection() -> None:
+@pytest.mark.parametrize("algorithm", [None, "deflate", "gzip"])
+def test_integration_connection(algorithm: Optional[str]) -> None:
     """Create a server and establish a connection to it.
 
     Purpose of this integration test is to simulate multiple clients with multiple
@@ -118,9 +121,12 @@ def test_integration_connection() -> None:
     """
     # Prepare
     port = unused_tcp_port()
+    compression = GrpcCompression(algorithm, threshold=0) if algorithm else None
 
     server = start_grpc_server(
-        client_manager=SimpleClientManager(), server_address=f"[::]:{port}"
+        client_manager=SimpleClientManager(),
+        server_address=f"[::]:{port}",
+        compression=compression,
     )
 
     # Execute
@@ -137,6 +143,7 @@ def test_integration_connection() -> None:
                 max_tries=1,
                 max_time=None,
             ),
+            compression=compression,
         ) as conn:
             receive, send, _, _, _ = conn
 
@@ -165,6 +172,8 @@ def test_integration_connection() -> None:
     # Assert
     for messages_received in results:
         assert messages_received == EXPECTED_NUM_SERVER_MESSAGE
+    if compression is not None:
+        assert compression.metrics()["compressed_messages"] > 0
 
     # Teardown
     server.stop(1)
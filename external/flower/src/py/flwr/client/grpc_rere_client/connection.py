@@ -36,7 +36,7 @@ from flwr.common.constant import (
     PING_DEFAULT_INTERVAL,
     PING_RANDOM_RANGE,
 )
-from flwr.common.grpc import create_channel
+from flwr.common.grpc import GrpcCompression, create_channel
 from flwr.common.logger import log
 from flwr.common.message import Message, Metadata
 from flwr.common.retry_invoker import RetryInvoker
@@ -74,6 +74,7 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
         Tuple[ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey]
     ] = None,
     adapter_cls: Optional[Type[FleetStub]] = None,
+    compression: Optional[GrpcCompression] = None,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[Message]],
@@ -107,6 +108,9 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
         Path of the root certificate. If provided, a secure
         connection using the certificates will be established to an SSL-enabled
         Flower server. Bytes won't work for the REST API.
+    compression : Optional[GrpcCompression] (default: None)
+        Compress the TaskRes pushed to the server when they are larger than
+        the compression threshold.
 
     Returns
     -------
@@ -257,7 +261,12 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
 
         # Serialize ProtoBuf to bytes
         request = PushTaskResRequest(task_res_list=[task_res])
-        _ = retry_invoker.invoke(stub.PushTaskRes, request)
+        if compression is None:
+            _ = retry_invoker.invoke(stub.PushTaskRes, request)
+        else:
+            _ = retry_invoker.invoke(
+                stub.PushTaskRes, request, compression=compression.select(request)
+            )
 
         # Cleanup
         metadata = None
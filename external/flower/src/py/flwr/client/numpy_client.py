@@ -27,6 +27,7 @@ from flwr.common import (
     ndarrays_to_parameters,
     parameters_to_ndarrays,
 )
+from flwr.common.constant import SType
 from flwr.common.typing import (
     Code,
     EvaluateIns,
@@ -229,6 +230,11 @@ def _get_parameters(self: Client, ins: GetParametersIns) -> GetParametersRes:
     )
 
 
+def _reply_tensor_type(tensor_type: str) -> str:
+    """Answer raw tensors with raw tensors, anything else with `.npy` tensors."""
+    return SType.NUMPY_RAW if tensor_type == SType.NUMPY_RAW else SType.NUMPY
+
+
 def _fit(self: Client, ins: FitIns) -> FitRes:
     """Refine the provided parameters using the locally held dataset."""
     # Deconstruct FitIns
@@ -246,7 +252,9 @@ def _fit(self: Client, ins: FitIns) -> FitRes:
 
     # Return FitRes
     parameters_prime, num_examples, metrics = results
-    parameters_prime_proto = ndarrays_to_parameters(parameters_prime)
+    parameters_prime_proto = ndarrays_to_parameters(
+        parameters_prime, tensor_type=_reply_tensor_type(ins.parameters.tensor_type)
+    )
     return FitRes(
         status=Status(code=Code.OK, message="Success"),
         parameters=parameters_prime_proto,
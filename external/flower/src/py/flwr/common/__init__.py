@@ -28,8 +28,10 @@ from .message import Message as Message
 from .message import Metadata as Metadata
 from .parameter import bytes_to_ndarray as bytes_to_ndarray
 from .parameter import ndarray_to_bytes as ndarray_to_bytes
+from .parameter import ndarray_to_raw_bytes as ndarray_to_raw_bytes
 from .parameter import ndarrays_to_parameters as ndarrays_to_parameters
 from .parameter import parameters_to_ndarrays as parameters_to_ndarrays
+from .parameter import raw_bytes_to_ndarray as raw_bytes_to_ndarray
 from .record import Array as Array
 from .record import ConfigsRecord as ConfigsRecord
 from .record import MetricsRecord as MetricsRecord
@@ -94,6 +96,7 @@ __all__ = [
     "MetricsAggregationFn",
     "MetricsRecord",
     "ndarray_to_bytes",
+    "ndarray_to_raw_bytes",
     "now",
     "NDArray",
     "NDArrays",
@@ -102,6 +105,7 @@ __all__ = [
     "parameters_to_ndarrays",
     "ParametersRecord",
     "Properties",
+    "raw_bytes_to_ndarray",
     "ReconnectIns",
     "RecordSet",
     "Scalar",
@@ -71,6 +71,7 @@ class SType:
     """Serialisation type."""
 
     NUMPY = "numpy.ndarray"
+    NUMPY_RAW = "numpy.ndarray.raw"
 
     def __new__(cls) -> SType:
         """Prevent instantiation."""
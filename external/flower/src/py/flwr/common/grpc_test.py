@@ -0,0 +1,73 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `GrpcCompression`."""
+
+
+import grpc
+import pytest
+
+from flwr.proto.fleet_pb2 import PushTaskResRequest  # pylint: disable=E0611
+from flwr.proto.task_pb2 import Task, TaskRes  # pylint: disable=E0611
+
+from .grpc import GrpcCompression
+
+
+def _request(task_type: str) -> PushTaskResRequest:
+    return PushTaskResRequest(
+        task_res_list=[TaskRes(task=Task(task_type=task_type))]
+    )
+
+
+def test_select_by_size() -> None:
+    """Only messages at or above the threshold are compressed."""
+    # Prepare
+    compression = GrpcCompression(algorithm="gzip", threshold=1024)
+    small = _request("fit")
+    large = _request("f(A):-has_car(A,B),short(B)." * 100)
+
+    # Execute
+    small_algorithm = compression.select(small)
+    large_algorithm = compression.select(large)
+    metrics = compression.metrics()
+
+    # Assert
+    assert small_algorithm == grpc.Compression.NoCompression
+    assert large_algorithm == grpc.Compression.Gzip
+    assert metrics["messages"] == 2
+    assert metrics["compressed_messages"] == 1
+    assert metrics["bytes"] == small.ByteSize() + large.ByteSize()
+    assert metrics["compressed_bytes"] == large.ByteSize()
+    assert metrics["bytes_saved"] == 0
+
+
+def test_measure_bytes_saved() -> None:
+    """With `measure=True`, the bytes saved on compressed messages are counted."""
+    # Prepare
+    compression = GrpcCompression(threshold=0, measure=True)
+    message = _request("f(A):-has_car(A,B),short(B)." * 100)
+
+    # Execute
+    compression.select(message)
+    metrics = compression.metrics()
+
+    # Assert
+    assert 0 < metrics["bytes_saved"] < message.ByteSize()
+    assert metrics["compression_seconds"] > 0
+
+
+def test_unknown_algorithm() -> None:
+    """An algorithm gRPC does not support is rejected."""
+    with pytest.raises(ValueError):
+        GrpcCompression(algorithm="zstd")
@@ -15,22 +15,46 @@
 """Parameter conversion."""
 
 
+import struct
 from io import BytesIO
 from typing import cast
 
 import numpy as np
 
+from .constant import SType
 from .typing import NDArray, NDArrays, Parameters
 
+# Raw tensor header: "<dtype>;<dim>,<dim>,...", prefixed by its length and padded so
+# that the array data starts on a 16-byte boundary.
+RAW_HEADER_LENGTH = struct.Struct("<I")
+RAW_ALIGNMENT = 16
 
-def ndarrays_to_parameters(ndarrays: NDArrays) -> Parameters:
-    """Convert NumPy ndarrays to parameters object."""
-    tensors = [ndarray_to_bytes(ndarray) for ndarray in ndarrays]
-    return Parameters(tensors=tensors, tensor_type="numpy.ndarray")
+
+def ndarrays_to_parameters(
+    ndarrays: NDArrays, tensor_type: str = SType.NUMPY
+) -> Parameters:
+    """Convert NumPy ndarrays to parameters object.
+
+    `tensor_type` selects the serialization: `SType.NUMPY` (the `.npy` format) or
+    `SType.NUMPY_RAW` (dtype/shape header followed by the raw array buffer).
+    """
+    if tensor_type == SType.NUMPY_RAW:
+        tensors = [ndarray_to_raw_bytes(ndarray) for ndarray in ndarrays]
+    elif tensor_type == SType.NUMPY:
+        tensors = [ndarray_to_bytes(ndarray) for ndarray in ndarrays]
+    else:
+        raise ValueError(f"Unsupported tensor_type: '{tensor_type}'")
+    return Parameters(tensors=tensors, tensor_type=tensor_type)
 
 
 def parameters_to_ndarrays(parameters: Parameters) -> NDArrays:
-    """Convert parameters object to NumPy ndarrays."""
+    """Convert parameters object to NumPy ndarrays.
+
+    Raw tensors are returned as read-only arrays sharing memory with
+    `parameters.tensors`; copy them before modifying them in place.
+    """
+    if parameters.tensor_type == SType.NUMPY_RAW:
+        return [raw_bytes_to_ndarray(tensor) for tensor in parameters.tensors]
     return [bytes_to_ndarray(tensor) for tensor in parameters.tensors]
 
 
@@ -52,3 +76,36 @@ def bytes_to_ndarray(tensor: bytes) -> NDArray:
     # Source: https://numpy.org/doc/stable/reference/generated/numpy.load.html
     ndarray_deserialized = np.load(bytes_io, allow_pickle=False)
     return cast(NDArray, ndarray_deserialized)
+
+
+def ndarray_to_raw_bytes(ndarray: NDArray) -> bytes:
+    """Serialize NumPy ndarray to a dtype/shape header and its raw buffer."""
+    ndarray = np.asarray(ndarray)
+    # Object and structured arrays have no portable raw representation
+    if ndarray.dtype.hasobject or ndarray.dtype.fields is not None:
+        raise TypeError(
+            f"Cannot serialize dtype {ndarray.dtype} as raw bytes, "
+            f"use tensor_type '{SType.NUMPY}'"
+        )
+    shape = ",".join(str(dim) for dim in ndarray.shape)
+    header = f"{ndarray.dtype.str};{shape}".encode("ascii")
+    padding = -(RAW_HEADER_LENGTH.size + len(header)) % RAW_ALIGNMENT
+    header = RAW_HEADER_LENGTH.pack(len(header) + padding) + header + b" " * padding
+    # The data is copied once, into the returned bytes (twice if not contiguous)
+    data = np.ascontiguousarray(ndarray).reshape(-1).view(np.uint8)
+    return b"".join((header, memoryview(data)))
+
+
+def raw_bytes_to_ndarray(tensor: bytes) -> NDArray:
+    """Deserialize a raw NumPy ndarray without copying its buffer."""
+    (length,) = RAW_HEADER_LENGTH.unpack_from(tensor)
+    offset = RAW_HEADER_LENGTH.size + length
+    header = bytes(tensor[RAW_HEADER_LENGTH.size : offset]).decode("ascii").rstrip()
+    dtype_str, shape_str = header.split(";")
+    dtype = np.dtype(dtype_str)
+    if dtype.hasobject:
+        raise TypeError(f"Cannot deserialize dtype {dtype} from raw bytes")
+    shape = tuple(int(dim) for dim in shape_str.split(",") if dim)
+    count = int(np.prod(shape, dtype=np.int64))
+    ndarray = np.frombuffer(tensor, dtype=dtype, count=count, offset=offset)
+    return cast(NDArray, ndarray.reshape(shape))
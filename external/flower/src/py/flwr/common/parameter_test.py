@@ -21,7 +21,16 @@ tests.
 import numpy as np
 import pytest
 
-from .parameter import bytes_to_ndarray, ndarray_to_bytes
+from .constant import SType
+from .parameter import (
+    bytes_to_ndarray,
+    ndarray_to_bytes,
+    ndarray_to_raw_bytes,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+    raw_bytes_to_ndarray,
+)
+from .typing import NDArray
 
 
 def test_serialisation_deserialisation() -> None:
@@ -37,3 +46,51 @@ def test_serialisation_deserialisation() -> None:
     # Test false positive
     with pytest.raises(AssertionError, match="Arrays are not equal"):
         np.testing.assert_equal(arr_deserialized, np.ones((3, 2)))
+
+
+@pytest.mark.parametrize(
+    "arr",
+    [
+        np.array([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32),
+        np.arange(20, dtype=">i4")[::3],
+        np.array(["p(A):-q(A)", "p(A):-r(A,B)"], dtype="<U1000"),
+        np.array(3.5),
+        np.array([], dtype=np.int64),
+        np.zeros((0, 4)),
+    ],
+)
+def test_raw_serialisation_deserialisation(arr: NDArray) -> None:
+    """Test if the np.ndarray is identical after raw (de-)serialization."""
+    arr_deserialized = raw_bytes_to_ndarray(ndarray_to_raw_bytes(arr))
+
+    assert arr_deserialized.dtype == arr.dtype
+    assert arr_deserialized.shape == arr.shape
+    np.testing.assert_equal(arr_deserialized, arr)
+
+
+def test_raw_deserialisation_is_aligned_view() -> None:
+    """Test that raw tensors are read without copy from an aligned offset."""
+    tensor = ndarray_to_raw_bytes(np.arange(8, dtype=np.float64))
+
+    arr = raw_bytes_to_ndarray(tensor)
+
+    assert not arr.flags.owndata
+    assert arr.flags.aligned
+
+
+def test_raw_rejects_object_arrays() -> None:
+    """Test that object arrays cannot be serialized as raw bytes."""
+    with pytest.raises(TypeError):
+        ndarray_to_raw_bytes(np.array([{"a": 1}], dtype=object))
+
+
+@pytest.mark.parametrize("tensor_type", [SType.NUMPY, SType.NUMPY_RAW])
+def test_parameters_tensor_type(tensor_type: str) -> None:
+    """Test that parameters round-trip with each tensor_type."""
+    ndarrays = [np.arange(6).reshape(2, 3), np.array(["a", "bc"])]
+
+    parameters = ndarrays_to_parameters(ndarrays, tensor_type=tensor_type)
+
+    assert parameters.tensor_type == tensor_type
+    for actual, expected in zip(parameters_to_ndarrays(parameters), ndarrays):
+        np.testing.assert_equal(actual, expected)
@@ -21,6 +21,7 @@ from typing import List, Optional, OrderedDict, cast
 import numpy as np
 
 from ..constant import SType
+from ..parameter import raw_bytes_to_ndarray
 from ..typing import NDArray
 from .typeddict import TypedDict
 
@@ -57,6 +58,8 @@ class Array:
 
     def numpy(self) -> NDArray:
         """Return the array as a NumPy array."""
+        if self.stype == SType.NUMPY_RAW:
+            return raw_bytes_to_ndarray(self.data)
         if self.stype != SType.NUMPY:
             raise TypeError(
                 f"Unsupported serialization type for numpy conversion: '{self.stype}'"
@@ -0,0 +1,189 @@
+"""Span traces of federated rounds, written to local JSONL or Chrome files."""
+
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+TRACE_FORMAT_JSONL = "jsonl"
+TRACE_FORMAT_CHROME = "chrome"
+TRACE_FORMATS = (TRACE_FORMAT_JSONL, TRACE_FORMAT_CHROME)
+
+
+def _split_literals(body: str) -> List[str]:
+    """Split a clause body at the commas outside parentheses."""
+    literals, depth, start = [], 0, 0
+    for i, char in enumerate(body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            literals.append(body[start:i].strip())
+            start = i + 1
+    literals.append(body[start:].strip())
+    return [literal for literal in literals if literal]
+
+
+def _normal_rule(rule: str) -> str:
+    head, _, body = rule.strip().rstrip(".").partition(":-")
+    return head.strip() + ":-" + ",".join(sorted(_split_literals(body)))
+
+
+def hypothesis_id(rules: List[str]) -> str:
+    """Return a short ID of a hypothesis, the same on the server and clients.
+
+    The ID does not depend on the order of the rules or of their body
+    literals, which differs between processes (bodies are frozensets).
+    """
+    normal = sorted(_normal_rule(rule) for rule in rules)
+    return hashlib.sha1("\n".join(normal).encode("utf-8")).hexdigest()[:12]
+
+
+class Tracer:
+    """Record spans (name, start, duration, attributes) of one process.
+
+    Spans carry free-form attributes; `round` and `hyp` (see `hypothesis_id`)
+    correlate the spans of the server and of the clients. Each process writes
+    its own file, `fedpopper/trace_merge.py` merges them.
+
+    Parameters
+    ----------
+    path : Optional[str] (default: None)
+        File to write to. Without a path, spans are not recorded.
+    process : str (default: "server")
+        Name of the process, e.g. "server" or "client-1".
+    trace_format : str (default: "jsonl")
+        "jsonl": one JSON object per line with `name`, `process`, `thread`,
+        `ts` and `dur` (microseconds, `ts` since the epoch) and the attributes.
+        "chrome": Chrome trace event format (complete "X" events), to open in
+        chrome://tracing or Perfetto.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        process: str = "server",
+        trace_format: str = TRACE_FORMAT_JSONL,
+    ) -> None:
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(
+                f"Unknown trace format: {trace_format} (possible: {TRACE_FORMATS})"
+            )
+        self.path = path
+        self.process = process
+        self.trace_format = trace_format
+        self._lock = threading.Lock()
+        self._file = None
+        if path is not None:
+            # pylint: disable-next=consider-using-with
+            self._file = open(path, "w", encoding="utf-8")
+            if trace_format == TRACE_FORMAT_CHROME:
+                self._file.write("[\n")
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if spans are recorded."""
+        return self._file is not None
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """Record the enclosed block as a span.
+
+        The yielded dict can be used to add attributes known only at the end
+        of the span (e.g. an outcome).
+        """
+        if self._file is None:
+            yield attrs
+            return
+        start_us = time.time_ns() // 1000
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.record(name, start_us, (time.perf_counter() - start) * 1e6, attrs)
+
+    def record(
+        self, name: str, start_us: int, duration_us: float, attrs: Dict[str, Any]
+    ) -> None:
+        """Write one span that started at `start_us` (microseconds since epoch)."""
+        if self._file is None:
+            return
+        thread = threading.current_thread().name
+        if self.trace_format == TRACE_FORMAT_CHROME:
+            event: Dict[str, Any] = {
+                "name": name,
+                "ph": "X",
+                "ts": start_us,
+                "dur": round(duration_us, 1),
+                "pid": self.process,
+                "tid": thread,
+                "args": attrs,
+            }
+            line = json.dumps(event, default=str) + ",\n"
+        else:
+            event = {
+                "name": name,
+                "process": self.process,
+                "thread": thread,
+                "ts": start_us,
+                "dur": round(duration_us, 1),
+            }
+            event.update(attrs)
+            line = json.dumps(event, default=str) + "\n"
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+
+    def flush(self) -> None:
+        """Flush the spans written so far."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        """Close the trace file; later spans are dropped."""
+        with self._lock:
+            if self._file is None:
+                return
+            if self.trace_format == TRACE_FORMAT_CHROME:
+                # Drop the trailing comma of the last event
+                self._file.flush()
+                if self._file.tell() > 2:
+                    self._file.seek(self._file.tell() - 2, os.SEEK_SET)
+                self._file.write("\n]\n")
+            self._file.close()
+            self._file = None
+
+
+def read_trace(path: str) -> List[Dict[str, Any]]:
+    """Read a JSONL or Chrome trace file as a list of JSONL-style spans."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        body = text.strip().rstrip(",")
+        if not body.endswith("]"):
+            body = body.rstrip(",\n") + "]"  # Not closed, e.g. after a crash
+        spans = []
+        for event in json.loads(body):
+            span = {
+                "name": event["name"],
+                "process": event["pid"],
+                "thread": event["tid"],
+                "ts": event["ts"],
+                "dur": event["dur"],
+            }
+            span.update(event.get("args", {}))
+            spans.append(span)
+        return spans
+    spans = []
+    for line in text.splitlines():
+        try:
+            spans.append(json.loads(line))
+        except ValueError:
+            break  # Truncated last line after a crash
+    return spans
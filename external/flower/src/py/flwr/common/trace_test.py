@@ -0,0 +1,74 @@
+"""Tests for `Tracer`."""
+
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from .trace import TRACE_FORMATS, Tracer, hypothesis_id, read_trace
+
+
+@pytest.mark.parametrize("trace_format", TRACE_FORMATS)
+def test_span_roundtrip(trace_format: str) -> None:
+    """Spans written in either format are read back with their attributes."""
+    # Prepare
+    path = os.path.join(tempfile.mkdtemp(), "trace")
+    tracer = Tracer(path, "client-1", trace_format)
+
+    # Execute
+    with tracer.span("parse", round=3, hyp="abc"):
+        pass
+    with tracer.span("test", round=3) as span:
+        span["outcome"] = "all"
+    tracer.close()
+    spans = read_trace(path)
+
+    # Assert
+    assert [s["name"] for s in spans] == ["parse", "test"]
+    assert all(s["process"] == "client-1" and s["round"] == 3 for s in spans)
+    assert spans[0]["hyp"] == "abc"
+    assert spans[1]["outcome"] == "all"
+    assert spans[0]["ts"] <= spans[1]["ts"]
+    assert spans[1]["dur"] >= 0
+    if trace_format == "chrome":
+        with open(path, encoding="utf-8") as f:
+            assert len(json.load(f)) == 2
+
+
+def test_unclosed_chrome_trace() -> None:
+    """A Chrome trace that was never closed (crash) is still readable."""
+    # Prepare
+    path = os.path.join(tempfile.mkdtemp(), "trace.json")
+    tracer = Tracer(path, trace_format="chrome")
+
+    # Execute
+    with tracer.span("generate"):
+        pass
+    tracer.flush()
+
+    # Assert
+    assert [s["name"] for s in read_trace(path)] == ["generate"]
+
+
+def test_disabled_tracer() -> None:
+    """Without a path, spans are not recorded."""
+    tracer = Tracer()
+    with tracer.span("fit", round=1) as span:
+        span["x"] = 1
+    tracer.close()
+    assert not tracer.enabled
+
+
+def test_hypothesis_id() -> None:
+    """The ID depends on the rules, not on the order of rules or literals."""
+    rules = ["f(A):-has_car(A,B),short(B).", "f(A):-short(A)."]
+    assert hypothesis_id(rules) == hypothesis_id(rules[::-1])
+    assert hypothesis_id(rules) == hypothesis_id(
+        ["f(A):-short(A)", "f(A):-short(B), has_car(A,B)"]
+    )
+    assert hypothesis_id(rules) != hypothesis_id(rules[:1])
+    assert hypothesis_id(rules) != hypothesis_id(
+        ["f(A):-has_car(A,B),long(B).", "f(A):-short(A)."]
+    )
@@ -40,6 +40,7 @@ from flwr.common.constant import (
     TRANSPORT_TYPE_REST,
 )
 from flwr.common.exit_handlers import register_exit_handlers
+from flwr.common.grpc import GRPC_COMPRESSION_THRESHOLD, GrpcCompression
 from flwr.common.logger import log, warn_deprecated_feature
 from flwr.common.secure_aggregation.crypto.symmetric_encryption import (
     private_key_to_bytes,
@@ -80,6 +81,7 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
     client_manager: Optional[ClientManager] = None,
     grpc_max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
     certificates: Optional[Tuple[bytes, bytes, bytes]] = None,
+    grpc_compression: Optional[GrpcCompression] = None,
 ) -> History:
     """Start a Flower server using the gRPC transport layer.
 
@@ -118,6 +120,10 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
             * CA certificate.
             * server certificate.
             * server private key.
+    grpc_compression : Optional[GrpcCompression] (default: None)
+        Compress the messages sent to the clients when they are larger than the
+        compression threshold, e.g. `GrpcCompression("deflate", threshold=4096)`.
+        Clients decompress them whatever their own configuration.
 
     Returns
     -------
@@ -168,6 +174,7 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
         server_address=address,
         max_message_length=grpc_max_message_length,
         certificates=certificates,
+        compression=grpc_compression,
     )
     log(
         INFO,
@@ -184,6 +191,8 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
 
     # Stop the gRPC server
     grpc_server.stop(grace=1)
+    if grpc_compression is not None:
+        log(INFO, "gRPC compression: %s", grpc_compression.metrics())
 
     event(EventType.START_SERVER_LEAVE)
 
@@ -304,6 +313,7 @@ def run_fleet_api() -> None:
             address=address,
             state_factory=state_factory,
             certificates=certificates,
+            compression=_grpc_compression(args),
         )
         grpc_servers.append(fleet_server)
     else:
@@ -437,6 +447,7 @@ def run_superlink() -> None:
             state_factory=state_factory,
             certificates=certificates,
             interceptors=interceptors,
+            compression=_grpc_compression(args),
         )
         grpc_servers.append(fleet_server)
     else:
@@ -601,16 +612,25 @@ def _try_obtain_certificates(
     )
 
 
+def _grpc_compression(args: argparse.Namespace) -> Optional[GrpcCompression]:
+    """Return the Fleet API gRPC compression set on the command line, if any."""
+    if args.grpc_compression is None:
+        return None
+    return GrpcCompression(args.grpc_compression, args.grpc_compression_threshold)
+
+
 def _run_fleet_api_grpc_rere(
     address: str,
     state_factory: StateFactory,
     certificates: Optional[Tuple[bytes, bytes, bytes]],
     interceptors: Optional[Sequence[grpc.ServerInterceptor]] = None,
+    compression: Optional[GrpcCompression] = None,
 ) -> grpc.Server:
     """Run Fleet API (gRPC, request-response)."""
     # Create Fleet API gRPC server
     fleet_servicer = FleetServicer(
         state_factory=state_factory,
+        compression=compression,
     )
     fleet_add_servicer_to_server_fn = add_FleetServicer_to_server
     fleet_grpc_server = generic_create_grpc_server(
@@ -789,3 +809,17 @@ def _add_args_fleet_api(parser: argparse.ArgumentParser) -> None:
         type=int,
         help="Set the number of concurrent workers for the Fleet API server.",
     )
+    parser.add_argument(
+        "--grpc-compression",
+        default=None,
+        type=str,
+        choices=["deflate", "gzip"],
+        help="Compress the TaskIns sent by the gRPC-rere Fleet API server "
+        "when they are larger than `--grpc-compression-threshold` bytes.",
+    )
+    parser.add_argument(
+        "--grpc-compression-threshold",
+        default=GRPC_COMPRESSION_THRESHOLD,
+        type=int,
+        help="Minimum message size (in bytes) compressed by `--grpc-compression`.",
+    )
@@ -17,9 +17,11 @@
 
 import concurrent.futures
 import io
+import threading
 import timeit
-from logging import INFO, WARN
-from typing import Dict, List, Optional, Tuple, Union
+from functools import partial
+from logging import DEBUG, INFO, WARN
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from flwr.common import (
     Code,
@@ -55,6 +57,113 @@ ReconnectResultsAndFailures = Tuple[
 ]
 
 
+class ClientExecutor:
+    """Thread pool running the client calls of every round of a server.
+
+    The pool is created once and reused across rounds, so short rounds do not
+    pay for creating and joining worker threads. The futures of each round are
+    tracked until they finish, and the dispatch latency of every round is
+    recorded (see `metrics`).
+
+    Parameters
+    ----------
+    max_workers : Optional[int] (default: None)
+        Number of worker threads, see `concurrent.futures.ThreadPoolExecutor`.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers
+        self.closed = False
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="flwr-server"
+        )
+        self._lock = threading.Lock()
+        # Unfinished futures per round (group_id)
+        self._pending: Dict[
+            Optional[int], Set[concurrent.futures.Future]  # type: ignore
+        ] = {}
+        self._metrics: Dict[str, float] = {
+            "rounds": 0,
+            "calls": 0,
+            "dispatch_seconds": 0.0,
+            "max_dispatch_seconds": 0.0,
+            "start_delay_seconds": 0.0,
+            "max_start_delay_seconds": 0.0,
+        }
+
+    def run_round(
+        self,
+        fn: Callable[[ClientProxy, Any], Any],
+        client_instructions: List[Tuple[ClientProxy, Any]],
+        group_id: Optional[int] = None,
+    ) -> Set[concurrent.futures.Future]:  # type: ignore
+        """Call `fn(client_proxy, ins)` for every instruction, wait for all calls.
+
+        Returns the finished futures. `dispatch_seconds` measures how long it
+        takes to hand the calls to the pool, `start_delay_seconds` how long
+        until the last call of the round starts running on a worker.
+        """
+        if self.closed:
+            raise RuntimeError("ClientExecutor has been shut down")
+        started: List[float] = []
+
+        def call(client_proxy: ClientProxy, ins: Any) -> Any:
+            started.append(timeit.default_timer())
+            return fn(client_proxy, ins)
+
+        start_time = timeit.default_timer()
+        submitted_fs = {
+            self._executor.submit(call, client_proxy, ins)
+            for client_proxy, ins in client_instructions
+        }
+        dispatch_time = timeit.default_timer() - start_time
+        with self._lock:
+            self._pending.setdefault(group_id, set()).update(submitted_fs)
+
+        finished_fs, _ = concurrent.futures.wait(
+            fs=submitted_fs,
+            timeout=None,  # Handled in the respective communication stack
+        )
+
+        start_delay = max(started) - start_time if started else 0.0
+        with self._lock:
+            pending = self._pending.get(group_id, set())
+            pending.difference_update(finished_fs)
+            if not pending:
+                self._pending.pop(group_id, None)
+            self._metrics["rounds"] += 1
+            self._metrics["calls"] += len(submitted_fs)
+            self._metrics["dispatch_seconds"] += dispatch_time
+            self._metrics["start_delay_seconds"] += start_delay
+            self._metrics["max_dispatch_seconds"] = max(
+                self._metrics["max_dispatch_seconds"], dispatch_time
+            )
+            self._metrics["max_start_delay_seconds"] = max(
+                self._metrics["max_start_delay_seconds"], start_delay
+            )
+        return finished_fs
+
+    def pending(self, group_id: Optional[int] = None) -> int:
+        """Return the number of unfinished client calls of round `group_id`."""
+        with self._lock:
+            return sum(1 for f in self._pending.get(group_id, ()) if not f.done())
+
+    def metrics(self) -> Dict[str, float]:
+        """Return the dispatch counters of all rounds run so far."""
+        with self._lock:
+            return dict(self._metrics)
+
+    def shutdown(self) -> None:
+        """Cancel the calls that have not started yet and join the workers."""
+        with self._lock:
+            self.closed = True
+            for futures in self._pending.values():
+                for future in futures:
+                    future.cancel()
+            self._pending.clear()
+        self._executor.shutdown(wait=True)
+
+
 class Server:
     """Flower server."""
 
@@ -70,10 +179,24 @@ class Server:
         )
         self.strategy: Strategy = strategy if strategy is not None else FedAvg()
         self.max_workers: Optional[int] = None
+        self.executor: Optional[ClientExecutor] = None
 
     def set_max_workers(self, max_workers: Optional[int]) -> None:
         """Set the max_workers used by ThreadPoolExecutor."""
         self.max_workers = max_workers
+        if self.executor is not None and not self.executor.closed:
+            # The next round starts a pool of the new size
+            self.executor.shutdown()
+
+    def client_executor(self) -> ClientExecutor:
+        """Return the thread pool used for client calls, starting it if needed."""
+        if self.executor is None or self.executor.closed:
+            self.executor = ClientExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    def dispatch_metrics(self) -> Dict[str, float]:
+        """Return the dispatch counters of the client thread pool."""
+        return {} if self.executor is None else self.executor.metrics()
 
     def set_strategy(self, strategy: Strategy) -> None:
         """Replace server strategy."""
@@ -186,6 +309,7 @@ class Server:
             max_workers=self.max_workers,
             timeout=timeout,
             group_id=server_round,
+            executor=self.client_executor(),
         )
         log(
             INFO,
@@ -234,6 +358,7 @@ class Server:
             max_workers=self.max_workers,
             timeout=timeout,
             group_id=server_round,
+            executor=self.client_executor(),
         )
         log(
             INFO,
@@ -257,11 +382,15 @@ class Server:
         clients = [all_clients[k] for k in all_clients.keys()]
         instruction = ReconnectIns(seconds=None)
         client_instructions = [(client_proxy, instruction) for client_proxy in clients]
+        executor = self.client_executor()
         _ = reconnect_clients(
             client_instructions=client_instructions,
             max_workers=self.max_workers,
             timeout=timeout,
+            executor=executor,
         )
+        executor.shutdown()
+        log(DEBUG, "Client executor dispatch metrics: %s", executor.metrics())
 
     def _get_initial_parameters(
         self, server_round: int, timeout: Optional[float]
@@ -293,21 +422,37 @@ class Server:
         return get_parameters_res.parameters
 
 
+def _run_clients(
+    fn: Callable[[ClientProxy, Any], Any],
+    client_instructions: List[Tuple[ClientProxy, Any]],
+    max_workers: Optional[int],
+    group_id: Optional[int],
+    executor: Optional[ClientExecutor],
+) -> Set[concurrent.futures.Future]:  # type: ignore
+    """Run `fn` for every instruction on `executor`, or on a one-off pool."""
+    if executor is not None:
+        return executor.run_round(fn, client_instructions, group_id)
+    one_off = ClientExecutor(max_workers=max_workers)
+    try:
+        return one_off.run_round(fn, client_instructions, group_id)
+    finally:
+        one_off.shutdown()
+
+
 def reconnect_clients(
     client_instructions: List[Tuple[ClientProxy, ReconnectIns]],
     max_workers: Optional[int],
     timeout: Optional[float],
+    executor: Optional[ClientExecutor] = None,
 ) -> ReconnectResultsAndFailures:
     """Instruct clients to disconnect and never reconnect."""
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        submitted_fs = {
-            executor.submit(reconnect_client, client_proxy, ins, timeout)
-            for client_proxy, ins in client_instructions
-        }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
+    finished_fs = _run_clients(
+        partial(reconnect_client, timeout=timeout),
+        client_instructions,
+        max_workers=max_workers,
+        group_id=None,
+        executor=executor,
+    )
 
     # Gather results
     results: List[Tuple[ClientProxy, DisconnectRes]] = []
@@ -341,17 +486,16 @@ def fit_clients(
     max_workers: Optional[int],
     timeout: Optional[float],
     group_id: int,
+    executor: Optional[ClientExecutor] = None,
 ) -> FitResultsAndFailures:
     """Refine parameters concurrently on all selected clients."""
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        submitted_fs = {
-            executor.submit(fit_client, client_proxy, ins, timeout, group_id)
-            for client_proxy, ins in client_instructions
-        }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
+    finished_fs = _run_clients(
+        partial(fit_client, timeout=timeout, group_id=group_id),
+        client_instructions,
+        max_workers=max_workers,
+        group_id=group_id,
+        executor=executor,
+    )
 
     # Gather results
     results: List[Tuple[ClientProxy, FitRes]] = []
@@ -401,17 +545,16 @@ def evaluate_clients(
     max_workers: Optional[int],
     timeout: Optional[float],
     group_id: int,
+    executor: Optional[ClientExecutor] = None,
 ) -> EvaluateResultsAndFailures:
     """Evaluate parameters concurrently on all selected clients."""
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        submitted_fs = {
-            executor.submit(evaluate_client, client_proxy, ins, timeout, group_id)
-            for client_proxy, ins in client_instructions
-        }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
+    finished_fs = _run_clients(
+        partial(evaluate_client, timeout=timeout, group_id=group_id),
+        client_instructions,
+        max_workers=max_workers,
+        group_id=group_id,
+        executor=executor,
+    )
 
     # Gather results
     results: List[Tuple[ClientProxy, EvaluateRes]] = []
@@ -22,6 +22,7 @@ from pathlib import Path
 from typing import List, Optional
 
 import numpy as np
+import pytest
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.serialization import (
     Encoding,
@@ -57,7 +58,7 @@ from flwr.server.client_manager import SimpleClientManager
 
 from .app import _try_setup_client_authentication
 from .client_proxy import ClientProxy
-from .server import Server, evaluate_clients, fit_clients
+from .server import ClientExecutor, Server, evaluate_clients, fit_clients
 
 
 class SuccessClient(ClientProxy):
@@ -203,6 +204,62 @@ def test_set_max_workers() -> None:
     assert server.max_workers == 42
 
 
+def test_client_executor_reused_across_rounds() -> None:
+    """Test that rounds share one thread pool until the clients disconnect."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    for cid in ("0", "1"):
+        client_manager.register(SuccessClient(cid))
+    server = Server(client_manager=client_manager)
+    ins = FitIns(Parameters(tensors=[], tensor_type=""), {})
+    client_instructions = [(c, ins) for c in client_manager.all().values()]
+
+    # Execute
+    executor = server.client_executor()
+    for server_round in (1, 2, 3):
+        results, failures = fit_clients(
+            client_instructions, None, None, server_round, executor=executor
+        )
+        assert len(results) == 2 and not failures
+    same_executor = server.client_executor()
+    server.disconnect_all_clients(timeout=None)
+
+    # Assert
+    assert same_executor is executor
+    assert executor.closed
+    assert executor.pending(3) == 0
+    metrics = server.dispatch_metrics()
+    assert metrics["rounds"] == 4  # 3 fit rounds and the reconnect round
+    assert metrics["calls"] == 8
+    assert metrics["max_dispatch_seconds"] >= 0.0
+    assert server.client_executor() is not executor
+
+
+def test_client_executor_resized() -> None:
+    """Test that set_max_workers replaces a running thread pool."""
+    # Prepare
+    server = Server(client_manager=SimpleClientManager())
+    executor = server.client_executor()
+
+    # Execute
+    server.set_max_workers(2)
+
+    # Assert
+    assert executor.closed
+    assert server.client_executor().max_workers == 2
+
+
+def test_client_executor_shutdown() -> None:
+    """Test that a shut down ClientExecutor refuses new rounds."""
+    # Prepare
+    executor = ClientExecutor()
+    executor.shutdown()
+
+    # Execute & Assert
+    with pytest.raises(RuntimeError):
+        executor.run_round(lambda client, ins: None, [], group_id=1)
+
+
 def test_setup_client_auth() -> None:  # pylint: disable=R0914
     """Test setup client authentication."""
     # Prepare
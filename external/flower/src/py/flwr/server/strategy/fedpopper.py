@@ -24,16 +24,21 @@ from flwr.server.strategy.aggregate import aggregate, weighted_loss_avg
 from .strategy import Strategy
 
 from popper.loop import Outcome, build_rules, ground_rules
-from popper.core import Clause
+from popper.core import Clause, Literal
 from popper.asp import ClingoGrounder, ClingoSolver
 from popper.generate import generate_program
 from popper.constrain import Constrain
 from popper.structural_tester import StructuralTester
 from popper.util import Settings, Stats
+from flwr.common.trace import TRACE_FORMAT_JSONL, Tracer, hypothesis_id
 
 import numpy as np
+import json
+import multiprocessing
+import os
 import threading
 import logging
+import time
 WARNING_MIN_AVAILABLE_CLIENTS_TOO_LOW = """
 Setting `min_available_clients` lower than `min_fit_clients` or
 `min_evaluate_clients` can cause the server to fail when there are too few clients
@@ -88,6 +93,328 @@ def aggregate_outcomes(outcomes):
 
 
 
+# ------------------------------------------------------
+#   COMPACT HYPOTHESIS / FEEDBACK ENCODING
+#   (used on the pipe between the strategy and the search process)
+# ------------------------------------------------------
+
+def _encode_literal(literal):
+    return (literal.predicate, tuple(literal.arguments), tuple(literal.directions))
+
+def _decode_literal(encoded):
+    predicate, arguments, directions = encoded
+    return Literal(predicate, tuple(arguments), tuple(directions))
+
+def encode_program(program):
+    """Program -> nested tuples of strings (cheap to pickle)."""
+    return tuple(
+        (_encode_literal(head), tuple(_encode_literal(lit) for lit in body))
+        for head, body in program
+    )
+
+def decode_program(encoded):
+    return tuple(
+        (_decode_literal(head), frozenset(_decode_literal(lit) for lit in body))
+        for head, body in encoded
+    )
+
+def encode_feedback(outcome, fed_score):
+    return (OUTCOME_ENCODING[outcome[0]], OUTCOME_ENCODING[outcome[1]], fed_score)
+
+def decode_feedback(encoded):
+    e_pos, e_neg, fed_score = encoded
+    return (OUTCOME_DECODING[e_pos], OUTCOME_DECODING[e_neg]), fed_score
+
+
+# ------------------------------------------------------
+#   OUTCOME MEMO
+# ------------------------------------------------------
+
+def canonical_program(program):
+    return "|".join(sorted(Clause.to_canonical(clause) for clause in program))
+
+class OutcomeMemo:
+    """
+    Aggregated outcome and score of every hypothesis already tested by the
+    clients, keyed by canonical program. With a path, entries are appended to
+    a JSONL file and reloaded on start, so a restarted server does not pay
+    again for rounds it has already run.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.outcomes = {}
+        self.hits = 0
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # truncated last line after a crash
+                    self.outcomes[entry["program"]] = (tuple(entry["outcome"]), entry["score"])
+        self._file = open(path, "a") if path else None
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def get(self, key):
+        hit = self.outcomes.get(key)
+        if hit is not None:
+            self.hits += 1
+        return hit
+
+    def put(self, key, outcome, fed_score):
+        self.outcomes[key] = (tuple(outcome), fed_score)
+        if self._file is not None:
+            self._file.write(json.dumps({"program": key, "outcome": list(outcome), "score": fed_score}) + "\n")
+            self._file.flush()
+
+
+# ------------------------------------------------------
+#   SEARCH JOURNAL (checkpoint / resume)
+# ------------------------------------------------------
+
+def _to_tuple(x):
+    return tuple(_to_tuple(y) for y in x) if isinstance(x, list) else x
+
+def encode_ground_rules(rules):
+    return [[head, list(body)] for head, body in rules]
+
+def decode_ground_rules(encoded):
+    return [(_to_tuple(head), _to_tuple(body)) for head, body in encoded]
+
+class SearchJournal:
+    """
+    Append-only journal of the search, one JSON line per tested hypothesis:
+    literal size, program, aggregated outcome, score and the ground
+    constraints added to the solver. Replaying it rebuilds the ClingoSolver
+    state without contacting any client.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def records(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return  # truncated last line after a crash
+
+    def append(self, size, program, outcome, fed_score, ground_rules):
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self._file.write(json.dumps({
+            "size": size,
+            "program": encode_program(program),
+            "outcome": list(outcome),
+            "score": fed_score,
+            "rules": encode_ground_rules(ground_rules),
+        }) + "\n")
+        self._file.flush()
+
+    def best(self):
+        """(best score, best hypothesis) of the journaled rounds, (None, None) if empty."""
+        best_score, best_program = None, None
+        for record in self.records():
+            if best_score is None or record["score"] > best_score:
+                best_score, best_program = record["score"], record["program"]
+        return best_score, decode_program(best_program) if best_program is not None else None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def replay_journal(journal, stats, solver):
+    """
+    Re-add the journaled ground constraints to a fresh solver.
+    Returns (size, best_score, best_hypothesis) to resume from; size is None
+    for an empty journal.
+    """
+    size, best_score, best_hypothesis = None, None, None
+    for record in journal.records():
+        if record["size"] != size:
+            size = record["size"]
+            stats.update_num_literals(size)
+            solver.update_number_of_literals(size)
+        rules = decode_ground_rules(record["rules"])
+        solver.add_ground_clauses(rules)
+        stats.total_programs += 1
+        stats.total_ground_rules += len(rules)
+        if best_score is None or record["score"] > best_score:
+            best_score = record["score"]
+            best_hypothesis = decode_program(record["program"])
+    if size is not None:
+        log(INFO, f"Journal replayed: {stats.total_programs} rounds, resuming at size {size}")
+    return size, best_score, best_hypothesis
+
+
+# ------------------------------------------------------
+#   POPPER SEARCH (generate / federated test / build / ground / add)
+# ------------------------------------------------------
+
+SEARCH_SOLUTION  = "solution"
+SEARCH_TIMEOUT   = "timeout"
+SEARCH_EXHAUSTED = "exhausted"
+
+def run_popper_search(settings, stats, solver, grounder, constrainer, tester, federated_test, journal=None, tracer=None):
+    """
+    Popper generate-and-test loop where testing is delegated to
+    federated_test(program) -> (outcome, fed_score).
+    With a journal, the search first replays it and every round is appended.
+    With a tracer, every stage is recorded as a span tagged with the
+    hypothesis ID. Returns (status, best_hypothesis, solution).
+    """
+    wall_start = time.perf_counter()
+    TIMEOUT = 600
+    tracer = tracer if tracer is not None else Tracer()
+    hyp = None
+
+    best_score = None
+    best_hypothesis = None
+
+    resumed_size = None
+    if journal is not None:
+        with stats.duration('replay'):
+            resumed_size, best_score, best_hypothesis = replay_journal(journal, stats, solver)
+
+    try:
+        for size in range(resumed_size or 1, settings.max_literals + 1):
+
+            if size != resumed_size:
+                stats.update_num_literals(size)
+                solver.update_number_of_literals(size)
+
+            while True:
+
+                # TIMEOUT
+                if time.perf_counter() - wall_start > TIMEOUT:
+                    log(INFO, "TIMEOUT reached.")
+                    return SEARCH_TIMEOUT, best_hypothesis, None
+
+                # GENERATE
+                with stats.duration('generate'), tracer.span('generate', size=size) as span:
+                    model = solver.get_model()
+                    if not model:
+                        break
+                    program, before, min_clause = generate_program(model)
+                    stats.total_programs += 1
+                    if tracer.enabled:
+                        hyp = span['hyp'] = hypothesis_id([Clause.to_code(r) for r in program])
+
+                # FEDERATED TEST — envoie hypothèse, attend feedback
+                with tracer.span('federated_test', hyp=hyp):
+                    outcome, fed_score = federated_test(program)
+
+                log(INFO, f"outcome={outcome}, score={fed_score}")
+
+                # UPDATE BEST
+                if best_score is None or fed_score > best_score:
+                    best_score = fed_score
+                    best_hypothesis = program
+
+                # STOP CONDITION
+                if outcome == ("all", "none"):
+                    log(INFO, "Solution found (ALL, NONE)!")
+                    return SEARCH_SOLUTION, best_hypothesis, program
+
+                # BUILD / GROUND / ADD
+                with stats.duration('build'), tracer.span('build', hyp=hyp):
+                    rules = build_rules(
+                        settings, stats, constrainer,
+                        tester, program, before, min_clause, outcome
+                    )
+                with stats.duration('ground'), tracer.span('ground', hyp=hyp):
+                    rules = ground_rules(
+                        stats, grounder,
+                        solver.max_clauses, solver.max_vars,
+                        rules
+                    )
+                with stats.duration('add'), tracer.span('add', hyp=hyp):
+                    solver.add_ground_clauses(rules)
+
+                if journal is not None:
+                    journal.append(size, program, outcome, fed_score, rules)
+
+    except Exception as e:
+        log(WARNING, f"Popper loop error: {e}")
+        import traceback; traceback.print_exc()
+
+    return SEARCH_EXHAUSTED, best_hypothesis, None
+
+def search_counters(stats):
+    return (stats.total_programs, stats.total_rules, stats.total_ground_rules, stats.durations)
+
+def merge_search_counters(stats, counters):
+    """Add the search process statistics to the strategy-side Stats."""
+    programs, rules, ground_rules, durations = counters
+    stats.total_programs += programs
+    stats.total_rules += rules
+    stats.total_ground_rules += ground_rules
+    # keep the durations recorded on the strategy side (e.g. before the search started)
+    for operation, histogram in durations.items():
+        if operation in stats.durations:
+            stats.durations[operation].merge(histogram)
+        else:
+            stats.durations[operation] = histogram
+
+SEARCH_LOGGERS = ("popper", "flwr")
+
+# evaluation cadence (FedPopper(evaluate_cadence=...)); every cadence also
+# evaluates the final hypothesis once when the search stops
+EVALUATE_EVERY = "every"  # every evaluate_every rounds
+EVALUATE_BEST  = "best"   # rounds whose hypothesis improved the best score
+EVALUATE_END   = "end"    # only the final hypothesis
+EVALUATE_CADENCES = (EVALUATE_EVERY, EVALUATE_BEST, EVALUATE_END)
+
+def search_trace_path(trace_path):
+    """Trace file of the search process: <trace>.search<ext>."""
+    root, ext = os.path.splitext(trace_path)
+    return f"{root}.search{ext}"
+
+def popper_search_process(settings, conn, log_levels, journal_path=None, trace_path=None, trace_format=TRACE_FORMAT_JSONL):
+    """
+    Entry point of the search process (FedPopper(search_process=True)).
+    Clingo grounding, constraint building and ground_rules run here, so they
+    do not compete for the GIL with the gRPC threads of the Flower server.
+    """
+    # mirror the logging levels of the server process
+    for name, level in log_levels.items():
+        logging.getLogger(name).setLevel(level)
+    stats = Stats(log_best_programs=settings.info)
+
+    def federated_test(program):
+        conn.send(("hyp", encode_program(program)))
+        return decode_feedback(conn.recv())
+
+    tracer = Tracer(search_trace_path(trace_path), "search", trace_format) if trace_path else Tracer()
+    journal = SearchJournal(journal_path) if journal_path else None
+    try:
+        status, best_hypothesis, solution = run_popper_search(
+            settings, stats, ClingoSolver(settings), ClingoGrounder(),
+            Constrain(), StructuralTester(), federated_test,
+            journal, tracer
+        )
+    finally:
+        if journal is not None:
+            journal.close()
+    tracer.close()
+    conn.send((
+        "done",
+        status,
+        encode_program(best_hypothesis) if best_hypothesis is not None else None,
+        encode_program(solution) if solution is not None else None,
+        search_counters(stats),
+    ))
+    conn.close()
+
+
 class FedPopper(Strategy):
 
     def __init__(
@@ -105,21 +432,42 @@ class FedPopper(Strategy):
     min_available_clients: int = 2,
     fit_metrics_aggregation_fn=None,
     accept_failures: bool = False,
+    search_process: bool = False,
+    memo=None,
+    journal_path=None,
+    evaluate_cadence: str = EVALUATE_END,
+    evaluate_every: int = 1,
+    trace_path=None,
+    trace_format: str = TRACE_FORMAT_JSONL,
     ):
         super().__init__()
 
+        if evaluate_cadence not in EVALUATE_CADENCES:
+            raise ValueError(f"Unknown evaluate_cadence: {evaluate_cadence} (possible: {EVALUATE_CADENCES})")
+        if evaluate_every < 1:
+            raise ValueError("evaluate_every must be at least 1")
+
         if (
             min_fit_clients > min_available_clients
             or min_evaluate_clients > min_available_clients
         ):
             log(WARNING, WARNING_MIN_AVAILABLE_CLIENTS_TOO_LOW)
 
-        self.settings    = settings
-        self.solver      = solver      if solver      is not None else ClingoSolver(settings)
-        self.grounder    = grounder    if grounder    is not None else ClingoGrounder()
-        self.constrainer = constrainer if constrainer is not None else Constrain()
-        self.tester      = tester      if tester      is not None else StructuralTester()
+        self.settings       = settings
+        self.search_process = search_process
+        if search_process:
+            self.solver = self.grounder = self.constrainer = self.tester = None
+        else:
+            self.solver      = solver      if solver      is not None else ClingoSolver(settings)
+            self.grounder    = grounder    if grounder    is not None else ClingoGrounder()
+            self.constrainer = constrainer if constrainer is not None else Constrain()
+            self.tester      = tester      if tester      is not None else StructuralTester()
         self.stats       = stats       if stats       is not None else Stats(log_best_programs=settings.info)
+        self.memo        = memo
+        self.journal_path = journal_path
+        # spans of the Flower rounds; the search loop gets its own file when
+        # it runs in a child process (see search_trace_path)
+        self.tracer = Tracer(trace_path, "server", trace_format)
 
         self.fraction_fit          = fraction_fit
         self.fraction_evaluate     = fraction_evaluate
@@ -128,9 +476,19 @@ class FedPopper(Strategy):
         self.min_available_clients = min_available_clients
         self.fit_metrics_aggregation_fn = fit_metrics_aggregation_fn
         self.accept_failures = accept_failures
+        self.evaluate_cadence = evaluate_cadence
+        self.evaluate_every   = evaluate_every
+
+        self._fit_parameters  = None   # hypothesis sent in the last fit round
+        self._fit_hyp         = None   # its ID, when tracing
+        self._new_best        = False  # it improved best_score
+        self._final_evaluated = False
 
         self.best_score      = None
         self.best_hypothesis = None
+        if journal_path:
+            # resumed run: the rounds of the journal are not replayed to the clients
+            self.best_score, self.best_hypothesis = SearchJournal(journal_path).best()
         self.solution_params = None
         self.early_stop      = False
 
@@ -140,8 +498,31 @@ class FedPopper(Strategy):
         self._current_hyp = None
         self._current_fb  = None
 
+        if search_process:
+            # clingo/pyswip objects cannot cross process boundaries: the
+            # child builds its own solver, grounder, constrainer and tester.
+            if any(x is not None for x in (solver, grounder, constrainer, tester)):
+                log(WARNING, "search_process=True: solver/grounder/constrainer/tester "
+                             "arguments are ignored, the search process builds its own.")
+            ctx = multiprocessing.get_context("spawn")
+            self._search_conn, child_conn = ctx.Pipe()
+            self._search_process = ctx.Process(
+                target=popper_search_process,
+                args=(settings, child_conn, {
+                    name: logging.getLogger(name).getEffectiveLevel()
+                    for name in SEARCH_LOGGERS
+                }, journal_path, trace_path, trace_format),
+                daemon=True,
+                name="PopperSearch"
+            )
+            self._search_process.start()
+            child_conn.close()
+            target = self._popper_process_relay
+        else:
+            target = self._popper_loop
+
         self._popper_thread = threading.Thread(
-            target=self._popper_loop,
+            target=target,
             daemon=True,
             name="PopperLoop"
         )
@@ -156,94 +537,77 @@ class FedPopper(Strategy):
     # Remplace federated_test() par _send_and_wait()
     # ------------------------------------------------------------------
     def _popper_loop(self):
-        import time
-        wall_start = time.perf_counter()
-        TIMEOUT = 600
-
-        best_score = None
+        journal = SearchJournal(self.journal_path) if self.journal_path else None
+        try:
+            status, best_hypothesis, solution = run_popper_search(
+                self.settings, self.stats, self.solver, self.grounder,
+                self.constrainer, self.tester, self._send_and_wait,
+                journal, self.tracer
+            )
+        finally:
+            if journal is not None:
+                journal.close()
+        self._finish_search(status, best_hypothesis, solution)
 
+    # ------------------------------------------------------------------
+    # POPPER PROCESS — la boucle tourne dans un processus enfant.
+    # Ce thread relaie seulement les hypothèses/feedbacks sur le pipe,
+    # il ne tient donc presque jamais le GIL.
+    # ------------------------------------------------------------------
+    def _popper_process_relay(self):
+        status, best_hypothesis, solution = SEARCH_EXHAUSTED, None, None
         try:
-            for size in range(1, self.settings.max_literals + 1):
-
-                self.stats.update_num_literals(size)
-                self.solver.update_number_of_literals(size)
-
-                while True:
-
-                    # TIMEOUT
-                    if time.perf_counter() - wall_start > TIMEOUT:
-                        log(INFO, "TIMEOUT reached.")
-                        self.early_stop = True
-                        self._hyp_ready.set()
-                        return
-
-                    # GENERATE
-                    with self.stats.duration('generate'):
-                        model = self.solver.get_model()
-                        if not model:
-                            break
-                        program, before, min_clause = generate_program(model)
-                        self.stats.total_programs += 1
-
-                    # FEDERATED TEST — envoie hypothèse, attend feedback
-
-                    with self._lock:
-                        self._current_hyp = program
-                        self._current_before = before
-                        self._current_min_clause = min_clause
-
-                    outcome, fed_score = self._send_and_wait(program)
-                    
-                    log(INFO, f"outcome={outcome}, score={fed_score}")
-
-                    
-
-                    # UPDATE BEST
-                    if best_score is None or fed_score > best_score:
-                        best_score = fed_score
-                        self.best_hypothesis = program
-
-                    # STOP CONDITION
-                    if outcome == ("all", "none"):
-                        log(INFO, "Solution found (ALL, NONE)!")
-                        rules_arr = np.array(
-                            [Clause.to_code(r) for r in program],
-                            dtype="<U1000"
-                        )
-                        self.solution_params = ndarrays_to_parameters([rules_arr])
-                        self.early_stop = True
-                        self._hyp_ready.set()  # débloque configure_fit
-                        return
-
-                    # BUILD / GROUND / ADD
-                    with self.stats.duration('build'):
-                        rules = build_rules(
-                            self.settings, self.stats, self.constrainer,
-                            self.tester, program, before, min_clause, outcome
-                        )
-                    with self.stats.duration('ground'):
-                        rules = ground_rules(
-                            self.stats, self.grounder,
-                            self.solver.max_clauses, self.solver.max_vars,
-                            rules
-                        )
-                    with self.stats.duration('add'):
-                        self.solver.add_ground_clauses(rules)
-
-        except Exception as e:
-            log(WARNING, f"Popper loop error: {e}")
-            import traceback; traceback.print_exc()
-
-        # Recherche exhaustée
-        log(INFO, "Search exhausted.")
+            while True:
+                msg = self._search_conn.recv()
+                if msg[0] == "hyp":
+                    outcome, fed_score = self._send_and_wait(decode_program(msg[1]))
+                    self._search_conn.send(encode_feedback(outcome, fed_score))
+                    continue
+
+                # ("done", status, best, solution, counters)
+                _, status, best, sol, counters = msg
+                best_hypothesis = decode_program(best) if best is not None else None
+                solution = decode_program(sol) if sol is not None else None
+                merge_search_counters(self.stats, counters)
+                break
+        except (EOFError, OSError) as e:
+            log(WARNING, f"Popper search process died: {e}")
+
+        self._search_process.join(timeout=5)
+        self._finish_search(status, best_hypothesis, solution)
+
+    def _finish_search(self, status, best_hypothesis, solution):
+        if best_hypothesis is not None:
+            self.best_hypothesis = best_hypothesis
+
+        if status == SEARCH_SOLUTION:
+            rules_arr = np.array(
+                [Clause.to_code(r) for r in solution],
+                dtype="<U1000"
+            )
+            self.solution_params = ndarrays_to_parameters([rules_arr])
+        elif status == SEARCH_EXHAUSTED:
+            # Recherche exhaustée
+            log(INFO, "Search exhausted.")
+
         self.early_stop = True
-        self._hyp_ready.set()
+        self.tracer.flush()
+        self._hyp_ready.set()  # débloque configure_fit
 
     def _send_and_wait(self, program):
         """
         Envoie l'hypothèse au thread Flower et attend le feedback.
         Equivalent de federated_test() dans srvpopper.
         """
+        # Hypothèse déjà testée par les clients → pas de round Flower
+        key = None
+        if self.memo is not None:
+            key = canonical_program(program)
+            hit = self.memo.get(key)
+            if hit is not None:
+                log(INFO, f"Memo hit, federated test skipped: outcome={hit[0]}, score={hit[1]}")
+                return hit
+
         # Stocker l'hypothèse pour configure_fit
         with self._lock:
             self._current_hyp = program
@@ -256,7 +620,11 @@ class FedPopper(Strategy):
         self._fb_ready.clear()
 
         with self._lock:
-            outcome, fed_score = self._current_fb
+            outcome, fed_score, tested = self._current_fb
+
+        # a rejected round carries a synthetic outcome: never memoise it
+        if key is not None and tested:
+            self.memo.put(key, outcome, fed_score)
 
         return outcome, fed_score
 
@@ -307,8 +675,16 @@ class FedPopper(Strategy):
 
         log(INFO, f"[Round {server_round}] selected clients = {[c.cid for c in clients]}")
 
+        self._fit_parameters = parameters
+        config = {"round": server_round}
+        if self.tracer.enabled:
+            # lets the clients tag their spans with the hypothesis
+            config["hyp"] = hypothesis_id(parameters_to_ndarrays(parameters)[0].tolist())
+            self._fit_hyp = config["hyp"]
+            self.tracer.record("configure_fit", time.time_ns() // 1000, 0.0,
+                               {"round": server_round, "hyp": config["hyp"], "clients": len(clients)})
         return [
-            (c, FitIns(parameters, {"round": server_round}))
+            (c, FitIns(parameters, config))
             for c in clients
         ]
     def configure_fitold(self, server_round, parameters, client_manager):
@@ -332,7 +708,7 @@ class FedPopper(Strategy):
         """Reject a partial/failed Flower round while keeping Popper synchronized."""
 
         with self._lock:
-            self._current_fb = (("none", "some"), fed_score)
+            self._current_fb = (("none", "some"), fed_score, False)
 
         self._fb_ready.set()
 
@@ -375,6 +751,15 @@ class FedPopper(Strategy):
     server_round: int,
     results,
     failures,
+):
+        with self.tracer.span("aggregate_fit", round=server_round, hyp=self._fit_hyp):
+            return self._aggregate_fit(server_round, results, failures)
+
+    def _aggregate_fit(
+    self,
+    server_round: int,
+    results,
+    failures,
 ):
         log(INFO, f"[Round {server_round}] results={len(results)} failures={len(failures)}")
 
@@ -428,14 +813,22 @@ class FedPopper(Strategy):
         fed_score = sum(scores)
 
         log(INFO, f"[Round {server_round}] aggregated outcome={outcome}, fed_score={fed_score}")
+        self.tracer.record("aggregate", time.time_ns() // 1000, 0.0,
+                           {"round": server_round, "hyp": self._fit_hyp, "outcome": list(outcome), "score": fed_score})
+
+        # same rule as the search loop's best hypothesis
+        if self.best_score is None or fed_score > self.best_score:
+            self.best_score = fed_score
+            self._new_best = True
 
         with self._lock:
-            self._current_fb = (outcome, fed_score)
+            self._current_fb = (outcome, fed_score, True)
 
         self._fb_ready.set()
 
-        self._hyp_ready.wait()
-        self._hyp_ready.clear()
+        with self.tracer.span("wait_search", round=server_round):
+            self._hyp_ready.wait()
+            self._hyp_ready.clear()
 
         if self.early_stop:
             if self.solution_params:
@@ -457,11 +850,13 @@ class FedPopper(Strategy):
         with self._lock:
             program = self._current_hyp
 
-        rules_arr = np.array(
-            [Clause.to_code(r) for r in program],
-            dtype="<U1000"
-        )
-        return ndarrays_to_parameters([rules_arr]), {"fed_score": fed_score}
+        with self.tracer.span("serialize", round=server_round):
+            rules_arr = np.array(
+                [Clause.to_code(r) for r in program],
+                dtype="<U1000"
+            )
+            parameters = ndarrays_to_parameters([rules_arr])
+        return parameters, {"fed_score": fed_score}
 
     def aggregate_fitold(
         self,
@@ -505,7 +900,7 @@ class FedPopper(Strategy):
 
         # Passer le feedback au thread Popper
         with self._lock:
-            self._current_fb = (outcome, fed_score)
+            self._current_fb = (outcome, fed_score, True)
 
         self._fb_ready.set()   # réveille _send_and_wait()
 
@@ -543,12 +938,12 @@ class FedPopper(Strategy):
     # configure_evaluate
     # ------------------------------------------------------------------
     def configure_evaluate(self, server_round, parameters, client_manager):
-        if self.early_stop:
-            return []
         if self.fraction_evaluate == 0.0:
             return []
 
-        params_for_eval = self.solution_params or parameters
+        params_for_eval = self._evaluation_parameters(server_round, parameters)
+        if params_for_eval is None:
+            return []
 
         sample_size, min_num_clients = self.num_evaluation_clients(
             client_manager.num_available()
@@ -559,6 +954,29 @@ class FedPopper(Strategy):
         )
         return [(c, EvaluateIns(params_for_eval, {})) for c in clients]
 
+    def _evaluation_parameters(self, server_round, parameters):
+        """
+        Parameters to evaluate after this round, or None to skip evaluation.
+        Rounds evaluate the hypothesis the clients have just fitted (and can
+        reuse the confusion matrix of their fit), not the next one.
+        """
+        if self.early_stop:
+            if self._final_evaluated:
+                return None
+            self._final_evaluated = True
+            return self.solution_params or parameters
+
+        if self._fit_parameters is None:
+            return None
+        if self.evaluate_cadence == EVALUATE_EVERY:
+            if server_round % self.evaluate_every == 0:
+                return self._fit_parameters
+        elif self.evaluate_cadence == EVALUATE_BEST:
+            if self._new_best:
+                self._new_best = False
+                return self._fit_parameters
+        return None
+
     # ------------------------------------------------------------------
     # aggregate_evaluate
     # ------------------------------------------------------------------
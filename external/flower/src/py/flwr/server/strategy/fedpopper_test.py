@@ -0,0 +1,35 @@
+"""SearchJournal tests."""
+
+
+import os
+import tempfile
+
+from popper.core import Literal
+
+from .fedpopper import SearchJournal
+
+
+def _program(body_predicate: str):
+    head = Literal("f", ("A",), ("+",))
+    return ((head, frozenset([Literal(body_predicate, ("A",), ("+",))])),)
+
+
+def test_journal_best_and_close() -> None:
+    """The best round is restored and the handle is closed."""
+    # Prepare
+    path = os.path.join(tempfile.mkdtemp(), "journal.jsonl")
+    journal = SearchJournal(path)
+
+    # Execute
+    journal.append(1, _program("p"), ("some", "none"), 2.0, [])
+    journal.append(1, _program("q"), ("some", "some"), 5.0, [])
+    journal.append(2, _program("r"), ("none", "none"), 1.0, [])
+    handle = journal._file  # pylint: disable=protected-access
+    journal.close()
+    best_score, best_hypothesis = SearchJournal(path).best()
+
+    # Assert
+    assert handle.closed
+    assert best_score == 5.0
+    assert best_hypothesis == _program("q")
+    assert SearchJournal(os.path.join(os.path.dirname(path), "none")).best() == (None, None)
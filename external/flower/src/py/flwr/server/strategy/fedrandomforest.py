@@ -36,6 +36,7 @@ from flwr.common import (
     ndarrays_to_parameters,
     parameters_to_ndarrays,
 )
+from flwr.common.constant import SType
 from flwr.common.logger import log
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
@@ -91,6 +92,9 @@ class FedRandomForest(Strategy):
         Metrics aggregation function, optional.
     inplace : bool (default: True)
         Enable (True) or disable (False) in-place aggregation of model updates.
+    tensor_type : str (default: "numpy.ndarray")
+        Serialization of the aggregated forest, `SType.NUMPY_RAW` sends the raw
+        buffer without the `.npy` header.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
@@ -117,6 +121,7 @@ class FedRandomForest(Strategy):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         inplace: bool = True,
+        tensor_type: str = SType.NUMPY,
     ) -> None:
         super().__init__()
 
@@ -139,6 +144,7 @@ class FedRandomForest(Strategy):
         self.fit_metrics_aggregation_fn = fit_metrics_aggregation_fn
         self.evaluate_metrics_aggregation_fn = evaluate_metrics_aggregation_fn
         self.inplace = inplace
+        self.tensor_type = tensor_type
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -266,7 +272,7 @@ class FedRandomForest(Strategy):
 
         if not trees:
             print("❌ Aucun arbre valide reçu. On retourne un modèle vide.")
-            return ndarrays_to_parameters([]), {}
+            return ndarrays_to_parameters([], self.tensor_type), {}
 
         # ✅ Création du modèle agrégé
         rf = RandomForestClassifier(n_estimators=len(trees))
@@ -281,7 +287,7 @@ class FedRandomForest(Strategy):
 
         rf_bytes = pickle.dumps(rf)
         rf_array = np.frombuffer(rf_bytes, dtype=np.uint8)
-        return ndarrays_to_parameters([rf_array]), {}
+        return ndarrays_to_parameters([rf_array], self.tensor_type), {}
 
 
 
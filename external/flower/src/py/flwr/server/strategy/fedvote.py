@@ -17,6 +17,7 @@ from flwr.common import (
     ndarrays_to_parameters,
     parameters_to_ndarrays,
 )
+from flwr.common.constant import SType
 from flwr.common.logger import log
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
@@ -79,6 +80,7 @@ class FedVote(Strategy):
         initial_parameters: Optional[Parameters] = None,
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        tensor_type: str = SType.NUMPY,  # SType.NUMPY_RAW: no .npy header nor copy
     ) -> None:
         super().__init__()
         if (
@@ -104,6 +106,7 @@ class FedVote(Strategy):
         self.initial_parameters = initial_parameters
         self.fit_metrics_aggregation_fn = fit_metrics_aggregation_fn
         self.evaluate_metrics_aggregation_fn = evaluate_metrics_aggregation_fn
+        self.tensor_type = tensor_type
 
     # ---------- required abstract methods ----------
 
@@ -111,7 +114,7 @@ class FedVote(Strategy):
         # Start with provided params or an empty vector; round 1 aggregate_fit will replace it
         if self.initial_parameters is not None:
             return self.initial_parameters
-        return ndarrays_to_parameters([np.array([], dtype=np.int64)])
+        return ndarrays_to_parameters([np.array([], dtype=np.int64)], self.tensor_type)
 
     def evaluate(
         self, server_round: int, parameters: Parameters
@@ -195,7 +198,7 @@ class FedVote(Strategy):
         }
 
         # Return voted vector as next-round parameters (clients will receive it in evaluate)
-        return ndarrays_to_parameters([agg]), metrics
+        return ndarrays_to_parameters([agg], self.tensor_type), metrics
 
     def aggregate_evaluate(
         self,
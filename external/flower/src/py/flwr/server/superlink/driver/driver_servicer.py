@@ -87,11 +87,10 @@ class DriverServicer(driver_pb2_grpc.DriverServicer):
         # Init state
         state: State = self.state_factory.state()
 
-        # Store each TaskIns
-        task_ids: List[Optional[UUID]] = []
-        for task_ins in request.task_ins_list:
-            task_id: Optional[UUID] = state.store_task_ins(task_ins=task_ins)
-            task_ids.append(task_id)
+        # Store all TaskIns in one go
+        task_ids: List[Optional[UUID]] = state.store_task_ins_list(
+            list(request.task_ins_list)
+        )
 
         return PushTaskInsResponse(
             task_ids=[str(task_id) if task_id else "" for task_id in task_ids]
@@ -19,11 +19,12 @@ Relevant knowledge for reading this modules code:
 """
 
 import uuid
-from typing import Callable, Iterator
+from typing import Callable, Iterator, Optional
 
 import grpc
 from iterators import TimeoutIterator
 
+from flwr.common.grpc import GrpcCompression
 from flwr.proto import transport_pb2_grpc  # pylint: disable=E0611
 from flwr.proto.transport_pb2 import (  # pylint: disable=E0611
     ClientMessage,
@@ -75,10 +76,12 @@ class FlowerServiceServicer(transport_pb2_grpc.FlowerServiceServicer):
         grpc_client_proxy_factory: Callable[
             [str, GrpcBridge], GrpcClientProxy
         ] = default_grpc_client_proxy_factory,
+        compression: Optional[GrpcCompression] = None,
     ) -> None:
         self.client_manager: ClientManager = client_manager
         self.grpc_bridge_factory = grpc_bridge_factory
         self.client_proxy_factory = grpc_client_proxy_factory
+        self.compression = compression
 
     def Join(  # pylint: disable=invalid-name
         self,
@@ -109,12 +112,21 @@ class FlowerServiceServicer(transport_pb2_grpc.FlowerServiceServicer):
                 iterator=request_iterator, reset_on_next=True
             )
             ins_wrapper_iterator = bridge.ins_wrapper_iterator()
+            if self.compression is not None:
+                context.set_compression(self.compression.algorithm)
 
             # All messages will be pushed to client bridge directly
             while True:
                 try:
                     # Get ins_wrapper from bridge and yield server_message
                     ins_wrapper: InsWrapper = next(ins_wrapper_iterator)
+                    # Small messages are sent uncompressed
+                    if (
+                        self.compression is not None
+                        and self.compression.select(ins_wrapper.server_message)
+                        == grpc.Compression.NoCompression
+                    ):
+                        context.disable_next_message_compression()
                     yield ins_wrapper.server_message
 
                     # Set current timeout, might be None
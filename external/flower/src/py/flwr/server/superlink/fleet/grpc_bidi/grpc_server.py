@@ -23,6 +23,7 @@ from typing import Any, Callable, Optional, Sequence, Tuple, Union
 import grpc
 
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
+from flwr.common.grpc import GrpcCompression
 from flwr.common.logger import log
 from flwr.proto.transport_pb2_grpc import (  # pylint: disable=E0611
     add_FlowerServiceServicer_to_server,
@@ -62,6 +63,7 @@ def start_grpc_server(  # pylint: disable=too-many-arguments
     max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
     keepalive_time_ms: int = 210000,
     certificates: Optional[Tuple[bytes, bytes, bytes]] = None,
+    compression: Optional[GrpcCompression] = None,
 ) -> grpc.Server:
     """Create and start a gRPC server running FlowerServiceServicer.
 
@@ -113,6 +115,9 @@ def start_grpc_server(  # pylint: disable=too-many-arguments
             * CA certificate.
             * server certificate.
             * server private key.
+    compression : Optional[GrpcCompression] (default: None)
+        Compress the messages sent to the clients when they are larger than the
+        compression threshold.
 
     Returns
     -------
@@ -134,7 +139,7 @@ def start_grpc_server(  # pylint: disable=too-many-arguments
     >>>     ),
     >>> )
     """
-    servicer = FlowerServiceServicer(client_manager)
+    servicer = FlowerServiceServicer(client_manager, compression=compression)
     add_servicer_to_server_fn = add_FlowerServiceServicer_to_server
 
     server = generic_create_grpc_server(
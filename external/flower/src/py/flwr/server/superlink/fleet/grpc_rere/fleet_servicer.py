@@ -16,9 +16,11 @@
 
 
 from logging import DEBUG, INFO
+from typing import Optional
 
 import grpc
 
+from flwr.common.grpc import GrpcCompression
 from flwr.common.logger import log
 from flwr.proto import fleet_pb2_grpc  # pylint: disable=E0611
 from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
@@ -42,8 +44,11 @@ from flwr.server.superlink.state import StateFactory
 class FleetServicer(fleet_pb2_grpc.FleetServicer):
     """Fleet API servicer."""
 
-    def __init__(self, state_factory: StateFactory) -> None:
+    def __init__(
+        self, state_factory: StateFactory, compression: Optional[GrpcCompression] = None
+    ) -> None:
         self.state_factory = state_factory
+        self.compression = compression
 
     def CreateNode(
         self, request: CreateNodeRequest, context: grpc.ServicerContext
@@ -78,10 +83,13 @@ class FleetServicer(fleet_pb2_grpc.FleetServicer):
     ) -> PullTaskInsResponse:
         """Pull TaskIns."""
         log(INFO, "FleetServicer.PullTaskIns")
-        return message_handler.pull_task_ins(
+        response = message_handler.pull_task_ins(
             request=request,
             state=self.state_factory.state(),
         )
+        if self.compression is not None:
+            context.set_compression(self.compression.select(response))
+        return response
 
     def PushTaskRes(
         self, request: PushTaskResRequest, context: grpc.ServicerContext
@@ -15,11 +15,15 @@
 """In-memory State implementation."""
 
 
+import heapq
+import itertools
 import os
 import threading
 import time
+import weakref
+from collections import deque
 from logging import ERROR
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Deque, Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 from flwr.common import log, now
@@ -33,7 +37,7 @@ from .utils import make_node_unavailable_taskres
 class InMemoryState(State):  # pylint: disable=R0902,R0904
     """In-memory State implementation."""
 
-    def __init__(self) -> None:
+    def __init__(self, purge_interval: Optional[float] = None) -> None:
 
         # Map node_id to (online_until, ping_interval)
         self.node_ids: Dict[int, Tuple[float, float]] = {}
@@ -44,12 +48,44 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
         self.task_ins_store: Dict[UUID, TaskIns] = {}
         self.task_res_store: Dict[UUID, TaskRes] = {}
 
+        # Undelivered TaskIns per consumer node_id (`None` for anonymous consumers),
+        # in the order they were stored
+        self.task_ins_pending: Dict[Optional[int], Deque[UUID]] = {}
+        # Map the TaskIns task_id (`ancestry[0]`) to the (insertion order, task_id)
+        # of the TaskRes replying to it
+        self.task_res_by_ins: Dict[str, List[Tuple[int, UUID]]] = {}
+        self.task_res_counter = itertools.count()
+        # Min-heaps of (expires_at, task_id) of delivered TaskIns/TaskRes
+        self.delivered_task_ins: List[Tuple[float, UUID]] = []
+        self.delivered_task_res: List[Tuple[float, UUID]] = []
+
         self.client_public_keys: Set[bytes] = set()
         self.server_public_key: Optional[bytes] = None
         self.server_private_key: Optional[bytes] = None
 
         self.lock = threading.Lock()
 
+        # Periodically drop delivered tasks whose TTL has expired. The thread
+        # only holds a weak reference, and stops on `close()` or when the
+        # state is garbage collected.
+        self.purge_stop = threading.Event()
+        self.purge_thread: Optional[threading.Thread] = None
+        if purge_interval is not None:
+            self.purge_thread = threading.Thread(
+                target=_purge_periodically,
+                args=(weakref.ref(self), self.purge_stop, purge_interval),
+                daemon=True,
+                name="InMemoryStatePurge",
+            )
+            self.purge_thread.start()
+            weakref.finalize(self, self.purge_stop.set)
+
+    def close(self) -> None:
+        """Stop the purge thread."""
+        self.purge_stop.set()
+        if self.purge_thread is not None:
+            self.purge_thread.join()
+
     def store_task_ins(self, task_ins: TaskIns) -> Optional[UUID]:
         """Store one TaskIns."""
         # Validate task
@@ -67,8 +103,11 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
 
         # Store TaskIns
         task_ins.task_id = str(task_id)
+        consumer = task_ins.task.consumer
+        key = None if consumer.anonymous else consumer.node_id
         with self.lock:
             self.task_ins_store[task_id] = task_ins
+            self.task_ins_pending.setdefault(key, deque()).append(task_id)
 
         # Return the new task_id
         return task_id
@@ -80,30 +119,26 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
-        # Find TaskIns for node_id that were not delivered yet
+        # Pop the TaskIns for node_id that were not delivered yet
         task_ins_list: List[TaskIns] = []
-        with self.lock:
-            for _, task_ins in self.task_ins_store.items():
-                # pylint: disable=too-many-boolean-expressions
-                if (
-                    node_id is not None  # Not anonymous
-                    and task_ins.task.consumer.anonymous is False
-                    and task_ins.task.consumer.node_id == node_id
-                    and task_ins.task.delivered_at == ""
-                ) or (
-                    node_id is None  # Anonymous
-                    and task_ins.task.consumer.anonymous is True
-                    and task_ins.task.consumer.node_id == 0
-                    and task_ins.task.delivered_at == ""
-                ):
-                    task_ins_list.append(task_ins)
-                if limit and len(task_ins_list) == limit:
-                    break
-
-        # Mark all of them as delivered
         delivered_at = now().isoformat()
-        for task_ins in task_ins_list:
-            task_ins.task.delivered_at = delivered_at
+        with self.lock:
+            pending = self.task_ins_pending.get(node_id)
+            while pending and (limit is None or len(task_ins_list) < limit):
+                task_ins = self.task_ins_store.get(pending.popleft())
+                # Skip TaskIns deleted or purged while pending
+                if task_ins is None or task_ins.task.delivered_at != "":
+                    continue
+                # Mark it as delivered
+                task_ins.task.delivered_at = delivered_at
+                task_ins_list.append(task_ins)
+                heapq.heappush(
+                    self.delivered_task_ins,
+                    (
+                        task_ins.task.created_at + task_ins.task.ttl,
+                        UUID(task_ins.task_id),
+                    ),
+                )
 
         # Return TaskIns
         return task_ins_list
@@ -127,7 +162,7 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
         # Store TaskRes
         task_res.task_id = str(task_id)
         with self.lock:
-            self.task_res_store[task_id] = task_res
+            self._add_task_res(task_id, task_res)
 
         # Return the new task_id
         return task_id
@@ -139,13 +174,19 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
 
         with self.lock:
             # Find TaskRes that were not delivered yet
+            replies: List[Tuple[int, UUID, UUID]] = []
+            for task_id in task_ids:
+                for order, task_res_id in self.task_res_by_ins.get(str(task_id), ()):
+                    replies.append((order, task_res_id, task_id))
+            replies.sort()
+
             task_res_list: List[TaskRes] = []
             replied_task_ids: Set[UUID] = set()
-            for _, task_res in self.task_res_store.items():
-                reply_to = UUID(task_res.task.ancestry[0])
-                if reply_to in task_ids and task_res.task.delivered_at == "":
+            for _, task_res_id, task_id in replies:
+                task_res = self.task_res_store[task_res_id]
+                if task_res.task.delivered_at == "":
                     task_res_list.append(task_res)
-                    replied_task_ids.add(reply_to)
+                    replied_task_ids.add(task_id)
                 if limit and len(task_res_list) == limit:
                     break
 
@@ -163,38 +204,108 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
                     err_taskres = make_node_unavailable_taskres(
                         ref_taskins=task_ins,
                     )
-                    self.task_res_store[UUID(err_taskres.task_id)] = err_taskres
+                    self._add_task_res(UUID(err_taskres.task_id), err_taskres)
                     task_res_list.append(err_taskres)
 
             # Mark all of them as delivered
             delivered_at = now().isoformat()
             for task_res in task_res_list:
                 task_res.task.delivered_at = delivered_at
+                heapq.heappush(
+                    self.delivered_task_res,
+                    (
+                        task_res.task.created_at + task_res.task.ttl,
+                        UUID(task_res.task_id),
+                    ),
+                )
 
             # Return TaskRes
             return task_res_list
 
+    def _add_task_res(self, task_id: UUID, task_res: TaskRes) -> None:
+        """Store a TaskRes and index it under the TaskIns it replies to."""
+        self.task_res_store[task_id] = task_res
+        reply_to = task_res.task.ancestry[0]
+        self.task_res_by_ins.setdefault(reply_to, []).append(
+            (next(self.task_res_counter), task_id)
+        )
+
+    def _remove_task_res(self, task_res_id: UUID) -> None:
+        """Delete a TaskRes and its entry in the reply index."""
+        task_res = self.task_res_store.pop(task_res_id, None)
+        if task_res is None:
+            return
+        reply_to = task_res.task.ancestry[0]
+        replies = [
+            r for r in self.task_res_by_ins.get(reply_to, ()) if r[1] != task_res_id
+        ]
+        if replies:
+            self.task_res_by_ins[reply_to] = replies
+        else:
+            self.task_res_by_ins.pop(reply_to, None)
+
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
-        task_ins_to_be_deleted: Set[UUID] = set()
-        task_res_to_be_deleted: Set[UUID] = set()
-
         with self.lock:
             for task_ins_id in task_ids:
-                # Find the task_id of the matching task_res
-                for task_res_id, task_res in self.task_res_store.items():
-                    if UUID(task_res.task.ancestry[0]) != task_ins_id:
-                        continue
-                    if task_res.task.delivered_at == "":
-                        continue
-
-                    task_ins_to_be_deleted.add(task_ins_id)
-                    task_res_to_be_deleted.add(task_res_id)
+                # Find the task_id of the matching, delivered task_res
+                delivered = [
+                    task_res_id
+                    for _, task_res_id in self.task_res_by_ins.get(str(task_ins_id), ())
+                    if self.task_res_store[task_res_id].task.delivered_at != ""
+                ]
+                if not delivered:
+                    continue
 
-            for task_id in task_ins_to_be_deleted:
-                del self.task_ins_store[task_id]
-            for task_id in task_res_to_be_deleted:
-                del self.task_res_store[task_id]
+                self.task_ins_store.pop(task_ins_id, None)
+                for task_res_id in delivered:
+                    self._remove_task_res(task_res_id)
+
+            # Deleted tasks stay in the TTL heaps until they expire, unless the
+            # heaps grow much larger than the stores
+            if len(self.delivered_task_ins) > 2 * len(self.task_ins_store) + 1024:
+                self.delivered_task_ins = [
+                    e for e in self.delivered_task_ins if e[1] in self.task_ins_store
+                ]
+                heapq.heapify(self.delivered_task_ins)
+            if len(self.delivered_task_res) > 2 * len(self.task_res_store) + 1024:
+                self.delivered_task_res = [
+                    e for e in self.delivered_task_res if e[1] in self.task_res_store
+                ]
+                heapq.heapify(self.delivered_task_res)
+
+    def purge_expired_tasks(self) -> int:
+        """Delete delivered TaskIns/TaskRes whose TTL has expired.
+
+        The TaskRes replying to an expired TaskIns are deleted with it once they
+        have been delivered. Return the number of deleted tasks.
+        """
+        current_time = time.time()
+        purged = 0
+        with self.lock:
+            while (
+                self.delivered_task_ins
+                and self.delivered_task_ins[0][0] < current_time
+            ):
+                _, task_ins_id = heapq.heappop(self.delivered_task_ins)
+                if self.task_ins_store.pop(task_ins_id, None) is None:
+                    continue
+                purged += 1
+                replies = list(self.task_res_by_ins.get(str(task_ins_id), ()))
+                for _, task_res_id in replies:
+                    if self.task_res_store[task_res_id].task.delivered_at != "":
+                        self._remove_task_res(task_res_id)
+                        purged += 1
+
+            while (
+                self.delivered_task_res
+                and self.delivered_task_res[0][0] < current_time
+            ):
+                _, task_res_id = heapq.heappop(self.delivered_task_res)
+                if task_res_id in self.task_res_store:
+                    self._remove_task_res(task_res_id)
+                    purged += 1
+        return purged
 
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
@@ -334,3 +445,17 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
                 self.node_ids[node_id] = (time.time() + ping_interval, ping_interval)
                 return True
         return False
+
+
+def _purge_periodically(
+    state_ref: "weakref.ReferenceType[InMemoryState]",
+    stop: threading.Event,
+    interval: float,
+) -> None:
+    """Purge expired tasks every `interval` seconds until stopped or discarded."""
+    while not stop.wait(interval):
+        state = state_ref()
+        if state is None:
+            return
+        state.purge_expired_tasks()
+        del state
@@ -58,6 +58,15 @@ SQL_CREATE_INDEX_ONLINE_UNTIL = """
 CREATE INDEX IF NOT EXISTS idx_online_until ON node (online_until);
 """
 
+SQL_CREATE_INDEX_TASK_INS_CONSUMER = """
+CREATE INDEX IF NOT EXISTS idx_task_ins_consumer
+ON task_ins (consumer_node_id, delivered_at);
+"""
+
+SQL_CREATE_INDEX_TASK_RES_ANCESTRY = """
+CREATE INDEX IF NOT EXISTS idx_task_res_ancestry ON task_res (ancestry);
+"""
+
 SQL_CREATE_TABLE_RUN = """
 CREATE TABLE IF NOT EXISTS run(
     run_id          INTEGER UNIQUE,
@@ -108,13 +117,19 @@ CREATE TABLE IF NOT EXISTS task_res(
 
 DictOrTuple = Union[Tuple[Any, ...], Dict[str, Any]]
 
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
 
-class SqliteState(State):  # pylint: disable=R0904
+
+class SqliteState(State):  # pylint: disable=R0902,R0904
     """SQLite-based state implementation."""
 
     def __init__(
         self,
         database_path: str,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        write_behind: int = 0,
     ) -> None:
         """Initialize an SqliteState.
 
@@ -123,10 +138,39 @@ class SqliteState(State):  # pylint: disable=R0904
         database : (path-like object)
             The path to the database file to be opened. Pass ":memory:" to open
             a connection to a database that is in RAM, instead of on disk.
+        journal_mode : str (default: "WAL")
+            SQLite `journal_mode`. With "WAL", readers do not block the writer and
+            a commit only appends to the write-ahead log.
+        synchronous : str (default: "NORMAL")
+            SQLite `synchronous` setting. "NORMAL" does not fsync on every commit
+            in WAL mode: the database stays consistent after a crash, but the
+            last transactions can be lost on power failure. Use "FULL" to fsync
+            every commit.
+        write_behind : int (default: 0)
+            If greater than zero, stored TaskIns/TaskRes are buffered and written
+            in one transaction once `write_behind` tasks are pending, or before
+            they are read, counted or deleted. Buffered tasks are lost if the
+            process dies before `flush()`, and they are only visible through this
+            instance, so only use it with a single long-lived SqliteState.
         """
+        if journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f"Unknown journal_mode: {journal_mode}")
+        if synchronous.upper() not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous setting: {synchronous}")
         self.database_path = database_path
+        self.journal_mode = journal_mode.upper()
+        self.synchronous = synchronous.upper()
+        self.write_behind = write_behind
         self.conn: Optional[sqlite3.Connection] = None
 
+        # Rows waiting to be written, per table (only used with `write_behind`)
+        self.pending_rows: Dict[str, List[Dict[str, Any]]] = {
+            "task_ins": [],
+            "task_res": [],
+        }
+        # Runs are never deleted, so known run_ids can be cached
+        self.known_run_ids: Set[int] = set()
+
     def initialize(self, log_queries: bool = False) -> List[Tuple[str]]:
         """Create tables if they don't exist yet.
 
@@ -137,6 +181,8 @@ class SqliteState(State):  # pylint: disable=R0904
         """
         self.conn = sqlite3.connect(self.database_path)
         self.conn.execute("PRAGMA foreign_keys = ON;")
+        self.conn.execute(f"PRAGMA journal_mode = {self.journal_mode};")
+        self.conn.execute(f"PRAGMA synchronous = {self.synchronous};")
         self.conn.row_factory = dict_factory
         if log_queries:
             self.conn.set_trace_callback(lambda query: log(DEBUG, query))
@@ -150,6 +196,8 @@ class SqliteState(State):  # pylint: disable=R0904
         cur.execute(SQL_CREATE_TABLE_CREDENTIAL)
         cur.execute(SQL_CREATE_TABLE_PUBLIC_KEY)
         cur.execute(SQL_CREATE_INDEX_ONLINE_UNTIL)
+        cur.execute(SQL_CREATE_INDEX_TASK_INS_CONSUMER)
+        cur.execute(SQL_CREATE_INDEX_TASK_RES_ANCESTRY)
         res = cur.execute("SELECT name FROM sqlite_schema;")
 
         return res.fetchall()
@@ -217,19 +265,13 @@ class SqliteState(State):  # pylint: disable=R0904
 
         # Store TaskIns
         task_ins.task_id = str(task_id)
-        data = (task_ins_to_dict(task_ins),)
-        columns = ", ".join([f":{key}" for key in data[0]])
-        query = f"INSERT INTO task_ins VALUES({columns});"
-
-        # Only invalid run_id can trigger IntegrityError.
-        # This may need to be changed in the future version with more integrity checks.
-        try:
-            self.query(query, data)
-        except sqlite3.IntegrityError:
-            log(ERROR, "`run` is invalid")
-            return None
+        if self._store_rows("task_ins", [task_ins_to_dict(task_ins)]):
+            return task_id
+        return None
 
-        return task_id
+    def store_task_ins_list(self, task_ins_list: List[TaskIns]) -> List[Optional[UUID]]:
+        """Store several TaskIns in a single transaction."""
+        return self._store_task_list("task_ins", task_ins_list)
 
     def get_task_ins(
         self, node_id: Optional[int], limit: Optional[int]
@@ -267,6 +309,8 @@ class SqliteState(State):  # pylint: disable=R0904
             )
             raise AssertionError(msg)
 
+        self.flush(("task_ins",))
+
         data: Dict[str, Union[str, int]] = {}
 
         if node_id is None:
@@ -346,21 +390,108 @@ class SqliteState(State):  # pylint: disable=R0904
         # Create task_id
         task_id = uuid4()
 
-        # Store TaskIns
+        # Store TaskRes
         task_res.task_id = str(task_id)
-        data = (task_res_to_dict(task_res),)
-        columns = ", ".join([f":{key}" for key in data[0]])
-        query = f"INSERT INTO task_res VALUES({columns});"
+        if self._store_rows("task_res", [task_res_to_dict(task_res)]):
+            return task_id
+        return None
+
+    def store_task_res_list(self, task_res_list: List[TaskRes]) -> List[Optional[UUID]]:
+        """Store several TaskRes in a single transaction."""
+        return self._store_task_list("task_res", task_res_list)
+
+    def _store_task_list(
+        self, table: str, task_list: Union[List[TaskIns], List[TaskRes]]
+    ) -> List[Optional[UUID]]:
+        """Validate, then insert all valid tasks with a single `executemany`."""
+        task_ids: List[Optional[UUID]] = []
+        for task in task_list:
+            errors = validate_task_ins_or_res(task)
+            if any(errors):
+                log(ERROR, errors)
+                task_ids.append(None)
+            else:
+                task_ids.append(uuid4())
+
+        # Tasks with an invalid run_id fail individually
+        run_ids = self._existing_run_ids(
+            {task.run_id for task, task_id in zip(task_list, task_ids) if task_id}
+        )
+        rows: List[Dict[str, Any]] = []
+        for index, task in enumerate(task_list):
+            if task_ids[index] is None:
+                continue
+            if task.run_id not in run_ids:
+                log(ERROR, "`run` is invalid")
+                task_ids[index] = None
+                continue
+            if isinstance(task, TaskIns):
+                row = task_ins_to_dict(task)
+            else:
+                row = task_res_to_dict(task)
+            row["task_id"] = str(task_ids[index])
+            rows.append(row)
+
+        if rows and not self._store_rows(table, rows):
+            return [None] * len(task_list)
+        # Set the ids on the messages only once their rows are stored
+        for task, task_id in zip(task_list, task_ids):
+            if task_id is not None:
+                task.task_id = str(task_id)
+        return task_ids
+
+    def _store_rows(self, table: str, rows: List[Dict[str, Any]]) -> bool:
+        """Insert task rows now, or buffer them if `write_behind` is enabled."""
+        if self.write_behind > 0:
+            # The insert is deferred, so check the run_id now
+            run_ids = {row["run_id"] for row in rows}
+            if self._existing_run_ids(run_ids) != run_ids:
+                log(ERROR, "`run` is invalid")
+                return False
+            self.pending_rows[table].extend(rows)
+            if sum(len(pending) for pending in self.pending_rows.values()) >= (
+                self.write_behind
+            ):
+                self.flush()
+            return True
+
+        columns = ", ".join([f":{key}" for key in rows[0]])
+        query = f"INSERT INTO {table} VALUES({columns});"
 
         # Only invalid run_id can trigger IntegrityError.
         # This may need to be changed in the future version with more integrity checks.
         try:
-            self.query(query, data)
+            self.query(query, rows)
         except sqlite3.IntegrityError:
             log(ERROR, "`run` is invalid")
-            return None
+            return False
+        return True
+
+    def _existing_run_ids(self, run_ids: Set[int]) -> Set[int]:
+        """Return the subset of `run_ids` that exist in the `run` table."""
+        unknown = list(run_ids - self.known_run_ids)
+        if unknown:
+            placeholders = ",".join(["?"] * len(unknown))
+            query = f"SELECT run_id FROM run WHERE run_id IN ({placeholders});"
+            rows = self.query(query, tuple(unknown))
+            self.known_run_ids.update(row["run_id"] for row in rows)
+        return run_ids & self.known_run_ids
+
+    def flush(self, tables: Sequence[str] = ("task_ins", "task_res")) -> None:
+        """Write the buffered TaskIns/TaskRes of `tables` in one transaction."""
+        tables = [table for table in tables if self.pending_rows[table]]
+        if not tables:
+            return
+        if self.conn is None:
+            raise AttributeError("State is not initialized.")
 
-        return task_id
+        with self.conn:
+            for table in tables:
+                rows = self.pending_rows[table]
+                columns = ", ".join([f":{key}" for key in rows[0]])
+                self.conn.executemany(f"INSERT INTO {table} VALUES({columns});", rows)
+        for table in tables:
+            self.pending_rows[table] = []
 
     # pylint: disable-next=R0914
     def get_task_res(self, task_ids: Set[UUID], limit: Optional[int]) -> List[TaskRes]:
@@ -385,6 +516,8 @@ class SqliteState(State):  # pylint: disable=R0904
         if len(task_ids) == 0:
             return []
 
+        self.flush()
+
         placeholders = ",".join([f":id_{i}" for i in range(len(task_ids))])
         query = f"""
             SELECT *
@@ -482,6 +615,7 @@ class SqliteState(State):  # pylint: disable=R0904
 
         This includes delivered but not yet deleted task_ins.
         """
+        self.flush(("task_ins",))
         query = "SELECT count(*) AS num FROM task_ins;"
         rows = self.query(query)
         result = rows[0]
@@ -493,6 +627,7 @@ class SqliteState(State):  # pylint: disable=R0904
 
         This includes delivered but not yet deleted task_res.
         """
+        self.flush(("task_res",))
         query = "SELECT count(*) AS num FROM task_res;"
         rows = self.query(query)
         result: Dict[str, int] = rows[0]
@@ -504,6 +639,8 @@ class SqliteState(State):  # pylint: disable=R0904
         if len(ids) == 0:
             return None
 
+        self.flush()
+
         placeholders = ",".join([f":id_{index}" for index in range(len(task_ids))])
         data = {f"id_{index}": str(task_id) for index, task_id in enumerate(task_ids)}
 
@@ -47,6 +47,15 @@ class State(abc.ABC):  # pylint: disable=R0904
         storing the `task_ins` MUST fail.
         """
 
+    def store_task_ins_list(self, task_ins_list: List[TaskIns]) -> List[Optional[UUID]]:
+        """Store several TaskIns at once.
+
+        Returns the `task_id` of each TaskIns, or `None` where storing it failed,
+        in the order of `task_ins_list`. Implementations can override this to
+        store the whole list in a single write.
+        """
+        return [self.store_task_ins(task_ins) for task_ins in task_ins_list]
+
     @abc.abstractmethod
     def get_task_ins(
         self, node_id: Optional[int], limit: Optional[int]
@@ -96,6 +105,15 @@ class State(abc.ABC):  # pylint: disable=R0904
         storing the `task_res` MUST fail.
         """
 
+    def store_task_res_list(self, task_res_list: List[TaskRes]) -> List[Optional[UUID]]:
+        """Store several TaskRes at once.
+
+        Returns the `task_id` of each TaskRes, or `None` where storing it failed,
+        in the order of `task_res_list`. Implementations can override this to
+        store the whole list in a single write.
+        """
+        return [self.store_task_res(task_res) for task_res in task_res_list]
+
     @abc.abstractmethod
     def get_task_res(self, task_ids: Set[UUID], limit: Optional[int]) -> List[TaskRes]:
         """Get TaskRes for task_ids.
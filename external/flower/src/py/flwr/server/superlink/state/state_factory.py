@@ -24,6 +24,9 @@ from .in_memory_state import InMemoryState
 from .sqlite_state import SqliteState
 from .state import State
 
+# Seconds between two purges of delivered, expired tasks in InMemoryState
+TASK_PURGE_INTERVAL = 60.0
+
 
 class StateFactory:
     """Factory class that creates State instances."""
@@ -37,7 +40,7 @@ class StateFactory:
         # InMemoryState
         if self.database == ":flwr-in-memory-state:":
             if self.state_instance is None:
-                self.state_instance = InMemoryState()
+                self.state_instance = InMemoryState(purge_interval=TASK_PURGE_INTERVAL)
             log(DEBUG, "Using InMemoryState")
             return self.state_instance
 
@@ -15,6 +15,7 @@
 """Tests all state implemenations have to conform to."""
 # pylint: disable=invalid-name, disable=R0904
 
+import gc
 import tempfile
 import time
 import unittest
@@ -296,6 +297,52 @@ class StateTest(unittest.TestCase):
         # Assert
         assert task_id is None
 
+    def test_store_task_ins_list(self) -> None:
+        """Store several TaskIns at once, one of them with an invalid run_id."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0")
+        task_ins_list = [
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id),
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=61016),
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id),
+        ]
+
+        # Execute
+        task_ids = state.store_task_ins_list(task_ins_list)
+        retrieved = state.get_task_ins(node_id=1, limit=None)
+
+        # Assert
+        assert task_ids[1] is None
+        assert {t.task_id for t in retrieved} == {
+            str(task_ids[0]),
+            str(task_ids[2]),
+        }
+
+    def test_store_task_res_list(self) -> None:
+        """Store several TaskRes at once and retrieve them."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0")
+        task_ins_ids = [uuid4(), uuid4()]
+        task_res_list = [
+            create_task_res(
+                producer_node_id=0,
+                anonymous=True,
+                ancestry=[str(task_ins_id)],
+                run_id=run_id,
+            )
+            for task_ins_id in task_ins_ids
+        ]
+
+        # Execute
+        task_ids = state.store_task_res_list(task_res_list)
+        retrieved = state.get_task_res(task_ids=set(task_ins_ids), limit=None)
+
+        # Assert
+        assert None not in task_ids
+        assert {t.task_id for t in retrieved} == {str(i) for i in task_ids}
+
     # TaskRes tests
     def test_task_res_store_and_retrieve_by_task_ins_id(self) -> None:
         """Store TaskRes retrieve it by task_ins_id."""
@@ -728,6 +775,134 @@ class InMemoryStateTest(StateTest):
         """Return InMemoryState."""
         return InMemoryState()
 
+    def test_get_task_ins_per_node_queue(self) -> None:
+        """Test that each node only receives its own TaskIns, in order."""
+        # Prepare
+        state = InMemoryState()
+        run_id = state.create_run("mock/mock", "v1.0.0")
+        task_ids = {
+            node_id: [
+                state.store_task_ins(
+                    create_task_ins(
+                        consumer_node_id=node_id, anonymous=False, run_id=run_id
+                    )
+                )
+                for _ in range(3)
+            ]
+            for node_id in (1, 2)
+        }
+        anonymous_id = state.store_task_ins(
+            create_task_ins(consumer_node_id=0, anonymous=True, run_id=run_id)
+        )
+
+        # Execute
+        first = state.get_task_ins(node_id=1, limit=2)
+        second = state.get_task_ins(node_id=1, limit=None)
+        anonymous = state.get_task_ins(node_id=None, limit=None)
+
+        # Assert
+        assert [t.task_id for t in first + second] == [
+            str(task_id) for task_id in task_ids[1]
+        ]
+        assert [t.task_id for t in anonymous] == [str(anonymous_id)]
+        assert len(state.get_task_ins(node_id=2, limit=None)) == 3
+
+    def test_delete_tasks_updates_indexes(self) -> None:
+        """Test that deleted TaskIns are neither delivered nor replied to."""
+        # Prepare
+        state = InMemoryState()
+        run_id = state.create_run("mock/mock", "v1.0.0")
+        task_id_0 = state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        )
+        task_id_1 = state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        )
+        assert task_id_0 is not None and task_id_1 is not None
+        state.get_task_ins(node_id=1, limit=1)
+        state.store_task_res(
+            create_task_res(
+                producer_node_id=1,
+                anonymous=False,
+                ancestry=[str(task_id_0)],
+                run_id=run_id,
+            )
+        )
+        state.get_task_res({task_id_0}, limit=None)
+
+        # Execute
+        state.delete_tasks({task_id_0, task_id_1})
+
+        # Assert
+        assert state.num_task_ins() == 1
+        assert state.num_task_res() == 0
+        assert not state.task_res_by_ins
+        assert len(state.get_task_ins(node_id=1, limit=None)) == 1
+
+    def test_purge_expired_tasks(self) -> None:
+        """Test that only delivered tasks are purged once their TTL expired."""
+        # Prepare
+        state = InMemoryState()
+        run_id = state.create_run("mock/mock", "v1.0.0")
+        task_id = state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        )
+        state.store_task_ins(
+            create_task_ins(consumer_node_id=2, anonymous=False, run_id=run_id)
+        )
+        state.get_task_ins(node_id=1, limit=None)
+        state.store_task_res(
+            create_task_res(
+                producer_node_id=1,
+                anonymous=False,
+                ancestry=[str(task_id)],
+                run_id=run_id,
+            )
+        )
+        assert task_id is not None
+        state.get_task_res({task_id}, limit=None)
+
+        # Execute
+        purged_now = state.purge_expired_tasks()
+        current_time = time.time()
+        with patch("time.time", side_effect=lambda: current_time + DEFAULT_TTL + 1):
+            purged_later = state.purge_expired_tasks()
+
+        # Assert
+        assert purged_now == 0
+        assert purged_later == 2
+        assert state.num_task_ins() == 1
+        assert state.num_task_res() == 0
+        assert len(state.get_task_ins(node_id=2, limit=None)) == 1
+
+    def test_close_stops_purge_thread(self) -> None:
+        """Test that `close` stops the purge thread."""
+        # Prepare
+        state = InMemoryState(purge_interval=60.0)
+        thread = state.purge_thread
+        assert thread is not None and thread.is_alive()
+
+        # Execute
+        state.close()
+
+        # Assert
+        assert not thread.is_alive()
+
+    def test_discarded_state_stops_purge_thread(self) -> None:
+        """Test that the purge thread ends with its state."""
+        # Prepare
+        state = InMemoryState(purge_interval=60.0)
+        thread = state.purge_thread
+        assert thread is not None
+
+        # Execute
+        del state
+        gc.collect()
+        thread.join(timeout=5)
+
+        # Assert
+        assert not thread.is_alive()
+
 
 class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
     """Test SqliteState implemenation with in-memory database."""
@@ -749,7 +924,58 @@ class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 13
+        assert len(result) == 15
+
+    def test_store_task_ins_list_failed_insert(self) -> None:
+        """Test that a failed insert leaves the TaskIns without task_id."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0")
+        task_ins_list = [
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+            for _ in range(2)
+        ]
+
+        # Execute
+        with patch.object(SqliteState, "_store_rows", return_value=False):
+            task_ids = state.store_task_ins_list(task_ins_list)
+
+        # Assert
+        assert task_ids == [None, None]
+        assert [t.task_id for t in task_ins_list] == ["", ""]
+
+
+class SqliteWriteBehindTest(StateTest, unittest.TestCase):
+    """Test SqliteState implemenation with a write-behind buffer."""
+
+    __test__ = True
+
+    def state_factory(self) -> SqliteState:
+        """Return SqliteState buffering up to 3 tasks."""
+        state = SqliteState(":memory:", write_behind=3)
+        state.initialize()
+        return state
+
+    def test_write_behind_flush(self) -> None:
+        """Test that buffered tasks are written once the buffer is full."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0")
+
+        # Execute
+        for _ in range(2):
+            state.store_task_ins(
+                create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+            )
+        buffered = state.query("SELECT count(*) AS num FROM task_ins;")[0]["num"]
+        state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        )
+        written = state.query("SELECT count(*) AS num FROM task_ins;")[0]["num"]
+
+        # Assert
+        assert buffered == 0
+        assert written == 3
 
 
 class SqliteFileBasedTest(StateTest, unittest.TestCase):
@@ -774,7 +1000,7 @@ class SqliteFileBasedTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 13
+        assert len(result) == 15
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+"""
+Learn many Popper tasks in one batch with warm Prolog engines.
+
+    python fedpopper/batch_learn.py examples2/iggp-* --jobs 4 --budget 3600 --timeout 300 --report batch.json
+
+Running popper.py once per task pays for a process, the pyswip/clingo
+imports, a Prolog engine, test.pl and the BK every time. Here a pool of
+--jobs worker processes keeps one Tester (Prolog engine) each, and a task
+only swaps what differs (Tester.switch): the examples always, the BK only
+if its content differs from the loaded one. Tasks are grouped by BK content
+so that tasks sharing a BK run on the same engine; groups are split when
+there are fewer groups than workers.
+
+--budget is a global time budget: a task gets min(--timeout, time left)
+and tasks that would start after the budget are skipped. The report gives
+per-task results, the time spent loading (cold engine vs. warm switch) and
+the throughput in tasks/hour.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+TASK_FILES = ("bias.pl", "bk.pl", "exs.pl")
+
+_tester = None  # the worker's Tester, reused across tasks
+
+
+def bk_digest(task):
+    with open(os.path.join(task, "bk.pl"), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def chunks(tasks, jobs):
+    """Tasks grouped by BK content; the largest groups are halved while there are fewer chunks than jobs."""
+    groups = defaultdict(list)
+    for task in tasks:
+        groups[bk_digest(task)].append(task)
+    out = sorted(groups.values(), key=len, reverse=True)
+    while len(out) < jobs and len(out[0]) > 1:
+        largest = out.pop(0)
+        half = len(largest) // 2
+        out.extend([largest[:half], largest[half:]])
+        out.sort(key=len, reverse=True)
+    return out
+
+
+def learn_task(task, deadline, timeout, seed):
+    global _tester
+    import logging
+    from popper.loop import calc_score, learn_solution
+    from popper.tester import Tester
+    from popper.util import Settings, load_kbpath
+
+    logging.getLogger("popper").setLevel(logging.WARNING)
+    result = {"task": task, "pid": os.getpid()}
+    task_timeout = int(min(timeout, deadline - time.time()))
+    if task_timeout < 1:
+        result["status"] = "skipped"
+        return result
+
+    bk_file, ex_file, bias_file = load_kbpath(task)
+    settings = Settings(bias_file, ex_file, bk_file, timeout=task_timeout, clingo_args=[f"--seed={seed}"])
+    try:
+        t0 = time.perf_counter()
+        result["warm"] = _tester is not None
+        if _tester is None:
+            _tester = Tester(settings)
+        else:
+            _tester.switch(settings)
+        result["load_time"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        _, stats = learn_solution(settings, tester=_tester)
+        result["exec_time"] = time.perf_counter() - t0
+    except Exception as e:
+        # the engine may be in any state: start from a fresh one next time
+        _tester = None
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    best = stats.best_program
+    result["status"] = "timeout" if result["exec_time"] >= task_timeout else "ok"
+    result["programs"] = stats.total_programs
+    result["solution"] = stats.solution is not None
+    result["program"] = best.code if best else None
+    result["conf_matrix"] = list(best.conf_matrix) if best else None
+    result["score"] = calc_score(best.conf_matrix) if best else None
+    return result
+
+
+def learn_chunk(tasks, deadline, timeout, seed):
+    return [learn_task(task, deadline, timeout, seed) for task in tasks]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch Popper learner with warm Prolog engines")
+    parser.add_argument("tasks", nargs="+", help="Task directories (bias.pl, bk.pl, exs.pl)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--budget", type=float, default=3600, help="Global time budget (seconds)")
+    parser.add_argument("--timeout", type=int, default=600, help="Popper timeout per task (seconds)")
+    parser.add_argument("--seed", type=int, default=0, help="clingo --seed")
+    parser.add_argument("--report", type=str, default="", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    tasks = [t for t in args.tasks if all(os.path.isfile(os.path.join(t, f)) for f in TASK_FILES)]
+    work = chunks(tasks, args.jobs) if tasks else []
+    start = time.time()
+    deadline = start + args.budget
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.jobs, mp_context=ctx) as pool:
+        futures = [pool.submit(learn_chunk, chunk, deadline, args.timeout, args.seed) for chunk in work]
+        for future in as_completed(futures):
+            for result in future.result():
+                results.append(result)
+                print(f"{result['task']:<45} {result['status']:<8} "
+                      f"load {result.get('load_time', 0.0):6.2f}s{' (warm)' if result.get('warm') else '       '} "
+                      f"learn {result.get('exec_time', 0.0):8.2f}s  solution {result.get('solution', '-')!s:<5}", flush=True)
+    wall = time.time() - start
+
+    done = [r for r in results if r["status"] in ("ok", "timeout")]
+    solved = sum(1 for r in done if r.get("solution"))
+    cold = [r["load_time"] for r in done if not r["warm"]]
+    warm = [r["load_time"] for r in done if r["warm"]]
+    summary = {
+        "tasks": len(tasks), "done": len(done), "solved": solved,
+        "skipped": sum(1 for r in results if r["status"] == "skipped"),
+        "errors": sum(1 for r in results if r["status"] == "error"),
+        "jobs": args.jobs, "chunks": len(work), "wall": wall,
+        "tasks_per_hour": len(done) / wall * 3600 if wall > 0 else 0.0,
+        "solved_per_hour": solved / wall * 3600 if wall > 0 else 0.0,
+        "mean_cold_load": sum(cold) / len(cold) if cold else None,
+        "mean_warm_load": sum(warm) / len(warm) if warm else None,
+    }
+    print(json.dumps(summary, indent=2))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
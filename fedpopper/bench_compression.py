@@ -0,0 +1,78 @@
+"""
+Benchmark: gRPC message compression on FedPopper/FedTree payloads.
+
+Builds the ServerMessage (FitIns) the server sends for a round, with the
+parameters encoded the way the strategies do it:
+    - rules:  FedPopper hypothesis, a `<U1000` array of rule strings
+    - trees:  FedTree forest, a `<U10000` array of serialized trees
+    - scores: a client reply, a small int64 array (below the threshold)
+
+Each message is passed --repeat times through GrpcCompression(measure=True)
+for every --algorithm and the wire size, ratio and compression time per
+message are reported. --threshold shows which payloads stay uncompressed.
+
+    python fedpopper/bench_compression.py
+    python fedpopper/bench_compression.py --rules 20 200 --threshold 4096
+"""
+
+import argparse
+
+import numpy as np
+from flwr.common import ndarrays_to_parameters
+from flwr.common.grpc import GrpcCompression
+from flwr.common.serde import parameters_to_proto
+from flwr.proto.transport_pb2 import ServerMessage
+
+
+def rules_array(num_rules):
+    return np.array(
+        [f"f(A):-has_car(A,B),has_load(B,C),short(B),closed(B),triangle(C),p{i}(B)" for i in range(num_rules)],
+        dtype="<U1000",
+    )
+
+
+def trees_array(num_trees):
+    tree = "node(f0,0.5,node(f3,1.25,leaf(pos,12),leaf(neg,3)),leaf(neg,40))"
+    return np.array([";".join([tree] * 20) + f";tree{i}" for i in range(num_trees)], dtype="<U10000")
+
+
+def fit_message(ndarray):
+    parameters = parameters_to_proto(ndarrays_to_parameters([ndarray]))
+    return ServerMessage(fit_ins=ServerMessage.FitIns(parameters=parameters))
+
+
+def measure(message, algorithm, threshold, repeat):
+    compression = GrpcCompression(algorithm, threshold=threshold, measure=True)
+    for _ in range(repeat):
+        compression.select(message)
+    metrics = compression.metrics()
+    size = message.ByteSize()
+    if not metrics["compressed_messages"]:
+        return size, size, 0.0
+    wire = size - metrics["bytes_saved"] / repeat
+    return size, wire, metrics["compression_seconds"] / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gRPC compression benchmark")
+    parser.add_argument("--rules", type=int, nargs="+", default=[5, 50, 500], help="Rules per hypothesis")
+    parser.add_argument("--trees", type=int, nargs="+", default=[10, 100], help="Trees per forest")
+    parser.add_argument("--algorithm", nargs="+", default=["deflate", "gzip"], choices=["deflate", "gzip"])
+    parser.add_argument("--threshold", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = [(f"rules x{n}", rules_array(n)) for n in args.rules]
+    payloads += [(f"trees x{n}", trees_array(n)) for n in args.trees]
+    payloads.append(("scores", np.array([1, 0, 7], dtype=np.int64)))
+
+    print(f"{'payload':<14}{'algorithm':<10}{'bytes':>12}{'wire':>12}{'ratio':>8}{'ms/msg':>9}")
+    for name, ndarray in payloads:
+        message = fit_message(ndarray)
+        for algorithm in args.algorithm:
+            size, wire, seconds = measure(message, algorithm, args.threshold, args.repeat)
+            print(f"{name:<14}{algorithm:<10}{size:>12}{wire:>12.0f}{size / wire:>8.1f}{seconds * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
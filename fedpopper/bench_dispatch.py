@@ -0,0 +1,88 @@
+"""
+Benchmark: Server round dispatch, a thread pool per round vs. the server's
+persistent ClientExecutor.
+
+Runs --rounds fit rounds over --clients in-process clients that answer
+immediately (or after --work ms), the way short FedPopper rounds look from
+the server, and reports the round latency for both modes plus the dispatch
+metrics of the persistent pool.
+
+    python fedpopper/bench_dispatch.py --rounds 5000 --clients 8
+    python fedpopper/bench_dispatch.py --rounds 1000 --clients 64 --work 1
+"""
+
+import argparse
+import statistics
+import time
+
+from flwr.common import Code, FitIns, FitRes, Parameters, Status
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.server import ClientExecutor, fit_clients
+
+FIT_RES = FitRes(Status(Code.OK, ""), Parameters([], ""), 1, {})
+
+
+class InstantClient(ClientProxy):
+    def __init__(self, cid, work):
+        super().__init__(cid)
+        self.work = work
+
+    def fit(self, ins, timeout, group_id):
+        if self.work:
+            time.sleep(self.work)
+        return FIT_RES
+
+    def get_properties(self, ins, timeout, group_id):
+        raise NotImplementedError()
+
+    def get_parameters(self, ins, timeout, group_id):
+        raise NotImplementedError()
+
+    def evaluate(self, ins, timeout, group_id):
+        raise NotImplementedError()
+
+    def reconnect(self, ins, timeout, group_id):
+        raise NotImplementedError()
+
+
+def run(client_instructions, num_rounds, executor):
+    latencies = []
+    for server_round in range(1, num_rounds + 1):
+        t0 = time.perf_counter()
+        results, _ = fit_clients(client_instructions, None, None, server_round, executor=executor)
+        assert len(results) == len(client_instructions)
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server round dispatch benchmark")
+    parser.add_argument("--rounds", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--work", type=float, default=0.0, help="Milliseconds each client spends in fit")
+    args = parser.parse_args()
+
+    ins = FitIns(Parameters([], ""), {})
+    client_instructions = [(InstantClient(str(i), args.work / 1000), ins) for i in range(args.clients)]
+
+    print(f"{args.rounds} rounds x {args.clients} clients ({args.work:g} ms per fit)")
+    print(f"{'mode':<12}{'total (s)':>10}{'rounds/s':>10}{'mean (ms)':>11}{'p95 (ms)':>10}")
+    executor = ClientExecutor()
+    for mode, pool in (("per-round", None), ("persistent", executor)):
+        t0 = time.perf_counter()
+        latencies = run(client_instructions, args.rounds, pool)
+        total = time.perf_counter() - t0
+        p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+        print(f"{mode:<12}{total:>10.2f}{args.rounds / total:>10.1f}"
+              f"{statistics.mean(latencies) * 1000:>11.3f}{p95 * 1000:>10.3f}")
+    executor.shutdown()
+
+    metrics = executor.metrics()
+    print(f"persistent pool: dispatch {metrics['dispatch_seconds'] / metrics['rounds'] * 1e6:.1f} us/round "
+          f"(max {metrics['max_dispatch_seconds'] * 1e3:.2f} ms), "
+          f"start delay {metrics['start_delay_seconds'] / metrics['rounds'] * 1e6:.1f} us/round "
+          f"(max {metrics['max_start_delay_seconds'] * 1e3:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: Stats duration bookkeeping, per-call lists (the old
+Stats.durations) vs. the streaming DurationHistogram.
+
+Records --calls timings spread over the five loop stages and registers a
+new best program every --best-every calls (make_program_stats summarises
+all durations each time), then reports the time and the memory held.
+
+    python fedpopper/bench_durations.py --calls 500000 --best-every 1000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from popper.util import DurationHistogram, DurationSummary
+
+STAGES = ("generate", "test", "build", "ground", "add")
+
+
+def list_summary(durations):
+    """What duration_summary did over the per-call lists."""
+    return [DurationSummary(op.title(), len(d), sum(d), sum(d) / len(d), max(d)) for op, d in durations.items()]
+
+
+def histogram_summary(durations):
+    return [DurationSummary(op.title(), d.count, d.total, d.mean, d.maximum, d.minimum,
+                            d.percentile(0.5), d.percentile(0.95), d.percentile(0.99)) for op, d in durations.items()]
+
+
+def run(timings, best_every, add, summary):
+    durations = {}
+    t0 = time.perf_counter()
+    for i, (op, duration) in enumerate(timings, 1):
+        add(durations, op, duration)
+        if i % best_every == 0:
+            summary(durations)
+    return time.perf_counter() - t0, durations
+
+
+def add_list(durations, op, duration):
+    durations.setdefault(op, []).append(duration)
+
+
+def add_histogram(durations, op, duration):
+    if op not in durations:
+        durations[op] = DurationHistogram()
+    durations[op].add(duration)
+
+
+def size_of_lists(durations):
+    return sum(sys.getsizeof(d) + len(d) * sys.getsizeof(0.0) for d in durations.values())
+
+
+def size_of_histograms(durations):
+    return sum(sys.getsizeof(d.__dict__) + sys.getsizeof(d.buckets) for d in durations.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stats duration bookkeeping benchmark")
+    parser.add_argument("--calls", type=int, default=500000)
+    parser.add_argument("--best-every", type=int, default=1000, help="Calls between two new best programs")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    timings = [(STAGES[i % len(STAGES)], rng.lognormvariate(-8, 1.5)) for i in range(args.calls)]
+
+    t_list, lists = run(timings, args.best_every, add_list, list_summary)
+    t_hist, histograms = run(timings, args.best_every, add_histogram, histogram_summary)
+
+    print(f"{args.calls} timings, summary every {args.best_every} calls")
+    print(f"lists:      {t_list:7.2f} s  {size_of_lists(lists) / 1e6:8.2f} MB")
+    print(f"histograms: {t_hist:7.2f} s  {size_of_histograms(histograms) / 1e6:8.2f} MB")
+    for op in STAGES:
+        exact = sorted(lists[op])
+        print(f"  {op:<9} p95 exact {exact[int(0.95 * len(exact))] * 1e3:8.3f} ms   "
+              f"histogram {histograms[op].percentile(0.95) * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
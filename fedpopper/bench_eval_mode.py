@@ -0,0 +1,62 @@
+"""
+Benchmark: Settings.eval_mode, i.e. how the evaluation of an example is
+bounded in lp/test.pl: a time limit per example (time, the default), one
+time limit per program (total_time) or an inference limit per example
+(inferences).
+
+Collects --programs programs by running the Popper loop on a task (clingo
+only), tests them with a fresh Tester per mode and run, each in its own
+spawned process (the Testers of a process share one SWI-Prolog engine), and
+reports the time per program, the confusion matrices that differ from the
+time mode and whether two runs of the same mode agree. Needs SWI-Prolog.
+
+    python fedpopper/bench_eval_mode.py examples/iggp-rps --programs 500
+    python fedpopper/bench_eval_mode.py examples/trains2 --programs 500
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from popper.tester import Tester
+from popper.util import EVAL_INFERENCES, EVAL_MODE_TIME, EVAL_MODES, Settings, load_kbpath
+
+from bench_stats_logging import collect
+
+
+def run(kbpath, programs, eval_mode, eval_inferences):
+    bk_file, ex_file, bias_file = load_kbpath(kbpath)
+    tester = Tester(Settings(bias_file, ex_file, bk_file, eval_mode=eval_mode, eval_inferences=eval_inferences))
+    t0 = time.perf_counter()
+    conf_matrices = [tester.test(program) for program in programs]
+    return time.perf_counter() - t0, conf_matrices, len(tester.pos) + len(tester.neg)
+
+
+def run_spawned(ctx, kbpath, programs, eval_mode, eval_inferences):
+    with ctx.Pool(1) as pool:
+        return pool.apply(run, (kbpath, programs, eval_mode, eval_inferences))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluation mode benchmark")
+    parser.add_argument("kbpath", help="Task directory, e.g. examples/iggp-rps")
+    parser.add_argument("--programs", type=int, default=500)
+    parser.add_argument("--eval-inferences", type=int, default=EVAL_INFERENCES)
+    args = parser.parse_args()
+
+    programs = [program for program, _ in collect(args.kbpath, args.programs)]
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for eval_mode in EVAL_MODES:
+        (t1, first, num_examples), (t2, second, _) = (
+            run_spawned(ctx, args.kbpath, programs, eval_mode, args.eval_inferences) for _ in range(2))
+        results[eval_mode] = first
+        differ = sum(a != b for a, b in zip(first, results[EVAL_MODE_TIME]))
+        print(f"{eval_mode:<11} {min(t1, t2) / len(programs) * 1e3:8.3f} ms/program "
+              f"({min(t1, t2) / len(programs) / num_examples * 1e6:6.2f} us/example)   "
+              f"differ from time: {differ:4d}   runs agree: {first == second}")
+    print(f"{len(programs)} programs, {num_examples} examples")
+
+
+if __name__ == "__main__":
+    main()
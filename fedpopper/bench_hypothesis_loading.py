@@ -0,0 +1,53 @@
+"""
+Benchmark: testing a hypothesis by assertz/retractall in user (the old
+Tester.success_set) vs. one test_hypothesis/2 call that loads it into a
+temporary module (lp/test.pl).
+
+Collects --programs programs by running the Popper loop on a task (clingo
+only), then tests each of them on the task's examples both ways and checks
+that the success sets agree. Needs SWI-Prolog.
+
+    python fedpopper/bench_hypothesis_loading.py examples/trains2 --programs 500
+"""
+
+import argparse
+import time
+
+from popper.tester import Tester
+from popper.util import Settings, load_kbpath
+
+from bench_stats_logging import collect
+
+
+def success_set_user(tester, rules):
+    """What success_set did: assertz every clause, query, retractall."""
+    with tester.using(rules):
+        return set(next(tester.prolog.query('success_set(Xs)'))['Xs'])
+
+
+def success_set_module(tester, rules):
+    return set(tester.first_result(f'test_hypothesis({tester.hypothesis_term(rules)},Xs)')['Xs'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hypothesis loading benchmark")
+    parser.add_argument("kbpath", help="Task directory, e.g. examples/trains2")
+    parser.add_argument("--programs", type=int, default=500)
+    args = parser.parse_args()
+
+    programs = [program for program, _ in collect(args.kbpath, args.programs)]
+    bk_file, ex_file, bias_file = load_kbpath(args.kbpath)
+    tester = Tester(Settings(bias_file, ex_file, bk_file))
+
+    results = {}
+    for name, success_set in [("assertz/retractall", success_set_user), ("temporary module", success_set_module)]:
+        t0 = time.perf_counter()
+        results[name] = [success_set(tester, program) for program in programs]
+        elapsed = time.perf_counter() - t0
+        print(f"{name:<20} {elapsed / len(programs) * 1e6:8.1f} us/program")
+    user, module = results.values()
+    print(f"{len(programs)} programs, success sets agree: {user == module}")
+
+
+if __name__ == "__main__":
+    main()
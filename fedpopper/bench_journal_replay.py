@@ -0,0 +1,87 @@
+"""
+Benchmark: rebuilding the FedPopper search state from its journal.
+
+Runs the Popper search for --rounds hypotheses with a synthetic federated
+test (no clients), journaling every round, then rebuilds a fresh solver by
+replaying the journal and compares the time of both. It also checks that
+the first hypothesis generated after the replay was not already tested.
+
+    python fedpopper/bench_journal_replay.py examples/trains --rounds 500
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+from flwr.server.strategy.fedpopper import (
+    SearchJournal,
+    canonical_program,
+    decode_program,
+    replay_journal,
+    run_popper_search,
+)
+from popper.asp import ClingoGrounder, ClingoSolver
+from popper.constrain import Constrain
+from popper.generate import generate_program
+from popper.structural_tester import StructuralTester
+from popper.util import Settings, Stats, load_kbpath
+
+
+def synthetic_test(num_rounds):
+    seen = {"n": 0}
+
+    def federated_test(program):
+        seen["n"] += 1
+        if seen["n"] > num_rounds:
+            return ("all", "none"), 0.0  # stops the search
+        h = int(hashlib.md5(canonical_program(program).encode()).hexdigest(), 16)
+        return (("all", "some", "none")[h % 3], "some"), float(h % 100)
+
+    return federated_test
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FedPopper journal replay benchmark")
+    parser.add_argument("kbpath", help="Task directory containing bias.pl")
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    for name in ("popper", "flwr"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _, _, bias_file = load_kbpath(args.kbpath)
+    settings = Settings(bias_file, None, None)
+    path = os.path.join(tempfile.mkdtemp(), "journal.jsonl")
+
+    t0 = time.perf_counter()
+    run_popper_search(
+        settings, Stats(), ClingoSolver(settings), ClingoGrounder(), Constrain(),
+        StructuralTester(), synthetic_test(args.rounds), SearchJournal(path)
+    )
+    search_time = time.perf_counter() - t0
+
+    journal = SearchJournal(path)
+    tested = {canonical_program(decode_program(r["program"])) for r in journal.records()}
+
+    t0 = time.perf_counter()
+    stats = Stats()
+    solver = ClingoSolver(settings)
+    replay_journal(journal, stats, solver)
+    replay_time = time.perf_counter() - t0
+
+    model = solver.get_model()
+    repeated = model and canonical_program(generate_program(model)[0]) in tested
+
+    rounds = stats.total_programs
+    print(f"rounds journaled:  {rounds}")
+    print(f"journal size:      {os.path.getsize(path) / 1024:.1f} KiB ({stats.total_ground_rules} ground rules)")
+    print(f"search time:       {search_time:.2f}s ({rounds / search_time:.1f} rounds/s, clients excluded)")
+    print(f"replay time:       {replay_time:.2f}s ({rounds / replay_time:.1f} rounds/s)")
+    print(f"next hypothesis after replay already tested: {'yes' if repeated else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
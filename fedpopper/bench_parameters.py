@@ -0,0 +1,71 @@
+"""
+Benchmark: Parameters serialization, `.npy` (numpy.ndarray) vs. raw buffer
+(numpy.ndarray.raw), for arrays from 1 KB to 100 MB.
+
+Each size is encoded with ndarrays_to_parameters and decoded with
+parameters_to_ndarrays --repeat times; the best time is reported as MB/s.
+A fixed-width string array (like the FedPopper rules) is measured as well.
+
+    python fedpopper/bench_parameters.py
+    python fedpopper/bench_parameters.py --sizes 1e3 1e6 --repeat 20
+"""
+
+import argparse
+import time
+
+import numpy as np
+from flwr.common import ndarrays_to_parameters, parameters_to_ndarrays
+from flwr.common.constant import SType
+
+TENSOR_TYPES = (SType.NUMPY, SType.NUMPY_RAW)
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def measure(ndarray, repeat):
+    row = {}
+    for tensor_type in TENSOR_TYPES:
+        parameters = ndarrays_to_parameters([ndarray], tensor_type)
+        assert np.array_equal(parameters_to_ndarrays(parameters)[0], ndarray)
+        row[tensor_type] = (
+            best_time(lambda: ndarrays_to_parameters([ndarray], tensor_type), repeat),
+            best_time(lambda: parameters_to_ndarrays(parameters), repeat),
+        )
+    return row
+
+
+def label(nbytes):
+    for unit, size in (("MB", 1e6), ("KB", 1e3)):
+        if nbytes >= size:
+            return f"{nbytes / size:g} {unit}"
+    return f"{nbytes} B"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parameters serialization benchmark")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1e3, 1e4, 1e5, 1e6, 1e7, 1e8], help="Array sizes in bytes")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    arrays = [(label(int(size)), np.random.default_rng(0).random(int(size) // 4, dtype=np.float32)) for size in args.sizes]
+    rules = np.array([f"f(A):-has_car(A,B),short(B),closed(B),p{i}(B)" for i in range(200)], dtype="<U1000")
+    arrays.append((f"rules {label(rules.nbytes)}", rules))
+
+    print(f"{'array':<18}{'npy enc':>10}{'raw enc':>10}{'npy dec':>10}{'raw dec':>12}   (MB/s)")
+    for name, ndarray in arrays:
+        row = measure(ndarray, args.repeat)
+        mb = ndarray.nbytes / 1e6
+        npy_enc, npy_dec = row[SType.NUMPY]
+        raw_enc, raw_dec = row[SType.NUMPY_RAW]
+        print(f"{name:<18}{mb / npy_enc:>10.0f}{mb / raw_enc:>10.0f}{mb / npy_dec:>10.0f}{mb / raw_dec:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
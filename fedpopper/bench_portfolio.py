@@ -0,0 +1,112 @@
+"""
+Benchmark: portfolio search (popper.portfolio.learn_portfolio) on the example
+suite with 1, 4, 8 and 16 workers, against the sequential loop.
+
+    python fedpopper/bench_portfolio.py examples examples2 --workers 1,4,8,16 --timeout 120 --out portfolio.json
+    python fedpopper/bench_portfolio.py examples --tasks robots-pi,trains2 --schedule mixed
+
+Every worker runs the Popper loop with its own clingo configuration (and
+size schedule with --schedule mixed), and the workers share their ground
+constraints. Per task and number of workers the report gives the wall time,
+whether a solution was found, the programs tested by all workers, the
+constraints each worker received from the others, and the speedup against
+the sequential loop (learn_solution). Workers beyond the number of cores
+share them, so scaling is only meaningful up to os.cpu_count(). Every run,
+the sequential one included, gets its own spawned process: the SWI-Prolog
+engine of a process would keep the BK and examples of the earlier tasks.
+Needs SWI-Prolog.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import time
+
+from popper.loop import calc_score, learn_solution
+from popper.portfolio import learn_portfolio
+from popper.util import SCHEDULE_ASCENDING, SCHEDULES, Settings, load_kbpath
+
+from bench_suite import find_tasks
+
+
+def run(kbpath, workers, timeout, schedule):
+    bk_file, ex_file, bias_file = load_kbpath(kbpath)
+    settings = Settings(bias_file, ex_file, bk_file, timeout=timeout)
+    t0 = time.perf_counter()
+    if workers:
+        _, stats, results = learn_portfolio(settings, workers, schedule)
+    else:
+        _, stats = learn_solution(settings)
+        results = []
+    wall = time.perf_counter() - t0
+    best = stats.best_program
+    return {
+        "wall": wall,
+        "solution": stats.solution is not None,
+        "score": calc_score(best.conf_matrix) if best else None,
+        "programs": stats.total_programs,
+        "received": sum(result["received"] for result in results),
+        "errors": [result["error"] for result in results if result["status"] == "error"],
+        "winner": next((result["clingo_args"] for result in results if result["status"] == "solution"), None),
+    }
+
+
+def run_child(kbpath, workers, timeout, schedule, conn):
+    """Child process: one run, send back the result dict."""
+    try:
+        result = run(kbpath, workers, timeout, schedule)
+    except Exception as e:
+        result = {"wall": 0.0, "solution": False, "score": None, "programs": 0, "received": 0,
+                  "errors": [f"{type(e).__name__}: {e}"], "winner": None}
+    conn.send(result)
+
+
+def run_spawned(ctx, kbpath, workers, timeout, schedule):
+    # not a daemon: the portfolio workers are its children
+    parent, child = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=run_child, args=(kbpath, workers, timeout, schedule, child))
+    process.start()
+    child.close()
+    result = parent.recv()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio search scaling benchmark")
+    parser.add_argument("roots", nargs="+", help="Directories of tasks, e.g. examples examples2")
+    parser.add_argument("--tasks", type=str, default="", help="Comma-separated task names to run (default: all)")
+    parser.add_argument("--workers", type=str, default="1,4,8,16", help="Comma-separated numbers of portfolio workers")
+    parser.add_argument("--schedule", default=SCHEDULE_ASCENDING, choices=SCHEDULES)
+    parser.add_argument("--timeout", type=int, default=120, help="Popper timeout per run (seconds)")
+    parser.add_argument("--out", type=str, default="", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    tasks = find_tasks(args.roots, set(args.tasks.split(",")) if args.tasks else None)
+    counts = [int(n) for n in args.workers.split(",")]
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for kbpath in tasks:
+        # 0 workers: the sequential loop, the baseline of the speedups
+        results[kbpath] = {workers: run_spawned(ctx, kbpath, workers, args.timeout, args.schedule) for workers in [0] + counts}
+        base = results[kbpath][0]["wall"]
+        for workers, result in results[kbpath].items():
+            result["speedup"] = base / result["wall"] if result["wall"] else None
+            speedup = f"x{result['speedup']:5.2f}" if result["speedup"] is not None else "     -"
+            print(f"{kbpath:<40} {workers or 'seq':>4} {result['wall']:8.2f}s  {speedup}  "
+                  f"solution {result['solution']!s:<5} programs {result['programs']:>7} received {result['received']:>8}", flush=True)
+
+    solved = {workers: sum(results[t][workers]["solution"] for t in tasks) for workers in [0] + counts}
+    walls = {workers: sum(results[t][workers]["wall"] for t in tasks) for workers in [0] + counts}
+    for workers in [0] + counts:
+        print(f"{workers or 'seq':>4} workers: {solved[workers]}/{len(tasks)} solved, total {walls[workers]:.1f}s")
+    if args.out:
+        meta = {"cpu_count": os.cpu_count(), "platform": platform.platform(), "timeout": args.timeout, "schedule": args.schedule}
+        with open(args.out, "w") as f:
+            json.dump({"meta": meta, "tasks": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: client result logging, read-rewrite CSV (the old
+save_client_result) vs. the append-only ResultsLog.
+
+Logs --rows results for --clients clients and --datasets datasets and
+reports the time per call seen by the caller (the fit path) and the total
+time including the final flush/compaction.
+
+    python fedpopper/bench_results_log.py --rows 5000
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from popper.core import Literal
+
+from results_log import CSV_COLUMNS, ResultsLog, compact, result_row
+
+
+def rewrite_csv(csv_path, row):
+    """What save_client_result did: read all, drop the same key, rewrite."""
+    rows = []
+    if os.path.exists(csv_path):
+        with open(csv_path) as f:
+            for old in csv.DictReader(f):
+                if not (old["client_id"] == row["client_id"] and old["dataset"] == row["dataset"]):
+                    rows.append(old)
+    rows.append(row)
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def rows(num_rows, num_clients, num_datasets):
+    rules = [(Literal.from_string("f(A)"), (Literal.from_string("has_car(A,B)"), Literal.from_string("short(B)")))]
+    for i in range(num_rows):
+        yield result_row(i % num_clients, f"dataset{(i // num_clients) % num_datasets}", rules, (5, 1, 6, 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Results logging benchmark")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=3)
+    parser.add_argument("--datasets", type=int, default=500, help="Distinct datasets, i.e. rows kept in the CSV")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    data = list(rows(args.rows, args.clients, args.datasets))
+
+    csv_path = os.path.join(workdir, "rewrite.csv")
+    t0 = time.perf_counter()
+    for row in data:
+        rewrite_csv(csv_path, row)
+    rewrite_total = time.perf_counter() - t0
+
+    log_path = os.path.join(workdir, "results.jsonl")
+    log = ResultsLog(log_path)
+    t0 = time.perf_counter()
+    for row in data:
+        log.append(row)
+    append_calls = time.perf_counter() - t0
+    log.close()
+    t1 = time.perf_counter()
+    kept = compact(log_path, os.path.join(workdir, "compact.csv"))
+    append_total = time.perf_counter() - t0
+    compact_time = time.perf_counter() - t1
+
+    print(f"{args.rows} results, {kept} kept ({args.clients} clients x {args.datasets} datasets)")
+    print(f"rewrite CSV:  {rewrite_total / args.rows * 1e6:10.1f} us/call   total {rewrite_total:.2f} s")
+    print(f"results log:  {append_calls / args.rows * 1e6:10.1f} us/call   total {append_total:.2f} s "
+          f"(compaction {compact_time:.3f} s)")
+
+
+if __name__ == "__main__":
+    main()
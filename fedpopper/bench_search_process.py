@@ -0,0 +1,107 @@
+"""
+Benchmark: FedPopper search loop in a thread vs. in a child process.
+
+32 simulated clients answer every hypothesis from a thread pool, going
+through the same protobuf (de)serialisation as the gRPC servicer threads,
+so the Python-level work of the clients competes with the search loop for
+the GIL exactly as it does in the Flower server.
+
+Clients do not run Prolog: each one answers with a deterministic outcome
+derived from the hypothesis, which keeps the search running for --rounds.
+
+    python fedpopper/bench_search_process.py examples/trains --clients 32 --rounds 300
+"""
+
+import argparse
+import hashlib
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from flwr.common import Code, FitIns, FitRes, Status, ndarrays_to_parameters, parameters_to_ndarrays
+from flwr.common import serde
+from flwr.server.strategy.fedpopper import FedPopper, OUTCOME_ENCODING
+from popper.util import Settings, load_kbpath
+
+
+class SimClient:
+    def __init__(self, cid):
+        self.cid = str(cid)
+
+    def fit(self, ins):
+        # server -> client, as on the wire
+        ins = serde.fit_ins_from_proto(serde.fit_ins_to_proto(ins))
+        rules = parameters_to_ndarrays(ins.parameters)[0].tolist()
+
+        h = int(hashlib.md5(("|".join(rules) + self.cid).encode()).hexdigest(), 16)
+        e_pos = ("all", "some", "none")[h % 3]
+        # client 0 always covers a negative, so the run never stops early
+        e_neg = "some" if self.cid == "0" or (h >> 4) % 2 else "none"
+        payload = np.array(
+            [OUTCOME_ENCODING[e_pos], OUTCOME_ENCODING[e_neg], h % 100],
+            dtype=np.int64
+        )
+        res = FitRes(Status(Code.OK, ""), ndarrays_to_parameters([payload]), 1, {})
+
+        # client -> server, as on the wire
+        return serde.fit_res_from_proto(serde.fit_res_to_proto(res))
+
+
+def run(settings, num_clients, num_rounds, search_process):
+    clients = [SimClient(i) for i in range(num_clients)]
+    strategy = FedPopper(
+        settings,
+        min_fit_clients=num_clients,
+        min_evaluate_clients=num_clients,
+        min_available_clients=num_clients,
+        search_process=search_process,
+    )
+
+    latencies = []
+    start = time.perf_counter()
+    parameters = strategy.initialize_parameters(None)
+    startup = time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=num_clients) as executor:
+        for server_round in range(1, num_rounds + 1):
+            if strategy.early_stop:
+                break
+            t0 = time.perf_counter()
+            ins = FitIns(parameters, {"round": server_round})
+            futures = [executor.submit(c.fit, ins) for c in clients]
+            results = [(c, f.result()) for c, f in zip(clients, futures)]
+            parameters, _ = strategy.aggregate_fit(server_round, results, [])
+            latencies.append(time.perf_counter() - t0)
+
+    return startup, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FedPopper search thread vs. search process")
+    parser.add_argument("kbpath", help="Task directory containing bias.pl")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    # keep per-round logging out of the measurement (also applies to the search process)
+    for name in ("popper", "flwr"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _, _, bias_file = load_kbpath(args.kbpath)
+
+    print(f"{'mode':<10}{'startup (s)':>12}{'rounds':>8}{'rounds/s':>10}{'mean (ms)':>12}{'p95 (ms)':>10}")
+    for search_process in (False, True):
+        settings = Settings(bias_file, None, None)
+        startup, latencies = run(settings, args.clients, args.rounds, search_process)
+        p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+        mean = statistics.mean(latencies) if latencies else 0.0
+        rate = len(latencies) / sum(latencies) if latencies else 0.0
+        mode = "process" if search_process else "thread"
+        print(f"{mode:<10}{startup:>12.2f}{len(latencies):>8}{rate:>10.1f}"
+              f"{mean * 1000:>12.2f}{p95 * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
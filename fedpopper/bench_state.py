@@ -0,0 +1,128 @@
+"""
+Benchmark: SuperLink task state under many short FedPopper rounds.
+
+Drives --rounds rounds with --nodes nodes through the State API, the way the
+Driver and Fleet APIs do it: the driver pushes one TaskIns per node, every
+node polls (--polls times, only the first poll finds its task), answers with
+a TaskRes, the driver pulls the replies and deletes the finished tasks.
+
+Every state in --state runs the same number of rounds:
+    - memory:        InMemoryState
+    - sqlite-legacy: SqliteState file, rollback journal and synchronous=FULL
+    - sqlite:        SqliteState file, WAL and synchronous=NORMAL (default)
+    - sqlite-wb:     as sqlite, with a write-behind buffer of --write-behind tasks
+
+    python fedpopper/bench_state.py --rounds 10000 --nodes 64
+    python fedpopper/bench_state.py --rounds 500 --state memory sqlite-legacy sqlite sqlite-wb
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from flwr.common import DEFAULT_TTL
+from flwr.proto.node_pb2 import Node
+from flwr.proto.recordset_pb2 import RecordSet
+from flwr.proto.task_pb2 import Task, TaskIns, TaskRes
+from flwr.server.superlink.state import InMemoryState, SqliteState
+
+
+def make_task_ins(run_id, node_id):
+    now = time.time()
+    return TaskIns(
+        task_id="",
+        group_id="",
+        run_id=run_id,
+        task=Task(
+            producer=Node(node_id=0, anonymous=True),
+            consumer=Node(node_id=node_id, anonymous=False),
+            task_type="fit",
+            recordset=RecordSet(),
+            ttl=DEFAULT_TTL,
+            created_at=now,
+            pushed_at=now,
+        ),
+    )
+
+
+def make_task_res(task_ins):
+    now = time.time()
+    return TaskRes(
+        task_id="",
+        group_id="",
+        run_id=task_ins.run_id,
+        task=Task(
+            producer=Node(node_id=task_ins.task.consumer.node_id, anonymous=False),
+            consumer=Node(node_id=0, anonymous=True),
+            ancestry=[task_ins.task_id],
+            task_type="fit",
+            recordset=RecordSet(),
+            ttl=DEFAULT_TTL,
+            created_at=now,
+            pushed_at=now,
+        ),
+    )
+
+
+def make_state(kind, path, write_behind):
+    if kind == "memory":
+        return InMemoryState()
+    if kind == "sqlite-legacy":
+        state = SqliteState(path, journal_mode="DELETE", synchronous="FULL")
+    elif kind == "sqlite-wb":
+        state = SqliteState(path, write_behind=write_behind)
+    else:
+        state = SqliteState(path)
+    state.initialize()
+    return state
+
+
+def run(state, num_rounds, num_nodes, num_polls):
+    run_id = state.create_run("fedpopper", "1.0")
+    node_ids = [state.create_node(ping_interval=3600) for _ in range(num_nodes)]
+
+    latencies = []
+    for _ in range(num_rounds):
+        t0 = time.perf_counter()
+        task_ids = set(state.store_task_ins_list([make_task_ins(run_id, node_id) for node_id in node_ids]))
+        for node_id in node_ids:
+            for task_ins in state.get_task_ins(node_id=node_id, limit=1):
+                state.store_task_res(make_task_res(task_ins))
+            for _ in range(num_polls - 1):
+                state.get_task_ins(node_id=node_id, limit=1)
+        replies = state.get_task_res(task_ids, limit=None)
+        assert len(replies) == num_nodes
+        state.delete_tasks(task_ids)
+        latencies.append(time.perf_counter() - t0)
+
+    return latencies, state.num_task_ins(), state.num_task_res()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SuperLink state benchmark")
+    parser.add_argument("--rounds", type=int, default=10000)
+    parser.add_argument("--nodes", type=int, default=64)
+    parser.add_argument("--polls", type=int, default=2, help="get_task_ins calls per node and round")
+    parser.add_argument("--state", nargs="+", default=["memory"],
+                        choices=["memory", "sqlite-legacy", "sqlite", "sqlite-wb"])
+    parser.add_argument("--write-behind", type=int, default=256, help="Buffer size for --state sqlite-wb")
+    args = parser.parse_args()
+
+    print(f"{args.rounds} rounds x {args.nodes} nodes ({args.polls} polls per node)")
+    print(f"{'state':<15}{'total (s)':>10}{'rounds/s':>10}{'mean (ms)':>11}{'p95 (ms)':>10}{'left':>6}")
+    workdir = tempfile.mkdtemp()
+    for kind in args.state:
+        state = make_state(kind, os.path.join(workdir, f"{kind}.db"), args.write_behind)
+        t0 = time.perf_counter()
+        latencies, left_ins, left_res = run(state, args.rounds, args.nodes, args.polls)
+        total = time.perf_counter() - t0
+
+        p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+        print(f"{kind:<15}{total:>10.2f}{args.rounds / total:>10.1f}"
+              f"{statistics.mean(latencies) * 1000:>11.2f}{p95 * 1000:>10.2f}{left_ins + left_res:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: Stats bookkeeping in the generate/test loop (register_program and
+register_rules) with the "popper" logger at INFO, i.e. DEBUG disabled.
+
+Collects --programs programs and their constraints by running the Popper
+loop on a task (clingo only, the outcome is fixed to (SOME, SOME) so no
+Prolog is needed), then times the Stats calls made for them.
+
+    python fedpopper/bench_stats_logging.py examples/trains2 --programs 2000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from popper.asp import ClingoGrounder, ClingoSolver
+from popper.constrain import Constrain
+from popper.generate import generate_program
+from popper.loop import Outcome, build_rules, ground_rules
+from popper.structural_tester import StructuralTester
+from popper.util import Settings, Stats, load_kbpath
+
+
+def collect(kbpath, num_programs):
+    _, _, bias_file = load_kbpath(kbpath)
+    settings = Settings(bias_file, None, None)
+    stats = Stats()
+    solver, grounder, constrainer, tester = ClingoSolver(settings), ClingoGrounder(), Constrain(), StructuralTester()
+    collected = []
+    for size in range(1, settings.max_literals + 1):
+        solver.update_number_of_literals(size)
+        while len(collected) < num_programs:
+            model = solver.get_model()
+            if not model:
+                break
+            program, before, min_clause = generate_program(model)
+            rules = build_rules(settings, stats, constrainer, tester, program, before, min_clause, (Outcome.SOME, Outcome.SOME))
+            collected.append((program, rules))
+            solver.add_ground_clauses(ground_rules(stats, grounder, solver.max_clauses, solver.max_vars, rules))
+        if len(collected) >= num_programs:
+            break
+    return collected
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stats logging overhead benchmark")
+    parser.add_argument("kbpath", help="Task directory, e.g. examples/trains2")
+    parser.add_argument("--programs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("popper").setLevel(logging.INFO)
+    collected = collect(args.kbpath, args.programs)
+    conf_matrix = (3, 2, 4, 1)
+
+    def register_programs(stats):
+        for program, _ in collected:
+            stats.register_program(program, conf_matrix)
+
+    def register_rules(stats):
+        for _, rules in collected:
+            stats.register_rules(rules)
+
+    num_rules = sum(len(rules) for _, rules in collected)
+    print(f"{len(collected)} programs, {num_rules} constraints (popper logger at INFO)")
+    modes = [("stats", {})]
+    if "trace_programs" in Stats.__init__.__code__.co_varnames:
+        modes.append(("stats+trace", {"trace_programs": os.path.join(tempfile.mkdtemp(), "programs.jsonl")}))
+    for name, kwargs in modes:
+        stats = Stats(**kwargs)
+        t_prog = best_time(lambda: register_programs(stats), args.repeat)
+        t_rules = best_time(lambda: register_rules(stats), args.repeat)
+        print(f"{name:<12} register_program {t_prog / len(collected) * 1e6:8.2f} us/call   "
+              f"register_rules {t_rules / len(collected) * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
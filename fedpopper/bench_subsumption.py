@@ -0,0 +1,76 @@
+"""
+Benchmark: redundant-literal and redundant-clause checks, Prolog
+(redundant_literal/1 and redundant_clause/1 in popper/lp/test.pl through
+pyswip) vs. the Python SubsumptionChecker.
+
+Collects --programs programs by running the Popper loop on a task (clingo
+only, the outcome is fixed to (SOME, SOME)), then times both checks over
+them. The Prolog side is skipped when SWI-Prolog is not available.
+
+    python fedpopper/bench_subsumption.py examples/trains2 --programs 2000
+"""
+
+import argparse
+import time
+
+import pkg_resources
+
+from popper.core import Literal
+from popper.subsumption import SubsumptionChecker
+
+from bench_stats_logging import collect
+
+
+def prolog_clause(clause):
+    (head, body) = clause
+    return f"[{','.join(('not_'+ Literal.to_code(head),) + tuple(Literal.to_code(lit) for lit in body))}]"
+
+
+def run_prolog(programs):
+    from pyswip import Prolog
+    prolog = Prolog()
+    prolog.consult(pkg_resources.resource_filename("popper", "lp/test.pl"))
+    literals = clauses = 0
+    for program in programs:
+        for clause in program:
+            literals += bool(list(prolog.query(f"redundant_literal({prolog_clause(clause)})")))
+        prog = f"[{','.join(prolog_clause(clause) for clause in program)}]"
+        clauses += bool(list(prolog.query(f"redundant_clause({prog})")))
+    return literals, clauses
+
+
+def run_python(programs):
+    checker = SubsumptionChecker()
+    literals = clauses = 0
+    for program in programs:
+        for clause in program:
+            literals += checker.redundant_literal(clause)
+        clauses += checker.redundant_clause(program)
+    return literals, clauses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redundancy check benchmark")
+    parser.add_argument("kbpath", help="Task directory, e.g. examples/trains2")
+    parser.add_argument("--programs", type=int, default=2000)
+    args = parser.parse_args()
+
+    programs = [program for program, _ in collect(args.kbpath, args.programs)]
+    num_clauses = sum(len(program) for program in programs)
+    print(f"{len(programs)} programs, {num_clauses} clauses")
+
+    runs = [("python", run_python), ("prolog", run_prolog)]
+    for name, run in runs:
+        t0 = time.perf_counter()
+        try:
+            literals, clauses = run(programs)
+        except Exception as e:
+            print(f"{name:<7} skipped ({type(e).__name__}: {e})")
+            continue
+        elapsed = time.perf_counter() - t0
+        print(f"{name:<7} {elapsed / len(programs) * 1e6:8.1f} us/program   "
+              f"redundant literals {literals}, redundant clauses {clauses}")
+
+
+if __name__ == "__main__":
+    main()
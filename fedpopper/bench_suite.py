@@ -0,0 +1,221 @@
+"""
+Benchmark suite: run Popper (learn_solution) on every task of examples/ and
+examples2/ with a fixed seed and timeout, and compare two result sets.
+
+    python fedpopper/bench_suite.py run examples examples2 --timeout 60 --out base.json
+    python fedpopper/bench_suite.py run examples --tasks trains2,iggp-rps --repeat 3 --out new.json
+    python fedpopper/bench_suite.py compare base.json new.json --threshold 0.2
+
+A task is a directory with bias.pl, bk.pl and exs.pl. Every run is a fresh
+process (one SWI-Prolog engine per process, peak RSS of that run only) with
+clingo --seed=<seed>; the parent kills it if it outlives the timeout. Per
+task the result records:
+    - status (ok/timeout/killed/error), execution time, peak RSS
+    - programs tested, constraints and ground rules added
+    - Stats.duration_summary per stage (called, total, mean, max, p95)
+    - solution found, best program and its confusion matrix and score
+With --repeat N the times and RSS are the medians of N runs, and counts that
+differ between runs mark the task as nondeterministic.
+
+compare flags, for the tasks in both files: a lost solution or a lower
+score, more programs tested, and times (total and per stage) or peak RSS
+more than --threshold above the baseline (times under --min-time seconds
+are ignored). It exits with status 1 if anything regressed.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+TASK_FILES = ("bias.pl", "bk.pl", "exs.pl")
+STATUS_OK, STATUS_TIMEOUT, STATUS_KILLED, STATUS_ERROR = "ok", "timeout", "killed", "error"
+
+
+def find_tasks(roots, names=None):
+    tasks = []
+    for root in roots:
+        for name in sorted(os.listdir(root)):
+            path = os.path.join(root, name)
+            if all(os.path.isfile(os.path.join(path, f)) for f in TASK_FILES):
+                if not names or name in names:
+                    tasks.append(path)
+    return tasks
+
+
+def run_task(kbpath, timeout, seed, conn):
+    """Child process: learn on one task, send back the result dict."""
+    import logging
+    from popper.loop import calc_score, learn_solution
+    from popper.util import Settings, load_kbpath
+
+    logging.getLogger("popper").setLevel(logging.WARNING)
+    random.seed(seed)
+    result = {}
+    try:
+        bk_file, ex_file, bias_file = load_kbpath(kbpath)
+        settings = Settings(bias_file, ex_file, bk_file, timeout=timeout, clingo_args=[f"--seed={seed}"])
+        t0 = time.perf_counter()
+        _, stats = learn_solution(settings)
+        result["exec_time"] = time.perf_counter() - t0
+        result["status"] = STATUS_TIMEOUT if result["exec_time"] >= timeout else STATUS_OK
+        result["programs"] = stats.total_programs
+        result["constraints"] = stats.total_rules
+        result["ground_rules"] = stats.total_ground_rules
+        result["stages"] = {
+            s.operation: {"called": s.called, "total": s.total, "mean": s.mean, "max": s.maximum, "p95": s.p95}
+            for s in stats.duration_summary()
+        }
+        best = stats.best_program
+        result["solution"] = stats.solution is not None
+        result["program"] = best.code if best else None
+        result["conf_matrix"] = list(best.conf_matrix) if best else None
+        result["score"] = calc_score(best.conf_matrix) if best else None
+    except Exception as e:
+        result["status"] = STATUS_ERROR
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    conn.send(result)
+
+
+def run_once(ctx, kbpath, timeout, seed, grace):
+    parent, child = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=run_task, args=(kbpath, timeout, seed, child), daemon=True)
+    t0 = time.perf_counter()
+    process.start()
+    child.close()
+    if parent.poll(timeout + grace):
+        result = parent.recv()
+    else:
+        process.kill()
+        result = {"status": STATUS_KILLED, "exec_time": time.perf_counter() - t0}
+    process.join()
+    return result
+
+
+COUNTS = ("programs", "constraints", "ground_rules", "solution", "conf_matrix")
+
+
+def run_suite(tasks, timeout, seed, repeat, grace):
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for kbpath in tasks:
+        runs = [run_once(ctx, kbpath, timeout, seed, grace) for _ in range(repeat)]
+        result = dict(runs[0])
+        ok = [run for run in runs if run["status"] == STATUS_OK]
+        if len(ok) == len(runs):
+            result["exec_time"] = statistics.median(run["exec_time"] for run in runs)
+            result["peak_rss_mb"] = statistics.median(run["peak_rss_mb"] for run in runs)
+            for stage in result["stages"]:
+                result["stages"][stage]["total"] = statistics.median(
+                    run["stages"].get(stage, {}).get("total", 0.0) for run in runs)
+            result["deterministic"] = all(all(run.get(k) == result.get(k) for k in COUNTS) for run in runs)
+        result["runs"] = len(runs)
+        results[kbpath] = result
+        print(f"{kbpath:<45} {result['status']:<8} {result.get('exec_time', 0.0):8.2f}s "
+              f"programs {result.get('programs', '-')!s:>7}  solution {result.get('solution', '-')!s:<5} "
+              f"rss {result.get('peak_rss_mb', 0.0):7.1f} MB", flush=True)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(base, new, threshold, min_time):
+    """Regressions of new against base, as (task, message) pairs."""
+    regressions = []
+
+    def slower(task, what, old, current):
+        if current > min_time and current > old * (1 + threshold):
+            regressions.append((task, f"{what} {old:.3f}s -> {current:.3f}s (+{(current / max(old, 1e-9) - 1):.0%})"))
+
+    for task, old in base["tasks"].items():
+        current = new["tasks"].get(task)
+        if current is None:
+            continue
+        if old["status"] == STATUS_OK and current["status"] != STATUS_OK:
+            regressions.append((task, f"status {old['status']} -> {current['status']}"))
+            continue
+        if old["status"] != STATUS_OK or current["status"] != STATUS_OK:
+            # a failed baseline run has nothing to compare against
+            continue
+        if old.get("solution") and not current.get("solution"):
+            regressions.append((task, "solution lost"))
+        if (old.get("score") or 0) > (current.get("score") or 0):
+            regressions.append((task, f"score {old.get('score')} -> {current.get('score')}"))
+        if current.get("programs", 0) > old.get("programs", 0):
+            regressions.append((task, f"programs {old.get('programs')} -> {current.get('programs')}"))
+        slower(task, "exec_time", old["exec_time"], current["exec_time"])
+        for stage, summary in current.get("stages", {}).items():
+            if stage in old.get("stages", {}):
+                slower(task, f"{stage}", old["stages"][stage]["total"], summary["total"])
+        if current.get("peak_rss_mb", 0) > old.get("peak_rss_mb", 0) * (1 + threshold):
+            regressions.append((task, f"peak RSS {old['peak_rss_mb']:.1f} MB -> {current['peak_rss_mb']:.1f} MB"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Popper benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run", help="Run learn_solution on every task")
+    p.add_argument("roots", nargs="+", help="Directories of tasks, e.g. examples examples2")
+    p.add_argument("--tasks", type=str, default="", help="Comma-separated task names to run (default: all)")
+    p.add_argument("--timeout", type=int, default=60, help="Popper timeout per task (seconds)")
+    p.add_argument("--grace", type=float, default=30.0, help="Seconds after the timeout before the run is killed")
+    p.add_argument("--seed", type=int, default=0, help="clingo --seed and Python random seed")
+    p.add_argument("--repeat", type=int, default=1, help="Runs per task (median times)")
+    p.add_argument("--out", type=str, required=True, help="Result file (JSON)")
+    p = sub.add_parser("compare", help="Flag regressions between two result files")
+    p.add_argument("base", help="Baseline result file")
+    p.add_argument("new", help="Result file to check")
+    p.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown/RSS growth flagged as regression")
+    p.add_argument("--min-time", type=float, default=0.5, help="Ignore times below this many seconds")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        names = set(args.tasks.split(",")) if args.tasks else None
+        tasks = find_tasks(args.roots, names)
+        meta = {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timeout": args.timeout,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        }
+        results = run_suite(tasks, args.timeout, args.seed, args.repeat, args.grace)
+        with open(args.out, "w") as f:
+            json.dump({"meta": meta, "tasks": results}, f, indent=2)
+        print(f"{len(results)} tasks written to {args.out}")
+
+    elif args.command == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        if (base["meta"]["timeout"], base["meta"]["seed"]) != (new["meta"]["timeout"], new["meta"]["seed"]):
+            print("warning: the result sets use different timeouts or seeds")
+        regressions = compare(base, new, args.threshold, args.min_time)
+        common = set(base["tasks"]) & set(new["tasks"])
+        for task, message in regressions:
+            print(f"REGRESSION {task}: {message}")
+        print(f"{len(common)} common tasks, {len(regressions)} regressions "
+              f"({base['meta'].get('commit')} -> {new['meta'].get('commit')})")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
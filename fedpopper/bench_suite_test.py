@@ -0,0 +1,28 @@
+"""Tests for the regression check of the benchmark suite."""
+
+from bench_suite import STATUS_ERROR, STATUS_KILLED, STATUS_OK, compare
+
+
+def ok_run(exec_time, **fields):
+    return dict({"status": STATUS_OK, "exec_time": exec_time, "peak_rss_mb": 100.0, "stages": {}}, **fields)
+
+
+def test_compare_flags_slower_tasks():
+    base = {"tasks": {"a": ok_run(1.0), "b": ok_run(1.0)}}
+    new = {"tasks": {"a": ok_run(2.0), "b": ok_run(1.05)}}
+    assert [task for task, _ in compare(base, new, threshold=0.1, min_time=0.5)] == ["a"]
+
+
+def test_compare_skips_failed_baselines():
+    base = {"tasks": {
+        "error": {"status": STATUS_ERROR, "error": "RuntimeError: boom", "peak_rss_mb": 50.0},
+        "killed": {"status": STATUS_KILLED, "exec_time": 90.0},
+    }}
+    new = {"tasks": {"error": ok_run(1.0), "killed": ok_run(1.0)}}
+    assert compare(base, new, threshold=0.1, min_time=0.5) == []
+
+
+def test_compare_flags_new_failures():
+    base = {"tasks": {"a": ok_run(1.0)}}
+    new = {"tasks": {"a": {"status": STATUS_ERROR, "error": "RuntimeError: boom"}}}
+    assert compare(base, new, threshold=0.1, min_time=0.5) == [("a", "status ok -> error")]
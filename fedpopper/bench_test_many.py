@@ -0,0 +1,51 @@
+"""
+Benchmark: Tester.test() in a loop vs. one Tester.test_many() call per
+batch (success_sets/2 in lp/test.pl, coverage as bitmasks).
+
+Collects --programs programs by running the Popper loop on a task (clingo
+only), then tests them in batches of --batch on the task's examples both
+ways, each with a fresh Tester, and checks that the confusion matrices
+agree. Needs SWI-Prolog.
+
+    python fedpopper/bench_test_many.py examples/trains2 --programs 1000 --batch 50
+"""
+
+import argparse
+import time
+
+from popper.tester import Tester
+from popper.util import Settings, load_kbpath
+
+from bench_stats_logging import collect
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched coverage benchmark")
+    parser.add_argument("kbpath", help="Task directory, e.g. examples/trains2")
+    parser.add_argument("--programs", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=50, help="Programs per test_many() call")
+    args = parser.parse_args()
+
+    programs = [program for program, _ in collect(args.kbpath, args.programs)]
+    batches = [programs[i:i + args.batch] for i in range(0, len(programs), args.batch)]
+    bk_file, ex_file, bias_file = load_kbpath(args.kbpath)
+    settings = Settings(bias_file, ex_file, bk_file)
+
+    tester = Tester(settings)
+    t0 = time.perf_counter()
+    looped = [tester.test(program) for program in programs]
+    t_loop = time.perf_counter() - t0
+
+    tester = Tester(settings)
+    t0 = time.perf_counter()
+    batched = [conf_matrix for batch in batches for conf_matrix in tester.test_many(batch)]
+    t_batch = time.perf_counter() - t0
+
+    print(f"{len(programs)} programs, {len(tester.pos)} pos / {len(tester.neg)} neg examples, batch {args.batch}")
+    print(f"test() loop:  {t_loop / len(programs) * 1e6:8.1f} us/program")
+    print(f"test_many():  {t_batch / len(programs) * 1e6:8.1f} us/program   ({t_loop / t_batch:.1f}x)")
+    print(f"confusion matrices agree: {looped == batched}")
+
+
+if __name__ == "__main__":
+    main()
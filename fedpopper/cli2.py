@@ -22,7 +22,7 @@ bk_file, ex_file, bias_file = load_kbpath(DATASET_PATH)
 settings = Settings(bias_file, ex_file, bk_file)
 tester = Tester(settings)
 stats = Stats(log_best_programs=settings.info)
-settings.num_pos, settings.num_neg = len(tester.pos), len(tester.neg)
+settings.num_pos, settings.num_neg = tester.num_pos, tester.num_neg
 
 
 def transform_rule_to_tester_format(rule_str):
@@ -5,15 +5,12 @@ from popper.core import Clause, Literal
 from popper.util import load_kbpath, format_program
 from popper.loop import decide_outcome, Outcome, calc_score
 import flwr as fl
+from results_log import ResultsLog, result_row
+from flwr.common.trace import Tracer
 import numpy as np
-import csv
-import os
-from datetime import datetime
 from popper.core import Literal
 import pandas as pd 
 
-GLOBAL_CSV_PATH = "fedpopper_results_global.csv"
-CSV_FILE = "fedpopper_results_client2.csv"
 # Outcome Encoding
 OUTCOME_ENCODING = {"ALL": 1, "SOME": 2, "NONE": 3}
 OUTCOME_DECODING = {1: "ALL", 2: "SOME", 3: "NONE"}
@@ -34,10 +31,12 @@ bk_file, ex_file, bias_file = load_kbpath(kbpath)
 settings = Settings(bias_file, ex_file, bk_file)
 tester = Tester(settings)
 stats = Stats(log_best_programs=settings.info)
-settings.num_pos, settings.num_neg = len(tester.pos), len(tester.neg)
+settings.num_pos, settings.num_neg = tester.num_pos, tester.num_neg
 best_score = None
 import re
 CLIENT_ID = 3
+TRACE_FILE = None  # e.g. f"trace_client{CLIENT_ID}.jsonl", see trace_merge.py
+tracer = Tracer(TRACE_FILE, f"client-{CLIENT_ID}")
 def parse_clause(code: str):
     """Convert a Prolog-style rule back into (head, body) tuple."""
     
@@ -89,87 +88,16 @@ def transform_rule_to_tester_format(rule_str):
 
 
 
-CSV_COLUMNS = [
-    "timestamp", "client_id", "dataset",
-    "final_rule", "tp", "fn", "tn", "fp",
-    "accuracy", "precision", "recall", "f1",
-    "num_rules", "avg_rule_length"
-]
+RESULTS_LOG = "fedpopper_results.jsonl"  # may be shared by all clients
+results_log = None
 
 def save_client_result(client_id, dataset_name, rules, conf_matrix):
-    """Rewrite CSV by keeping only ONE entry per (client_id, dataset)."""
-
-    # === Compute statistics ===
-    num_rules = len(rules)
-
-    def rule_length(rule):
-        head, body = rule
-        return 1 + len(body)
-
-    avg_rule_length = (
-        sum(rule_length(r) for r in rules) / num_rules if num_rules > 0 else 0
-    )
-
-    tp, fn, tn, fp = conf_matrix
-    total = tp + fn + tn + fp
-    accuracy  = (tp + tn) / total if total > 0 else 0
-    precision = tp / (tp + fp)   if (tp + fp) > 0 else 0
-    recall    = tp / (tp + fn)   if (tp + fn) > 0 else 0
-    f1 = (2 * precision * recall)/(precision + recall) if (precision + recall) else 0
-
-    # Format rule string
-    def literal_to_str(lit):
-        return Literal.to_code(lit)
-
-    def rule_to_str(rule):
-        head, body = rule
-        head_str = literal_to_str(head)
-        body_str = ", ".join(literal_to_str(l) for l in body)
-        return f"{head_str} :- {body_str}."
-
-    rule_string = " | ".join(rule_to_str(r) for r in rules)
-
-    # ============================================================
-    #   STEP 1 : read existing CSV (if exists)
-    # ============================================================
-    rows = []
-    if os.path.exists(CSV_FILE):
-        with open(CSV_FILE, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # keep lines NOT belonging to the same (client_id, dataset)
-                if not (row["client_id"] == str(client_id) and
-                        row["dataset"] == dataset_name):
-                    rows.append(row)
-
-    # ============================================================
-    #   STEP 2 : append NEW final row for this (client,dataset)
-    # ============================================================
-    new_row = {
-        "timestamp": datetime.now().isoformat(timespec="seconds"),
-        "client_id": str(client_id),
-        "dataset": dataset_name,
-        "final_rule": rule_string,
-        "tp": tp, "fn": fn, "tn": tn, "fp": fp,
-        "accuracy": accuracy,
-        "precision": precision,
-        "recall": recall,
-        "f1": f1,
-        "num_rules": num_rules,
-        "avg_rule_length": avg_rule_length,
-    }
-
-    rows.append(new_row)
-
-    # ============================================================
-    #   STEP 3 : rewrite CSV from scratch (overwrite)
-    # ============================================================
-    with open(CSV_FILE, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
-        writer.writeheader()
-        writer.writerows(rows)
-
-    print(f"Updated (client={client_id}, dataset={dataset_name}) in {CSV_FILE}")
+    """Append the result to RESULTS_LOG without blocking; the CSV with one
+    entry per (client_id, dataset) is built by `results_log.py compact`."""
+    global results_log
+    if results_log is None:
+        results_log = ResultsLog(RESULTS_LOG)
+    results_log.append(result_row(client_id, dataset_name, rules, conf_matrix))
 
 
 class FlowerClient(fl.client.NumPyClient):
@@ -181,6 +109,8 @@ class FlowerClient(fl.client.NumPyClient):
         self.best_score = None  # <- track across rounds if you want
         self.local_records = [] 
         self.stats = stats
+        self.last_tested_key = None  # parameters of last_conf_matrix
+        self.last_conf_matrix = None
     def encode_outcome(self, outcome):
         norm = (outcome[0].upper(), outcome[1].upper())
         return (OUTCOME_ENCODING[norm[0]], OUTCOME_ENCODING[norm[1]])
@@ -201,6 +131,15 @@ class FlowerClient(fl.client.NumPyClient):
         return [np.array([], dtype=np.int64)]
     
 
+    def test_rules(self, parameters):
+        """Test current_rules; fit and evaluate of the same (byte-identical)
+        parameters share one confusion matrix."""
+        key = tuple((arr.dtype.str, arr.shape, arr.tobytes()) for arr in parameters)
+        if key != self.last_tested_key:
+            self.last_conf_matrix = self.tester.test(self.current_rules)
+            self.last_tested_key = key
+        return self.last_conf_matrix
+
     def set_parameters(self, parameters):
         """Receive rules from server and parse to Popper (Clause, Literal)."""
         log.debug(f"Raw received parameters: {parameters}")
@@ -236,13 +175,20 @@ class FlowerClient(fl.client.NumPyClient):
     
   
     def fit(self, parameters, config):
+        # one span for the whole handler: trace_merge.py splits the round with it
+        with tracer.span("fit", round=config.get("round", -1), hyp=config.get("hyp")):
+            return self._fit(parameters, config)
+
+    def _fit(self, parameters, config):
         round_id = config.get("round", -1)
 
         print("\n" + "="*60)
         print(f"CLIENT {CLIENT_ID} — ROUND {round_id}")
         print("="*60)
 
-        self.set_parameters(parameters)
+        span = {"round": round_id, "hyp": config.get("hyp")}
+        with tracer.span("parse", **span):
+            self.set_parameters(parameters)
 
         # --- Cas : aucune hypothèse ---
         if not self.current_rules:
@@ -260,7 +206,8 @@ class FlowerClient(fl.client.NumPyClient):
             print("   ", Clause.to_code(r))
 
         # --- Test local ---
-        tp, fn, tn, fp = self.tester.test(self.current_rules)
+        with tracer.span("test", **span):
+            tp, fn, tn, fp = self.test_rules(parameters)
 
         print("Local Result :")
         print(f"   TP={tp} | FN={fn} | TN={tn} | FP={fp}")
@@ -312,7 +259,7 @@ class FlowerClient(fl.client.NumPyClient):
             log.warning("No rules to evaluate! Skipping.")
             return 1.0, 0, {"accuracy": 0.0}
 
-        conf_matrix = self.tester.test(self.current_rules)
+        conf_matrix = self.test_rules(parameters)
         tp, fn, tn, fp = conf_matrix
 
         total = tp + fn + tn + fp
@@ -327,7 +274,11 @@ class FlowerClient(fl.client.NumPyClient):
 
 
 # Start the client
-fl.client.start_client(
-    server_address="localhost:8080",
-    client=FlowerClient(tester,stats).to_client(),  # Fixed Flower API usage
-)
\ No newline at end of file
+try:
+    fl.client.start_client(
+        server_address="localhost:8080",
+        client=FlowerClient(tester,stats).to_client(),  # Fixed Flower API usage
+    )
+finally:
+    # write out the spans still buffered
+    tracer.close()
\ No newline at end of file
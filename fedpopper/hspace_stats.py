@@ -0,0 +1,173 @@
+"""
+Size the hypothesis space of a bias file before a (federated) run.
+
+    python fedpopper/hspace_stats.py examples/trains2 --max-size 6 --report hspace.json
+    python fedpopper/hspace_stats.py examples/trains2 --max-vars 4 --max-body 3 --time-limit 10
+    python fedpopper/hspace_stats.py examples/trains2 --sample 200 --programs 5
+
+For every program size (number of literals, as in the generate loop) the
+space of alan.pl + bias is grounded and solved on its own clingo control:
+    - grounding: time, symbolic atoms, and the rules/atoms/variables/
+      constraints of the ground program
+    - count: models enumerated up to --models or --time-limit seconds
+      (projected on the shown atoms with --project); exact if exhausted,
+      a lower bound otherwise
+    - time per model: enumeration time / models, or, with --sample K, the
+      mean time of K solves for one model each under random decisions
+      (closer to the generate step, which asks for one model at a time)
+
+--max-vars/--max-body/--max-clauses override the values in the bias file,
+so the report can be compared across settings before picking them.
+"""
+
+import argparse
+import json
+import re
+import time
+
+import clingo
+import pkg_resources
+
+from popper.asp import NUM_OF_LITERALS
+from popper.generate import generate_program
+from popper.util import format_program, load_kbpath
+
+BIAS_SETTINGS = ("max_vars", "max_body", "max_clauses")
+
+
+def bias_text(bias_file, overrides):
+    with open(bias_file) as f:
+        text = f.read()
+    for name, value in overrides.items():
+        if value is None:
+            continue
+        fact = f"{name}({value})."
+        text, n = re.subn(rf"^\s*{name}\(\d+\)\.", fact, text, flags=re.MULTILINE)
+        if not n:
+            text += f"\n{fact}\n"
+    return text
+
+
+def control(bias, size, args):
+    ctl = clingo.Control(["--project=show"] if args.project else [])
+    ctl.add("alan", [], pkg_resources.resource_string("popper", "lp/alan.pl").decode())
+    ctl.add("bias", [], bias)
+    ctl.add("number_of_literals", ["n"], NUM_OF_LITERALS)
+    t0 = time.perf_counter()
+    ctl.ground([("alan", []), ("bias", []), ("number_of_literals", [clingo.Number(size)])])
+    ground_time = time.perf_counter() - t0
+    ctl.assign_external(clingo.Function("size_in_literals", [clingo.Number(size)]), True)
+    return ctl, ground_time
+
+
+def setting(ctl, name):
+    atoms = list(ctl.symbolic_atoms.by_signature(name, 1))
+    return atoms[0].symbol.arguments[0].number if atoms else None
+
+
+def count_models(ctl, max_models, time_limit):
+    """(models, exhausted, seconds) of an enumeration capped by models and time."""
+    ctl.configuration.solve.models = max_models
+    models = 0
+
+    def on_model(m):
+        nonlocal models
+        models += 1
+
+    t0 = time.perf_counter()
+    with ctl.solve(on_model=on_model, async_=True) as handle:
+        if not handle.wait(time_limit):
+            handle.cancel()
+        result = handle.get()
+    return models, result.exhausted, time.perf_counter() - t0
+
+
+def sample_models(ctl, samples, seed, num_programs):
+    """Mean time of a one-model solve under random decisions, distinct programs, some programs."""
+    ctl.configuration.solve.models = 1
+    ctl.configuration.solver.rand_freq = "1"
+    seen, programs, total, solves = set(), [], 0.0, 0
+    for i in range(samples):
+        ctl.configuration.solver.seed = str(seed + i)
+        t0 = time.perf_counter()
+        with ctl.solve(yield_=True) as handle:
+            model = handle.model()
+            symbols = model.symbols(shown=True) if model else None
+        total += time.perf_counter() - t0
+        solves += 1
+        if symbols is None:
+            break
+        key = frozenset(str(s) for s in symbols)
+        if key not in seen:
+            seen.add(key)
+            if len(programs) < num_programs:
+                programs.append(format_program(generate_program(symbols)[0]))
+    return total / solves if solves else 0.0, len(seen), programs
+
+
+def size_stats(bias, size, args):
+    ctl, ground_time = control(bias, size, args)
+    stats = {"size": size, "ground_time": ground_time, "symbolic_atoms": len(ctl.symbolic_atoms)}
+    models, exhausted, solve_time = count_models(ctl, args.models, args.time_limit)
+    problem = ctl.statistics["problem"]
+    stats.update({
+        "rules": int(problem["lp"]["rules"]),
+        "atoms": int(problem["lp"]["atoms"]),
+        "vars": int(problem["generator"]["vars"]),
+        "constraints": int(problem["generator"]["constraints"]),
+        "models": models,
+        "exact": bool(exhausted),
+        "solve_time": solve_time,
+        "time_per_model": solve_time / models if models else None,
+    })
+    if args.sample:
+        ctl, _ = control(bias, size, args)
+        mean, distinct, programs = sample_models(ctl, args.sample, args.seed, args.programs)
+        stats.update({"sample_time_per_model": mean, "sample_distinct": distinct, "sample_programs": programs})
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hypothesis space statistics per program size")
+    parser.add_argument("kbpath", help="Task directory with bias.pl, e.g. examples/trains2")
+    parser.add_argument("--bias-file", type=str, default="", help="Bias file (default: <kbpath>/bias.pl)")
+    parser.add_argument("--min-size", type=int, default=1)
+    parser.add_argument("--max-size", type=int, default=0, help="Largest program size (default: max_clauses * (max_body + 1))")
+    parser.add_argument("--max-vars", type=int, default=None)
+    parser.add_argument("--max-body", type=int, default=None)
+    parser.add_argument("--max-clauses", type=int, default=None)
+    parser.add_argument("--models", type=int, default=100000, help="Stop counting a size after this many models (0: no cap)")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="Stop counting a size after this many seconds")
+    parser.add_argument("--project", default=False, action="store_true", help="Count models projected on the shown atoms (distinct programs)")
+    parser.add_argument("--sample", type=int, default=0, help="Also time K one-model solves under random decisions per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--programs", type=int, default=0, help="Sampled programs to keep per size in the report")
+    parser.add_argument("--report", type=str, default="", help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    bias_file = args.bias_file or load_kbpath(args.kbpath)[2]
+    bias = bias_text(bias_file, {"max_vars": args.max_vars, "max_body": args.max_body, "max_clauses": args.max_clauses})
+
+    ctl, _ = control(bias, args.min_size, args)
+    report = {"bias_file": bias_file, **{name: setting(ctl, name) for name in BIAS_SETTINGS}, "sizes": []}
+    max_size = args.max_size or report["max_clauses"] * (report["max_body"] + 1)
+
+    print(f"{bias_file}: " + ", ".join(f"{name}={report[name]}" for name in BIAS_SETTINGS))
+    print(f"{'size':>4}{'ground s':>10}{'atoms':>9}{'rules':>9}{'models':>11}{'solve s':>9}{'ms/model':>10}"
+          + (f"{'sample ms':>11}" if args.sample else ""))
+    for size in range(args.min_size, max_size + 1):
+        stats = size_stats(bias, size, args)
+        report["sizes"].append(stats)
+        models = f"{stats['models']}{'' if stats['exact'] else '+'}"
+        per_model = f"{stats['time_per_model'] * 1e3:10.3f}" if stats["models"] else f"{'-':>10}"
+        print(f"{size:>4}{stats['ground_time']:>10.3f}{stats['atoms']:>9}{stats['rules']:>9}{models:>11}"
+              f"{stats['solve_time']:>9.2f}{per_model}"
+              + (f"{stats['sample_time_per_model'] * 1e3:>11.3f}" if args.sample else ""))
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Streaming partitioner of an ILP task into federated client shards.
+
+    python fedpopper/partition.py examples/trains2 3 --out fedpopper/trains2
+    python fedpopper/partition.py examples/iggp-rps 4 --split dirichlet --alpha 0.3
+    python fedpopper/partition.py examples/carcinogenesis 5 --split exponential --bk prune
+
+Writes <out>_part1 ... <out>_partN (the layout of trains2_part1, ...), each
+with its own exs.pl and a bk.pl/bias.pl that is symlinked, copied or pruned.
+
+exs.pl is read line by line (one pos/neg example per line, as in all the
+examples shipped with the repo) and each example is written to its shard as
+soon as it is read, so the file is never loaded in memory.
+
+The splits follow flwr_datasets.partitioner, but work on a stream: every
+label (pos/neg) gets a weight per client and examples are dealt with a
+smooth weighted round-robin, so each shard receives exactly its share of
+each label.
+    - iid:          equal weights for pos and neg
+    - dirichlet:    label skew, per-label weights ~ Dirichlet(alpha)
+                    (small alpha = very different pos/neg ratios)
+    - linear/square/exponential: size skew, weight of client i ~ f(i)
+"""
+
+import argparse
+import os
+from abc import ABC, abstractmethod
+import re
+import shutil
+
+import numpy as np
+
+from popper.util import load_kbpath
+
+LABELS = ("pos", "neg")
+
+
+# ------------------------------------------------------
+#   PARTITIONERS
+# ------------------------------------------------------
+
+class Partitioner(ABC):
+    """Deal a stream of (label, example) pairs to num_partitions shards."""
+
+    def __init__(self, num_partitions):
+        if num_partitions <= 0:
+            raise ValueError("The number of partitions must be greater than zero.")
+        self.num_partitions = num_partitions
+        self._weights = {}
+        self._current = {}
+
+    @abstractmethod
+    def label_weights(self, label):
+        """Weight of every partition for this label (any scale, normalised by assign)."""
+
+    def assign(self, label):
+        """Smooth weighted round-robin over the partitions for this label."""
+        if label not in self._weights:
+            w = np.asarray(self.label_weights(label), dtype=float)
+            if not np.all(np.isfinite(w)) or np.any(w < 0) or w.sum() <= 0:
+                raise ValueError(f"Invalid weights for label {label}: {w}")
+            self._weights[label] = w / w.sum()
+            self._current[label] = np.zeros(self.num_partitions)
+        current = self._current[label]
+        current += self._weights[label]
+        partition_id = int(np.argmax(current))
+        current[partition_id] -= 1.0
+        return partition_id
+
+
+class IidPartitioner(Partitioner):
+    def label_weights(self, label):
+        return np.ones(self.num_partitions)
+
+
+class DirichletPartitioner(Partitioner):
+    """Label skew: the share of each label per client is drawn from Dirichlet(alpha)."""
+
+    def __init__(self, num_partitions, alpha, seed=42):
+        super().__init__(num_partitions)
+        if alpha <= 0:
+            raise ValueError("alpha must be greater than zero.")
+        self.alpha = alpha
+        self._rng = np.random.default_rng(seed)
+
+    def label_weights(self, label):
+        return self._rng.dirichlet([self.alpha] * self.num_partitions)
+
+
+class SizePartitioner(Partitioner):
+    """Size skew: client i receives a share of every label proportional to fn(i+1)."""
+
+    def __init__(self, num_partitions, partition_id_to_size_fn):
+        super().__init__(num_partitions)
+        self.partition_id_to_size_fn = partition_id_to_size_fn
+
+    def label_weights(self, label):
+        return [self.partition_id_to_size_fn(i + 1) for i in range(self.num_partitions)]
+
+
+class ExponentialPartitioner(SizePartitioner):
+    """Size skew: client i receives a share of every label proportional to exp(i+1)."""
+
+    def __init__(self, num_partitions):
+        super().__init__(num_partitions, np.exp)
+
+    def label_weights(self, label):
+        # normalised in log space: exp(i - N) does not overflow for large N
+        return np.exp(np.arange(1, self.num_partitions + 1) - self.num_partitions)
+
+
+def make_partitioner(split, num_partitions, alpha=0.5, seed=42):
+    if split == "iid":
+        return IidPartitioner(num_partitions)
+    if split == "dirichlet":
+        return DirichletPartitioner(num_partitions, alpha, seed)
+    if split == "linear":
+        return SizePartitioner(num_partitions, lambda i: i)
+    if split == "square":
+        return SizePartitioner(num_partitions, lambda i: i * i)
+    if split == "exponential":
+        return ExponentialPartitioner(num_partitions)
+    raise ValueError(f"Unknown split: {split}")
+
+
+# ------------------------------------------------------
+#   EXAMPLES
+# ------------------------------------------------------
+
+def example_label(line):
+    for label in LABELS:
+        if line.startswith(label + "("):
+            return label
+    return None
+
+def partition_examples(ex_file, shard_paths, partitioner):
+    """Stream ex_file into shard_paths[i]/exs.pl. Returns the counts per shard."""
+    counts = [{label: 0 for label in LABELS} for _ in shard_paths]
+    files = [open(os.path.join(path, "exs.pl"), "w") for path in shard_paths]
+    try:
+        with open(ex_file) as f:
+            for line in f:
+                line = line.strip()
+                label = example_label(line)
+                if label is None:
+                    continue
+                i = partitioner.assign(label)
+                files[i].write(line + "\n")
+                counts[i][label] += 1
+    finally:
+        for f in files:
+            f.close()
+    return counts
+
+
+# ------------------------------------------------------
+#   BACKGROUND KNOWLEDGE
+# ------------------------------------------------------
+
+TOKEN = re.compile(r"'(?:[^'\\]|\\.)*'|-?\d+(?:\.\d+)?|[a-z][A-Za-z0-9_]*")
+FACT = re.compile(r"^[a-z][A-Za-z0-9_]*\(.*\)\.$")
+
+def constants(term):
+    """Constants of a ground term (functor names are skipped)."""
+    out = set()
+    for m in TOKEN.finditer(term):
+        if not term[m.end():].lstrip().startswith("("):
+            out.add(m.group())
+    return out
+
+def fact_constants(line):
+    """Constants of a one-line ground fact, or None for anything else (rules, directives...)."""
+    if not FACT.match(line) or ":-" in line:
+        return None
+    return constants(line[line.index("(") + 1:-2]) or None
+
+def bk_lines(bk_file):
+    """Yield (line, constants-or-None); multi-line clauses are never treated as facts."""
+    in_clause = False
+    with open(bk_file) as f:
+        for line in f:
+            stripped = line.strip()
+            facts = None if in_clause else fact_constants(stripped)
+            if stripped and not stripped.startswith("%"):
+                in_clause = not stripped.endswith(".")
+            yield line, facts
+
+def prune_bk(bk_file, shard_paths, depth):
+    """
+    Keep, for every shard, the BK facts that mention a constant reachable from
+    its examples in at most `depth` hops; rules and directives are always kept.
+    This is an approximation: BK tables that the hypothesis needs but that do
+    not share constants with the examples are dropped.
+    """
+    reached = []
+    for path in shard_paths:
+        with open(os.path.join(path, "exs.pl")) as f:
+            reached.append(set().union(*(constants(line.strip()[4:-2]) for line in f)))
+
+    for _ in range(depth - 1):
+        frontier = [set() for _ in shard_paths]
+        for _line, facts in bk_lines(bk_file):
+            if not facts:
+                continue
+            for i, seen in enumerate(reached):
+                if not facts.isdisjoint(seen):
+                    frontier[i].update(facts)
+        if all(frontier[i] <= reached[i] for i in range(len(shard_paths))):
+            break
+        for i in range(len(shard_paths)):
+            reached[i] |= frontier[i]
+
+    kept = [0] * len(shard_paths)
+    files = []
+    for path in shard_paths:
+        dst = os.path.join(path, os.path.basename(bk_file))
+        if os.path.lexists(dst):
+            # never write through a symlink left by a previous run
+            os.remove(dst)
+        files.append(open(dst, "w"))
+    try:
+        for line, facts in bk_lines(bk_file):
+            for i, f in enumerate(files):
+                if facts is None or not facts.isdisjoint(reached[i]):
+                    f.write(line)
+                    kept[i] += facts is not None
+    finally:
+        for f in files:
+            f.close()
+    return kept
+
+def share_file(src, path, mode):
+    dst = os.path.join(path, os.path.basename(src))
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if mode == "symlink":
+        os.symlink(os.path.abspath(src), dst)
+    else:
+        shutil.copyfile(src, dst)
+
+
+# ------------------------------------------------------
+#   ENTRY POINT
+# ------------------------------------------------------
+
+def partition_task(kbpath, num_clients, out, split="iid", alpha=0.5, seed=42, bk="symlink", prune_depth=2):
+    bk_file, ex_file, bias_file = load_kbpath(kbpath)
+    shard_paths = [f"{out}_part{i + 1}" for i in range(num_clients)]
+    for path in shard_paths:
+        os.makedirs(path, exist_ok=True)
+
+    counts = partition_examples(ex_file, shard_paths, make_partitioner(split, num_clients, alpha, seed))
+    empty = [path for path, c in zip(shard_paths, counts) if not c["pos"] + c["neg"]]
+    if empty:
+        raise ValueError(f"No examples for {', '.join(empty)}: use fewer clients or another split.")
+
+    for path in shard_paths:
+        share_file(bias_file, path, "copy" if bk == "copy" else "symlink")
+    if bk == "prune":
+        kept = prune_bk(bk_file, shard_paths, prune_depth)
+    else:
+        for path in shard_paths:
+            share_file(bk_file, path, bk)
+        kept = [None] * num_clients
+
+    return [
+        {"path": path, "pos": c["pos"], "neg": c["neg"], "bk_facts": k}
+        for path, c, k in zip(shard_paths, counts, kept)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split an ILP task into federated client shards")
+    parser.add_argument("kbpath", help="Task directory (bk.pl, exs.pl, bias.pl)")
+    parser.add_argument("num_clients", type=int, help="Number of client shards")
+    parser.add_argument("--out", type=str, default="", help="Shard prefix, shards are <out>_part<i> (default: kbpath)")
+    parser.add_argument("--split", default="iid", choices=["iid", "dirichlet", "linear", "square", "exponential"], help="How examples are spread over clients")
+    parser.add_argument("--alpha", type=float, default=0.5, help="Dirichlet concentration for --split dirichlet")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for --split dirichlet")
+    parser.add_argument("--bk", default="symlink", choices=["symlink", "copy", "prune"], help="How bk.pl is given to the clients")
+    parser.add_argument("--prune-depth", type=int, default=2, help="Hops from the example constants kept by --bk prune")
+    args = parser.parse_args()
+
+    out = args.out or os.path.normpath(args.kbpath)
+    for shard in partition_task(args.kbpath, args.num_clients, out, args.split, args.alpha, args.seed, args.bk, args.prune_depth):
+        bk_facts = "" if shard["bk_facts"] is None else f" bk_facts={shard['bk_facts']}"
+        print(f"{shard['path']}: pos={shard['pos']} neg={shard['neg']}{bk_facts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Tests for the streaming partitioners."""
+
+import numpy as np
+import pytest
+
+from partition import LABELS, ExponentialPartitioner, Partitioner, make_partitioner, partition_task
+
+
+def deal(partitioner, num_examples):
+    counts = np.zeros(partitioner.num_partitions, dtype=int)
+    for _ in range(num_examples):
+        counts[partitioner.assign("pos")] += 1
+    return counts
+
+
+def test_partitioner_is_abstract():
+    with pytest.raises(TypeError):
+        Partitioner(2)
+
+
+@pytest.mark.parametrize("split, expected", [
+    ("iid", [4, 4, 4]),
+    ("linear", [2, 4, 6]),
+    ("square", [1, 3, 8]),
+])
+def test_shares(split, expected):
+    assert deal(make_partitioner(split, 3), 12).tolist() == expected
+
+
+def test_exponential_does_not_overflow():
+    partitioner = ExponentialPartitioner(1000)
+    counts = deal(partitioner, 100)
+    assert counts.sum() == 100
+    # the last client has the largest share, 1 - 1/e
+    assert counts[-1] == max(counts) == 63
+
+
+def test_empty_shard_is_an_error(tmp_path):
+    kbpath = tmp_path / "task"
+    kbpath.mkdir()
+    (kbpath / "exs.pl").write_text("".join(f"{label}(f({i})).\n" for label in LABELS for i in range(2)))
+    (kbpath / "bk.pl").write_text("p(1).\n")
+    (kbpath / "bias.pl").write_text("head_pred(f,1).\n")
+
+    shards = partition_task(str(kbpath), 2, str(tmp_path / "ok"))
+    assert [(shard["pos"], shard["neg"]) for shard in shards] == [(1, 1), (1, 1)]
+    with pytest.raises(ValueError, match="No examples"):
+        partition_task(str(kbpath), 5, str(tmp_path / "empty"))
@@ -0,0 +1,340 @@
+"""
+Long-lived Popper daemon: warm worker processes behind a Unix domain socket.
+
+    python fedpopper/popper_daemon.py serve --socket /tmp/popper.sock --workers 4
+    python fedpopper/popper_daemon.py learn examples/trains2 --socket /tmp/popper.sock --timeout 60
+    python fedpopper/popper_daemon.py learn examples/trains2 --set max_literals=8 --set eval_mode=inferences
+    python fedpopper/popper_daemon.py status --socket /tmp/popper.sock
+    python fedpopper/popper_daemon.py shutdown --socket /tmp/popper.sock
+
+Each worker imports clingo/pyswip/popper once and keeps its Tester (Prolog
+engine with test.pl, see Tester.switch) across jobs, so a job only pays for
+its examples, its BK if it differs from the previous one, and grounding its
+bias. Workers take jobs from one shared queue, so up to --workers jobs run
+concurrently. A worker that dies fails its running job and is replaced.
+Job settings are checked before they reach a worker.
+
+Protocol: one JSON object per line in both directions.
+    {"op": "learn", "kbpath": ..., "timeout": 60, "settings": {...}}
+        -> {"event": "queued", "job": id, "queued": jobs waiting}
+           {"event": "started", "job": id, "worker": pid, "queue_latency": s}
+           {"event": "best", "job": id, "program": code, "conf_matrix": [...],
+            "programs": n, "elapsed": s}                   (every new best)
+           {"event": "done", "job": id, "status": ok/timeout/error,
+            "solution": bool, "program": code, "conf_matrix": [...],
+            "programs": n, "queue_latency": s, "exec_time": s}
+    {"op": "status"}   -> {"event": "status", "workers", "queued", "running",
+                           "done", "queue_latency": {...}, "exec_time": {...}}
+    {"op": "shutdown"} -> {"event": "shutdown"}
+Latencies in status are p50/p95/max over the jobs done since start.
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+# Settings fields a job may set (besides the task files and timeout)
+JOB_SETTINGS = ("eval_timeout", "eval_mode", "eval_inferences", "max_literals", "functional_test", "clingo_args")
+
+
+def job_settings(settings):
+    """Check the settings of a job, return them as Settings takes them; ValueError if invalid."""
+    from popper.util import EVAL_MODES
+
+    unknown = set(settings) - set(JOB_SETTINGS)
+    if unknown:
+        raise ValueError(f"unknown settings {sorted(unknown)}, expected {JOB_SETTINGS}")
+    checked = {}
+    for name, value in settings.items():
+        if name == "eval_mode":
+            if value not in EVAL_MODES:
+                raise ValueError(f"eval_mode must be one of {EVAL_MODES}, got {value!r}")
+        elif name == "eval_timeout":
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"eval_timeout must be a positive number, got {value!r}")
+        elif name in ("eval_inferences", "max_literals"):
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                raise ValueError(f"{name} must be a positive integer, got {value!r}")
+        elif name == "functional_test":
+            if not isinstance(value, bool):
+                raise ValueError(f"functional_test must be true or false, got {value!r}")
+        elif name == "clingo_args":
+            # clingo.Control takes a list, a string would be split into characters
+            if isinstance(value, str):
+                value = value.split()
+            if not isinstance(value, list) or not all(isinstance(arg, str) for arg in value):
+                raise ValueError(f"clingo_args must be a string or a list of strings, got {value!r}")
+        checked[name] = value
+    return checked
+
+
+def worker_main(jobs, events):
+    """Worker process: run jobs from the queue, report events."""
+    import logging
+    from popper.loop import calc_score, learn_solution
+    from popper.tester import Tester
+    from popper.util import Settings, Stats, load_kbpath
+
+    logging.getLogger("popper").setLevel(logging.WARNING)
+
+    class StreamingStats(Stats):
+        """Stats that send every new best program (or solution) as an event."""
+        def __init__(self, job):
+            super().__init__()
+            self.job = job
+
+        def send_best(self, prog_stats):
+            events.put({"event": "best", "job": self.job, "program": prog_stats.code,
+                        "conf_matrix": list(prog_stats.conf_matrix), "programs": self.total_programs,
+                        "elapsed": self.total_exec_time()})
+
+        def register_best_program(self, program, conf_matrix):
+            super().register_best_program(program, conf_matrix)
+            self.send_best(self.best_programs[-1])
+
+        def register_solution(self, program, conf_matrix):
+            super().register_solution(program, conf_matrix)
+            self.send_best(self.solution)
+
+    tester = None
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        started = time.time()
+        events.put({"event": "started", "job": job["job"], "worker": os.getpid(),
+                    "queue_latency": started - job["submitted"]})
+        done = {"event": "done", "job": job["job"], "queue_latency": started - job["submitted"]}
+        try:
+            bk_file, ex_file, bias_file = load_kbpath(job["kbpath"])
+            settings = Settings(bias_file, ex_file, bk_file, timeout=job["timeout"], **job["settings"])
+            if tester is None:
+                tester = Tester(settings)
+            else:
+                tester.switch(settings)
+            stats = StreamingStats(job["job"])
+            _, stats = learn_solution(settings, tester=tester, stats=stats)
+            best = stats.best_program
+            done.update({
+                "status": "timeout" if time.time() - started >= job["timeout"] else "ok",
+                "solution": stats.solution is not None,
+                "program": best.code if best else None,
+                "conf_matrix": list(best.conf_matrix) if best else None,
+                "score": calc_score(best.conf_matrix) if best else None,
+                "programs": stats.total_programs,
+            })
+        except Exception as e:
+            tester = None
+            done.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+        done["exec_time"] = time.time() - started
+        events.put(done)
+
+
+class Daemon:
+    def __init__(self, num_workers):
+        from popper.util import DurationHistogram
+        self.ctx = multiprocessing.get_context("spawn")
+        self.jobs = self.ctx.Queue()
+        self.events = self.ctx.Queue()
+        self.workers = [self.start_worker() for _ in range(num_workers)]
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.closing = False
+        self.subscribers = {}  # job -> queue.Queue of its events
+        self.queued, self.done = set(), 0
+        self.running = {}  # job -> its "started" event
+        self.queue_latency, self.exec_time = DurationHistogram(), DurationHistogram()
+        self.router = threading.Thread(target=self.route, daemon=True, name="EventRouter")
+        self.router.start()
+
+    def submit(self, kbpath, timeout, settings):
+        job = next(self.ids)
+        events = queue.Queue()
+        with self.lock:
+            self.subscribers[job] = events
+            self.queued.add(job)
+            waiting = len(self.queued)
+        self.jobs.put({"job": job, "kbpath": kbpath, "timeout": timeout, "settings": settings, "submitted": time.time()})
+        return job, waiting, events
+
+    def start_worker(self):
+        worker = self.ctx.Process(target=worker_main, args=(self.jobs, self.events), daemon=True)
+        worker.start()
+        return worker
+
+    def check_workers(self):
+        """Fail the running jobs of dead workers and start new workers in their place."""
+        with self.lock:
+            if self.closing:
+                return
+            for i, worker in enumerate(self.workers):
+                if worker.is_alive():
+                    continue
+                now = time.time()
+                for job, started in self.running.items():
+                    if started["worker"] == worker.pid:
+                        self.events.put({"event": "done", "job": job, "status": "error",
+                                         "error": f"worker {worker.pid} died (exit code {worker.exitcode})",
+                                         "queue_latency": started["queue_latency"], "exec_time": now - started["time"]})
+                self.workers[i] = self.start_worker()
+
+    def route(self):
+        while True:
+            try:
+                event = self.events.get(timeout=1)
+            except queue.Empty:
+                self.check_workers()
+                continue
+            if event is None:
+                return
+            job = event["job"]
+            with self.lock:
+                if event["event"] == "started":
+                    self.queued.discard(job)
+                    self.running[job] = dict(event, time=time.time())
+                elif event["event"] == "done":
+                    if self.running.pop(job, None) is None:
+                        # already failed by check_workers
+                        continue
+                    self.done += 1
+                    self.queue_latency.add(event["queue_latency"])
+                    self.exec_time.add(event["exec_time"])
+                subscriber = self.subscribers.get(job)
+                if event["event"] == "done":
+                    self.subscribers.pop(job, None)
+            if subscriber is not None:
+                subscriber.put(event)
+
+    def status(self):
+        def summary(h):
+            return {"jobs": h.count, "p50": h.percentile(0.5), "p95": h.percentile(0.95), "max": h.maximum}
+        self.check_workers()
+        with self.lock:
+            return {"event": "status", "workers": len(self.workers), "queued": len(self.queued),
+                    "running": len(self.running), "done": self.done,
+                    "queue_latency": summary(self.queue_latency), "exec_time": summary(self.exec_time)}
+
+    def shutdown(self):
+        with self.lock:
+            self.closing = True
+        for _ in self.workers:
+            self.jobs.put(None)
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.kill()
+        self.events.put(None)
+        self.router.join()
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self):
+        daemon = self.server.daemon
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "learn":
+                    settings = job_settings(request.get("settings", {}))
+                    job, waiting, events = daemon.submit(request["kbpath"], int(request.get("timeout", 600)), settings)
+                    self.send({"event": "queued", "job": job, "queued": waiting})
+                    while True:
+                        event = events.get()
+                        self.send(event)
+                        if event["event"] == "done":
+                            break
+                elif op == "status":
+                    self.send(daemon.status())
+                elif op == "shutdown":
+                    self.send({"event": "shutdown"})
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                else:
+                    raise ValueError(f"unknown op {op!r}")
+            except (ValueError, KeyError) as e:
+                self.send({"event": "error", "error": str(e)})
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(path, num_workers):
+    if os.path.exists(path):
+        os.unlink(path)
+    daemon = Daemon(num_workers)
+    with Server(path, Handler) as server:
+        server.daemon = daemon
+        print(f"popper daemon on {path} with {num_workers} workers", flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            daemon.shutdown()
+            os.unlink(path)
+
+
+def request(path, message):
+    """Send one request, yield the events of the reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                yield event
+                if event["event"] in ("done", "status", "shutdown", "error"):
+                    return
+
+
+def parse_value(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Popper learning daemon")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("serve", help="Run the daemon")
+    p.add_argument("--socket", type=str, default="/tmp/popper.sock")
+    p.add_argument("--workers", type=int, default=os.cpu_count())
+    p = sub.add_parser("learn", help="Submit a task and stream its progress")
+    p.add_argument("kbpath", help="Task directory (bias.pl, bk.pl, exs.pl)")
+    p.add_argument("--socket", type=str, default="/tmp/popper.sock")
+    p.add_argument("--timeout", type=int, default=600)
+    p.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help=f"Setting of the job, one of {JOB_SETTINGS}")
+    for command in ("status", "shutdown"):
+        p = sub.add_parser(command)
+        p.add_argument("--socket", type=str, default="/tmp/popper.sock")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.workers)
+        return
+    if args.command == "learn":
+        settings = dict(item.split("=", 1) for item in args.set)
+        message = {"op": "learn", "kbpath": os.path.abspath(args.kbpath), "timeout": args.timeout,
+                   "settings": {name: parse_value(value) for name, value in settings.items()}}
+    else:
+        message = {"op": args.command}
+    for event in request(args.socket, message):
+        print(json.dumps(event), flush=True)
+        if event["event"] == "error" or event.get("status") == "error":
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
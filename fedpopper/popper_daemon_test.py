@@ -0,0 +1,49 @@
+"""Tests for the job settings and worker supervision of the Popper daemon."""
+
+import queue
+
+import pytest
+
+from popper_daemon import Daemon, job_settings
+
+
+def test_job_settings_converts_clingo_args():
+    assert job_settings({"clingo_args": "--configuration=jumpy --seed=1"}) == {"clingo_args": ["--configuration=jumpy", "--seed=1"]}
+    assert job_settings({"eval_mode": "inferences", "eval_timeout": 0.01, "max_literals": 8}) == {
+        "eval_mode": "inferences", "eval_timeout": 0.01, "max_literals": 8}
+
+
+@pytest.mark.parametrize("settings", [
+    {"unknown": 1},
+    {"eval_mode": "time).\nhalt"},
+    {"eval_timeout": "1)"},
+    {"eval_timeout": -1},
+    {"eval_inferences": 1.5},
+    {"max_literals": True},
+    {"functional_test": "yes"},
+    {"clingo_args": [1, 2]},
+])
+def test_job_settings_rejects_invalid_values(settings):
+    with pytest.raises(ValueError):
+        job_settings(settings)
+
+
+def test_dead_worker_fails_its_job_and_is_replaced():
+    daemon = Daemon(1)
+    try:
+        worker = daemon.workers[0]
+        events = queue.Queue()
+        with daemon.lock:
+            daemon.subscribers[1] = events
+        daemon.events.put({"event": "started", "job": 1, "worker": worker.pid, "queue_latency": 0.0})
+        worker.kill()
+
+        assert events.get(timeout=30)["event"] == "started"
+        done = events.get(timeout=30)
+        assert (done["event"], done["status"]) == ("done", "error")
+        assert "died" in done["error"]
+        status = daemon.status()
+        assert (status["running"], status["done"]) == (0, 1)
+        assert daemon.workers[0].pid != worker.pid
+    finally:
+        daemon.shutdown()
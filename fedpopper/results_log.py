@@ -0,0 +1,183 @@
+"""
+Append-only log of the client results, with compaction to the CSV layout.
+
+    python fedpopper/results_log.py compact fedpopper_results.jsonl fedpopper_results_global.csv
+
+save_client_result used to read the whole CSV, drop the row of the same
+(client_id, dataset) and rewrite the file on every call: O(rows) per call
+and lost rows when two clients shared a file. Now a client only appends one
+JSON line per result:
+    - ResultsLog.append() queues the row and returns; a background thread
+      writes the queued rows in one batch every `flush_interval` seconds
+      (or `batch_size` rows), so logging never waits on the disk in fit.
+    - every batch is a single write() on a file opened with O_APPEND (and
+      under flock where available), so several clients can share one log.
+    - compact() keeps the latest row per (client_id, dataset) and writes the
+      CSV with CSV_COLUMNS, i.e. what the rewritten CSV used to contain.
+"""
+
+import argparse
+import atexit
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on O_APPEND only
+    fcntl = None
+
+from popper.core import Literal
+
+CSV_COLUMNS = [
+    "timestamp", "client_id", "dataset",
+    "final_rule", "tp", "fn", "tn", "fp",
+    "accuracy", "precision", "recall", "f1",
+    "num_rules", "avg_rule_length"
+]
+
+
+def result_row(client_id, dataset_name, rules, conf_matrix):
+    """The CSV row of a client result (statistics of rules and conf_matrix)."""
+    num_rules = len(rules)
+    avg_rule_length = (
+        sum(1 + len(body) for _, body in rules) / num_rules if num_rules > 0 else 0
+    )
+
+    tp, fn, tn, fp = conf_matrix
+    total = tp + fn + tn + fp
+    accuracy  = (tp + tn) / total if total > 0 else 0
+    precision = tp / (tp + fp)   if (tp + fp) > 0 else 0
+    recall    = tp / (tp + fn)   if (tp + fn) > 0 else 0
+    f1 = (2 * precision * recall)/(precision + recall) if (precision + recall) else 0
+
+    def rule_to_str(rule):
+        head, body = rule
+        return f"{Literal.to_code(head)} :- {', '.join(Literal.to_code(l) for l in body)}."
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "client_id": str(client_id),
+        "dataset": dataset_name,
+        "final_rule": " | ".join(rule_to_str(r) for r in rules),
+        "tp": tp, "fn": fn, "tn": tn, "fp": fp,
+        "accuracy": accuracy,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "num_rules": num_rules,
+        "avg_rule_length": avg_rule_length,
+    }
+
+
+class ResultsLog:
+    """Append-only JSONL log of result rows, flushed by a background thread."""
+
+    def __init__(self, path, flush_interval=1.0, batch_size=64):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = []
+        self._cond = threading.Condition()
+        # held across taking the pending rows and writing them, so batches
+        # of flush() and of the background thread land in order
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True, name="ResultsLog")
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, row):
+        """Queue one row; it is written by the background thread."""
+        with self._cond:
+            if self._closed:
+                raise ValueError(f"ResultsLog {self.path} is closed")
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self):
+        """Write the queued rows now."""
+        with self._write_lock:
+            with self._cond:
+                rows, self._pending = self._pending, []
+            self._write(rows)
+
+    def _write(self, rows):
+        if not rows:
+            return
+        data = "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            os.write(self._fd, data)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                if not self._closed and len(self._pending) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+            with self._write_lock:
+                with self._cond:
+                    rows, self._pending = self._pending, []
+                    closed = self._closed
+                self._write(rows)
+            if closed:
+                return
+
+    def close(self):
+        """Write the remaining rows and close the log."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        os.close(self._fd)
+
+
+def read_rows(path):
+    """Rows of a results log, skipping a truncated last line."""
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def compact(log_path, csv_path):
+    """Write the latest row per (client_id, dataset) of log_path to csv_path."""
+    latest = {}
+    for row in read_rows(log_path):
+        latest[(row["client_id"], row["dataset"])] = row
+    tmp_path = csv_path + ".tmp"
+    with open(tmp_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(latest.values())
+    os.replace(tmp_path, csv_path)
+    return len(latest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FedPopper results log")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("compact", help="Latest row per (client_id, dataset) as CSV")
+    p.add_argument("log", help="Results log (JSONL)")
+    p.add_argument("csv", help="CSV file to write")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        n = compact(args.log, args.csv)
+        print(f"{n} rows written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Tests for the append-only results log."""
+
+import csv
+import multiprocessing
+import os
+import threading
+import time
+
+from results_log import CSV_COLUMNS, ResultsLog, compact, read_rows
+
+
+def append_rows(path, client_id, num_rows):
+    log = ResultsLog(path, flush_interval=0.01, batch_size=7)
+    for i in range(num_rows):
+        log.append({"client_id": client_id, "dataset": "d", "tp": i})
+    log.close()
+
+
+def test_appends_from_two_processes_all_land(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=append_rows, args=(path, client_id, 500)) for client_id in ("1", "2")]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    rows = list(read_rows(path))
+    assert len(rows) == 1000
+    for client_id in ("1", "2"):
+        # every row once, in the order of the client
+        assert [row["tp"] for row in rows if row["client_id"] == client_id] == list(range(500))
+
+
+def test_close_writes_pending_rows(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    log = ResultsLog(path, flush_interval=3600, batch_size=1000)
+    log.append({"client_id": "1", "dataset": "d"})
+    log.close()
+    assert list(read_rows(path)) == [{"client_id": "1", "dataset": "d"}]
+
+
+def test_flush_and_background_writer_keep_order(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    log = ResultsLog(path, flush_interval=0.0001, batch_size=2)
+    write = log._write
+
+    def slow_write(rows):
+        # the background thread is slow to write the rows it has taken
+        if threading.current_thread() is log._thread:
+            time.sleep(0.002)
+        write(rows)
+
+    log._write = slow_write
+    for i in range(300):
+        log.append({"client_id": "1", "dataset": "d", "tp": i})
+        time.sleep(0.0003)
+        if i % 3 == 0:
+            log.flush()
+    log.close()
+    assert [row["tp"] for row in read_rows(path)] == list(range(300))
+
+
+def test_read_rows_skips_truncated_line(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text('{"client_id": "1", "dataset": "d"}\n{"client_id": "2", "da')
+    assert list(read_rows(str(path))) == [{"client_id": "1", "dataset": "d"}]
+
+
+def test_compact_keeps_last_row_per_key(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    csv_path = str(tmp_path / "results.csv")
+    log = ResultsLog(path)
+    log.append({"client_id": "1", "dataset": "a", "tp": 1})
+    log.append({"client_id": "2", "dataset": "a", "tp": 2})
+    log.append({"client_id": "1", "dataset": "b", "tp": 3})
+    log.append({"client_id": "1", "dataset": "a", "tp": 4, "unknown": "dropped"})
+    log.close()
+
+    assert compact(path, csv_path) == 3
+    with open(csv_path, newline="") as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == CSV_COLUMNS
+        rows = {(row["client_id"], row["dataset"]): row["tp"] for row in reader}
+    assert rows == {("1", "a"): "4", ("2", "a"): "2", ("1", "b"): "3"}
+    assert not os.path.exists(csv_path + ".tmp")
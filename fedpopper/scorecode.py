@@ -5,15 +5,11 @@ from popper.core import Clause, Literal
 from popper.util import load_kbpath, format_program
 from popper.loop import decide_outcome, Outcome, calc_score
 import flwr as fl
+from results_log import ResultsLog, result_row
 import numpy as np
-import csv
-import os
-from datetime import datetime
 from popper.core import Literal
 import pandas as pd 
 
-GLOBAL_CSV_PATH = "fedpopper_results_global.csv"
-CSV_FILE = "fedpopper_results_client1.csv"
 #Outcome Encoding
 OUTCOME_ENCODING = {"ALL": 1, "SOME": 2, "NONE": 3}
 OUTCOME_DECODING = {1: "ALL", 2: "SOME", 3: "NONE"}
@@ -29,7 +25,7 @@ bk_file, ex_file, bias_file = load_kbpath(kbpath)
 settings = Settings(bias_file, ex_file, bk_file)
 tester = Tester(settings)
 stats = Stats(log_best_programs=settings.info)
-settings.num_pos, settings.num_neg = len(tester.pos), len(tester.neg)
+settings.num_pos, settings.num_neg = tester.num_pos, tester.num_neg
 best_score = None
 import re
 CLIENT_ID = 3
@@ -84,87 +80,16 @@ def transform_rule_to_tester_format(rule_str):
 
 
 
-CSV_COLUMNS = [
-    "timestamp", "client_id", "dataset",
-    "final_rule", "tp", "fn", "tn", "fp",
-    "accuracy", "precision", "recall", "f1",
-    "num_rules", "avg_rule_length"
-]
+RESULTS_LOG = "fedpopper_results.jsonl"  # may be shared by all clients
+results_log = None
 
 def save_client_result(client_id, dataset_name, rules, conf_matrix):
-    """Rewrite CSV by keeping only ONE entry per (client_id, dataset)."""
-
-    # === Compute statistics ===
-    num_rules = len(rules)
-
-    def rule_length(rule):
-        head, body = rule
-        return 1 + len(body)
-
-    avg_rule_length = (
-        sum(rule_length(r) for r in rules) / num_rules if num_rules > 0 else 0
-    )
-
-    tp, fn, tn, fp = conf_matrix
-    total = tp + fn + tn + fp
-    accuracy  = (tp + tn) / total if total > 0 else 0
-    precision = tp / (tp + fp)   if (tp + fp) > 0 else 0
-    recall    = tp / (tp + fn)   if (tp + fn) > 0 else 0
-    f1 = (2 * precision * recall)/(precision + recall) if (precision + recall) else 0
-
-    # Format rule string
-    def literal_to_str(lit):
-        return Literal.to_code(lit)
-
-    def rule_to_str(rule):
-        head, body = rule
-        head_str = literal_to_str(head)
-        body_str = ", ".join(literal_to_str(l) for l in body)
-        return f"{head_str} :- {body_str}."
-
-    rule_string = " | ".join(rule_to_str(r) for r in rules)
-
-    # ============================================================
-    #   STEP 1 : read existing CSV (if exists)
-    # ============================================================
-    rows = []
-    if os.path.exists(CSV_FILE):
-        with open(CSV_FILE, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # keep lines NOT belonging to the same (client_id, dataset)
-                if not (row["client_id"] == str(client_id) and
-                        row["dataset"] == dataset_name):
-                    rows.append(row)
-
-    # ============================================================
-    #   STEP 2 : append NEW final row for this (client,dataset)
-    # ============================================================
-    new_row = {
-        "timestamp": datetime.now().isoformat(timespec="seconds"),
-        "client_id": str(client_id),
-        "dataset": dataset_name,
-        "final_rule": rule_string,
-        "tp": tp, "fn": fn, "tn": tn, "fp": fp,
-        "accuracy": accuracy,
-        "precision": precision,
-        "recall": recall,
-        "f1": f1,
-        "num_rules": num_rules,
-        "avg_rule_length": avg_rule_length,
-    }
-
-    rows.append(new_row)
-
-    # ============================================================
-    #   STEP 3 : rewrite CSV from scratch (overwrite)
-    # ============================================================
-    with open(CSV_FILE, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
-        writer.writeheader()
-        writer.writerows(rows)
-
-    print(f"📌 Updated (client={client_id}, dataset={dataset_name}) in {CSV_FILE}")
+    """Append the result to RESULTS_LOG without blocking; the CSV with one
+    entry per (client_id, dataset) is built by `results_log.py compact`."""
+    global results_log
+    if results_log is None:
+        results_log = ResultsLog(RESULTS_LOG)
+    results_log.append(result_row(client_id, dataset_name, rules, conf_matrix))
 
 
 class FlowerClient(fl.client.NumPyClient):
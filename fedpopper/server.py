@@ -14,6 +14,7 @@ from popper.asp import ClingoGrounder, ClingoSolver
 
 # Load ILP settings
 kbpath = "/Users/yasmineakaichi/fed-popper/fedpopper/trains"
+TRACE_FILE = None  # e.g. "trace_server.jsonl", see trace_merge.py
 
 _, _, bias_file = load_kbpath(kbpath)
 settings = Settings(bias_file, None, None)
@@ -37,6 +38,7 @@ strategy = FedPopper(
     min_available_clients=3,
     min_evaluate_clients=3,
     fit_metrics_aggregation_fn=None,
+    trace_path=TRACE_FILE,
 )
 
 log(DEBUG, "Starting Flower server with FedILP strategy.")
@@ -48,6 +50,7 @@ fl.server.start_server(
 )
 
 log(DEBUG, "Flower server has stopped.")
+strategy.tracer.close()
 
 # ========== AFFICHER LA SOLUTION ==========
 print("\n========== FINAL SOLUTION ==========")
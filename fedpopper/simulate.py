@@ -0,0 +1,283 @@
+"""
+In-process federated simulation of FedPopper.
+
+    python fedpopper/simulate.py examples/trains2 4 --report trains2_4.json
+    python fedpopper/simulate.py examples/trains2 4 --trace traces/  # see trace_merge.py
+
+Splits <task>/exs.pl into N client shards (see partition.py), starts N
+clients and runs the FedPopper strategy through flwr's Server
+(fit_round/evaluate_round) until the search stops, then prints a
+timing/rounds report.
+
+There is no network: each client proxy talks to its client through a pipe.
+Every client lives in its own worker process because pyswip drives a single
+SWI-Prolog engine per process, so two in-process Testers would share one
+database (and pyswip is not thread-safe).
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+import flwr as fl
+import numpy as np
+from flwr.common import Code, DisconnectRes, GetPropertiesRes, Status
+from flwr.common.trace import Tracer
+from flwr.server.client_manager import SimpleClientManager
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.strategy.fedpopper import EVALUATE_CADENCES, EVALUATE_END, FedPopper, OutcomeMemo, OUTCOME_ENCODING
+from popper.core import Clause, Literal
+from popper.loop import decide_outcome, calc_score
+from popper.tester import Tester
+from popper.util import Settings, export_duration_metrics, load_kbpath
+
+from partition import partition_task
+
+
+# ------------------------------------------------------
+#   CLIENT (same protocol as fedpopper/client*.py)
+# ------------------------------------------------------
+
+def parse_rule(rule_str):
+    head_str, body_str = rule_str.split(":-")
+    head = Literal.from_string(head_str.strip())
+    body = tuple(Literal.from_string(lit) for lit in split_literals(body_str))
+    return (head, body)
+
+def split_literals(body_str):
+    depth, start, out = 0, 0, []
+    for i, c in enumerate(body_str):
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "," and depth == 0:
+            out.append(body_str[start:i].strip())
+            start = i + 1
+    if body_str[start:].strip():
+        out.append(body_str[start:].strip())
+    return out
+
+
+class PopperClient(fl.client.NumPyClient):
+    def __init__(self, tester, tracer=None):
+        self.tester = tester
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.last_tested_key = None  # parameters of last_conf_matrix
+        self.last_conf_matrix = None
+        self.reused = 0
+
+    def get_parameters(self, config):
+        return [np.array([], dtype=np.int64)]
+
+    def rules(self, parameters):
+        if not parameters or parameters[0].size == 0 or parameters[0].dtype.kind not in "USO":
+            return []
+        return [parse_rule(r) for r in parameters[0].tolist()]
+
+    def test(self, parameters, config):
+        """Confusion matrix of the rules in parameters (None without rules);
+        fit and evaluate of byte-identical parameters share one test."""
+        key = tuple((arr.dtype.str, arr.shape, arr.tobytes()) for arr in parameters)
+        if key == self.last_tested_key:
+            self.reused += 1
+            return self.last_conf_matrix
+        span = {"round": config.get("round"), "hyp": config.get("hyp")}
+        with self.tracer.span("parse", **span):
+            rules = self.rules(parameters)
+        with self.tracer.span("test", **span):
+            conf_matrix = self.tester.test(rules) if rules else None
+        self.last_tested_key, self.last_conf_matrix = key, conf_matrix
+        return conf_matrix
+
+    def fit(self, parameters, config):
+        conf_matrix = self.test(parameters, config)
+        if conf_matrix is None:
+            payload = [OUTCOME_ENCODING["none"], OUTCOME_ENCODING["none"], 0]
+            return [np.array(payload, dtype=np.int64)], 0, {}
+
+        eps_plus, eps_minus = decide_outcome(conf_matrix)
+        payload = [OUTCOME_ENCODING[eps_plus], OUTCOME_ENCODING[eps_minus], calc_score(conf_matrix)]
+        return [np.array(payload, dtype=np.int64)], 1, {}
+
+    def evaluate(self, parameters, config):
+        conf_matrix = self.test(parameters, config)
+        if conf_matrix is None:
+            return 1.0, 0, {"accuracy": 0.0}
+        tp, fn, tn, fp = conf_matrix
+        total = tp + fn + tn + fp
+        accuracy = (tp + tn) / total if total > 0 else 0.0
+        return float(1 - accuracy), total, {"accuracy": float(accuracy), "reused": self.reused}
+
+
+def client_worker(kbpath, conn, cid, trace_dir=None):
+    """Client process: serve fit/evaluate calls coming from the proxy."""
+    logging.getLogger("popper").setLevel(logging.WARNING)
+    bk_file, ex_file, bias_file = load_kbpath(kbpath)
+    tracer = Tracer(os.path.join(trace_dir, f"client-{cid}.jsonl"), f"client-{cid}") if trace_dir else Tracer()
+    client = PopperClient(Tester(Settings(bias_file, ex_file, bk_file)), tracer).to_client()
+    conn.send("ready")
+    while True:
+        method, ins = conn.recv()
+        if method == "stop":
+            break
+        config = getattr(ins, "config", {})
+        # deserialize + fit/evaluate + serialize, as seen by the client
+        with tracer.span(method, round=config.get("round"), hyp=config.get("hyp")):
+            res = getattr(client, method)(ins)
+        conn.send(res)
+    tracer.close()
+    conn.close()
+
+
+class PipeClientProxy(ClientProxy):
+    """ClientProxy forwarding Flower instructions to a client worker process."""
+
+    def __init__(self, cid, kbpath, ctx, trace_dir=None):
+        super().__init__(cid)
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=client_worker, args=(kbpath, child_conn, cid, trace_dir), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def wait_ready(self):
+        self.conn.recv()
+
+    def call(self, method, ins):
+        self.conn.send((method, ins))
+        return self.conn.recv()
+
+    def get_properties(self, ins, timeout, group_id):
+        return GetPropertiesRes(Status(Code.OK, ""), {})
+
+    def get_parameters(self, ins, timeout, group_id):
+        return self.call("get_parameters", ins)
+
+    def fit(self, ins, timeout, group_id):
+        return self.call("fit", ins)
+
+    def evaluate(self, ins, timeout, group_id):
+        return self.call("evaluate", ins)
+
+    def reconnect(self, ins, timeout, group_id):
+        self.conn.send(("stop", None))
+        self.process.join(timeout=5)
+        return DisconnectRes(reason="")
+
+
+# ------------------------------------------------------
+#   RUN
+# ------------------------------------------------------
+
+def simulate(kbpath, num_clients, workdir, split="iid", search_process=False, max_rounds=15000, memo_path=None, journal_path=None,
+             evaluate_cadence=EVALUATE_END, evaluate_every=1, trace_dir=None, metrics_path=None):
+    ctx = multiprocessing.get_context("spawn")
+    report = {"task": os.path.basename(os.path.normpath(kbpath)), "clients": num_clients}
+
+    t0 = time.perf_counter()
+    shards = partition_task(kbpath, num_clients, os.path.join(workdir, "client"), split=split)
+    shard_paths = [shard["path"] for shard in shards]
+    report["partition_time"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    if trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+    proxies = [PipeClientProxy(str(i), path, ctx, trace_dir) for i, path in enumerate(shard_paths)]
+    client_manager = SimpleClientManager()
+    for proxy in proxies:
+        proxy.wait_ready()
+        client_manager.register(proxy)
+    report["client_startup_time"] = time.perf_counter() - t0
+
+    _, _, bias_file = load_kbpath(kbpath)
+    strategy = FedPopper(
+        Settings(bias_file, None, None),
+        min_fit_clients=num_clients,
+        min_evaluate_clients=num_clients,
+        min_available_clients=num_clients,
+        search_process=search_process,
+        memo=OutcomeMemo(memo_path) if memo_path else None,
+        journal_path=journal_path,
+        evaluate_cadence=evaluate_cadence,
+        evaluate_every=evaluate_every,
+        trace_path=os.path.join(trace_dir, "server.jsonl") if trace_dir else None,
+    )
+    server = fl.server.Server(client_manager=client_manager, strategy=strategy)
+
+    t0 = time.perf_counter()
+    server.parameters = strategy.initialize_parameters(client_manager)
+    rounds = 0
+    round_times = []
+    evaluations = 0
+    while not strategy.early_stop and rounds < max_rounds:
+        rounds += 1
+        r0 = time.perf_counter()
+        res_fit = server.fit_round(server_round=rounds, timeout=None)
+        if res_fit is not None and res_fit[0]:
+            server.parameters = res_fit[0]
+        evaluations += server.evaluate_round(server_round=rounds, timeout=None) is not None
+        round_times.append(time.perf_counter() - r0)
+    report["learning_time"] = time.perf_counter() - t0
+    server.disconnect_all_clients(timeout=None)
+    report["dispatch"] = server.dispatch_metrics()
+    strategy.tracer.close()
+
+    report["rounds"] = rounds
+    report["evaluations"] = evaluations
+    report["programs"] = strategy.stats.total_programs
+    if strategy.memo is not None:
+        report["memo_hits"] = strategy.memo.hits
+    report["mean_round_time"] = sum(round_times) / rounds if rounds else 0.0
+    report["max_round_time"] = max(round_times) if round_times else 0.0
+    report["solution"] = strategy.solution_params is not None
+    if strategy.best_hypothesis:
+        report["best_hypothesis"] = [Clause.to_code(r) for r in strategy.best_hypothesis]
+    report["durations"] = {
+        s.operation: {"called": s.called, "total": s.total, "mean": s.mean, "min": s.minimum, "max": s.maximum,
+                      "p50": s.p50, "p95": s.p95, "p99": s.p99}
+        for s in strategy.stats.duration_summary()
+    }
+    if metrics_path:
+        export_duration_metrics(strategy.stats, metrics_path)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process FedPopper simulation over N example shards")
+    parser.add_argument("kbpath", help="Task directory (bk.pl, exs.pl, bias.pl), e.g. examples/trains2")
+    parser.add_argument("num_clients", type=int, help="Number of simulated clients / example shards")
+    parser.add_argument("--workdir", type=str, default="", help="Where to write the client shards (default: <kbpath>_sim<N>)")
+    parser.add_argument("--split", default="iid", choices=["iid", "dirichlet", "linear", "square", "exponential"], help="How examples are spread over clients (see partition.py)")
+    parser.add_argument("--max-rounds", type=int, default=15000, help="Maximum number of federated rounds")
+    parser.add_argument("--search-process", default=False, action="store_true", help="Run the Popper search loop in a child process")
+    parser.add_argument("--memo", type=str, default="", help="Outcome memo file (JSONL); already tested hypotheses skip the clients")
+    parser.add_argument("--journal", type=str, default="", help="Search journal (JSONL); an existing journal is replayed to resume the search")
+    parser.add_argument("--evaluate", default=EVALUATE_END, choices=EVALUATE_CADENCES, help="Evaluation cadence: every N rounds, on new best hypotheses, or only the final one")
+    parser.add_argument("--evaluate-every", type=int, default=1, help="N for --evaluate every")
+    parser.add_argument("--trace", type=str, default="", help="Write span traces (server, search, clients) to this directory, see trace_merge.py")
+    parser.add_argument("--report", type=str, default="", help="Write the report as JSON to this file")
+    parser.add_argument("--metrics", type=str, default="", help="Write the stage duration histograms to this file (Prometheus text format)")
+    parser.add_argument("--debug", default=False, action="store_true", help="Keep per-round Flower/Popper logging")
+    args = parser.parse_args()
+
+    if not args.debug:
+        for name in ("popper", "flwr"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    workdir = args.workdir or f"{os.path.normpath(args.kbpath)}_sim{args.num_clients}"
+    report = simulate(args.kbpath, args.num_clients, workdir, args.split, args.search_process, args.max_rounds, args.memo, args.journal,
+                      args.evaluate, args.evaluate_every, args.trace, args.metrics)
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
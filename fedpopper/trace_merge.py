@@ -0,0 +1,150 @@
+"""
+Merge the span traces of a federated run and break every round down along
+its critical path.
+
+    python fedpopper/simulate.py examples/trains2 4 --trace traces/
+    python fedpopper/trace_merge.py traces/*.jsonl
+    python fedpopper/trace_merge.py traces/*.jsonl --json rounds.json --chrome merged.json
+
+Inputs are the JSONL or Chrome files written by flwr.common.trace.Tracer
+(server, search process, clients). A round starts at the server's
+configure_fit and ends with its aggregate_fit; it is split into:
+    - transport:    dispatch, network and (de)serialization outside the
+                    slowest client's fit handler
+    - client_parse: rule parsing on the slowest client
+    - client_test:  Prolog test on the slowest client
+    - client_other: rest of the slowest client's fit handler
+    - aggregate:    server aggregate_fit, without the two stages below
+    - search:       server waiting for the next hypothesis (build, ground,
+                    add, generate; split in the search_* columns)
+    - serialize:    encoding the next hypothesis
+"""
+
+import argparse
+import json
+from collections import defaultdict
+
+from flwr.common.trace import read_trace
+
+SEARCH_STAGES = ("generate", "build", "ground", "add")
+COLUMNS = ("transport", "client_parse", "client_test", "client_other", "aggregate", "search", "serialize")
+
+
+def load(paths):
+    spans = []
+    for path in paths:
+        spans.extend(read_trace(path))
+    spans.sort(key=lambda span: span["ts"])
+    return spans
+
+
+def overlap(span, start, end):
+    return max(0.0, min(span["ts"] + span["dur"], end) - max(span["ts"], start))
+
+
+def breakdown(spans):
+    """One dict per round, durations in milliseconds."""
+    starts, aggregates = {}, {}
+    by_round = defaultdict(list)
+    search_spans = []
+    for span in spans:
+        if span["name"] in SEARCH_STAGES:
+            search_spans.append(span)
+        if span.get("round") is None:
+            continue
+        if span["name"] == "configure_fit":
+            starts[span["round"]] = span
+        elif span["name"] == "aggregate_fit":
+            aggregates[span["round"]] = span
+        else:
+            by_round[span["round"]].append(span)
+
+    rounds = []
+    for server_round in sorted(set(starts) & set(aggregates)):
+        start, aggregate = starts[server_round]["ts"], aggregates[server_round]
+        end = aggregate["ts"] + aggregate["dur"]
+        round_spans = by_round[server_round]
+
+        fits = [span for span in round_spans if span["name"] == "fit"]
+        if not fits:
+            # clients without a fit span (older traces): their parse and test spans
+            client_time = defaultdict(float)
+            for span in round_spans:
+                if span["name"] in ("parse", "test"):
+                    client_time[span["process"]] += span["dur"]
+            fits = [{"process": process, "dur": dur} for process, dur in client_time.items()]
+        slowest = max(fits, key=lambda span: span["dur"]) if fits else None
+        client = {"parse": 0.0, "test": 0.0}
+        if slowest is not None:
+            for span in round_spans:
+                if span["process"] == slowest["process"] and span["name"] in client:
+                    client[span["name"]] += span["dur"]
+        fit_dur = slowest["dur"] if slowest else 0.0
+
+        server = defaultdict(float)
+        for span in round_spans:
+            if span["name"] in ("wait_search", "serialize"):
+                server[span["name"]] += span["dur"]
+
+        row = {
+            "round": server_round,
+            "hyp": starts[server_round].get("hyp"),
+            "clients": len(fits),
+            "slowest_client": slowest["process"] if slowest else None,
+            "wall": end - start,
+            "transport": max(0.0, aggregate["ts"] - start - fit_dur),
+            "client_parse": client["parse"],
+            "client_test": client["test"],
+            "client_other": max(0.0, fit_dur - client["parse"] - client["test"]),
+            "aggregate": max(0.0, aggregate["dur"] - server["wait_search"] - server["serialize"]),
+            "search": server["wait_search"],
+            "serialize": server["serialize"],
+        }
+        for stage in SEARCH_STAGES:
+            row[f"search_{stage}"] = sum(overlap(span, start, end) for span in search_spans if span["name"] == stage)
+        rounds.append({key: value / 1000 if isinstance(value, float) else value for key, value in row.items()})
+    return rounds
+
+
+def write_chrome(spans, path):
+    events = [{
+        "name": span["name"], "ph": "X", "ts": span["ts"], "dur": span["dur"],
+        "pid": span["process"], "tid": span["thread"],
+        "args": {k: v for k, v in span.items() if k not in ("name", "process", "thread", "ts", "dur")},
+    } for span in spans]
+    with open(path, "w") as f:
+        json.dump(events, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-round critical path of a traced federated run")
+    parser.add_argument("traces", nargs="+", help="Trace files (JSONL or Chrome) of the server, search process and clients")
+    parser.add_argument("--json", type=str, default="", help="Write the per-round breakdown to this JSON file")
+    parser.add_argument("--chrome", type=str, default="", help="Write all spans as one Chrome trace to this file")
+    parser.add_argument("--rounds", type=int, default=20, help="Rounds to print (0: all)")
+    args = parser.parse_args()
+
+    spans = load(args.traces)
+    rounds = breakdown(spans)
+    if args.chrome:
+        write_chrome(spans, args.chrome)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rounds, f, indent=2)
+
+    print(f"{'round':>6}{'wall':>9}" + "".join(f"{c:>14}" for c in COLUMNS) + "   (ms)")
+    for row in rounds[:args.rounds or None]:
+        print(f"{row['round']:>6}{row['wall']:>9.2f}" + "".join(f"{row[c]:>14.2f}" for c in COLUMNS))
+    if not rounds:
+        print("no complete round in the traces")
+        return
+
+    wall = sum(row["wall"] for row in rounds)
+    print(f"{'total':>6}{wall:>9.1f}" + "".join(f"{sum(row[c] for row in rounds):>14.1f}" for c in COLUMNS))
+    print(f"{'share':>6}{'':>9}" + "".join(f"{sum(row[c] for row in rounds) / wall:>14.1%}" for c in COLUMNS))
+    search = {stage: sum(row[f"search_{stage}"] for row in rounds) for stage in SEARCH_STAGES}
+    print(f"{len(rounds)} rounds; search stages (ms): " + ", ".join(f"{k}={v:.1f}" for k, v in search.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,17 @@
 
 from popper.util import Settings, parse_settings
 from popper.loop import learn_solution, show_hspace
+from popper.portfolio import learn_portfolio
 
 if __name__ == '__main__':
     settings = parse_settings()
     if settings.hspace:
         show_hspace(settings)
     else:
-        _prog, stats = learn_solution(settings)
+        if settings.portfolio:
+            _prog, stats, _results = learn_portfolio(settings, settings.portfolio, settings.portfolio_schedule)
+        else:
+            _prog, stats = learn_solution(settings)
         stats.log_final_result()
         if settings.stats:
-            stats.show()
\ No newline at end of file
+            stats.show()
@@ -24,6 +24,15 @@ def atom_to_symbol(pred, args):
     xs = tuple(arg_to_symbol(arg) for arg in args)
     return Function(name = pred, arguments = xs)
 
+NUM_OF_LITERALS = (
+"""
+%%% External atom for number of literals in the program %%%%%
+#external size_in_literals(n).
+:-
+    size_in_literals(n),
+    #sum{K+1,Clause : body_size(Clause,K)} != n.
+""")
+
 class ClingoGrounder():
     def __init__(self):
         self.seen_assignments = {}
@@ -143,15 +152,6 @@ class ClingoSolver():
 
         ClingoSolver.load_alan(settings, self.solver)
 
-        NUM_OF_LITERALS = (
-        """
-        %%% External atom for number of literals in the program %%%%%
-        #external size_in_literals(n).
-        :-
-            size_in_literals(n),
-            #sum{K+1,Clause : body_size(Clause,K)} != n.
-        """)
-
         self.solver.add('number_of_literals', ['n'], NUM_OF_LITERALS)
 
         max_vars_atoms = self.solver.symbolic_atoms.by_signature('max_vars', arity=1)
@@ -195,8 +195,11 @@ class ClingoSolver():
             self.seen_symbols[k] = symbol
         return symbol
 
-    def add_ground_clauses(self, clauses):
+    def add_ground_clauses(self, clauses, externals=()):
         with self.solver.backend() as backend:
+            # atoms used before the rules defining them arrive (see portfolio.ConstraintExchange)
+            for literal in externals:
+                backend.add_external(self.gen_symbol(literal, backend), clingo.TruthValue.False_)
             for (head, body) in clauses:
                 head_literal = []
                 if head:
@@ -1,3 +1,4 @@
+import itertools
 from collections import namedtuple, defaultdict
 
 ConstVar = namedtuple('ConstVar', ['name', 'type'])
@@ -160,6 +161,33 @@ class Clause:
         b = frozenset(literal.my_hash() for literal in body)
         return hash((h,b))
 
+    @staticmethod
+    def to_canonical(clause):
+        """
+        Code of the clause with body literals sorted and body-only variables
+        renamed by first occurrence. Literals with the same pattern (e.g.
+        p(A,_) twice) can be renamed in any order, the smallest code wins, so
+        the result does not depend on the iteration order of the body.
+        """
+        (head, body) = clause
+        head_vars = set(head.arguments) if head else set()
+        pattern = lambda literal: (literal.predicate, tuple(arg if arg in head_vars else '_' for arg in literal.arguments))
+        groups = [list(group) for _, group in itertools.groupby(sorted(body, key=pattern), key=pattern)]
+        body_str = None
+        for order in itertools.product(*(itertools.permutations(group) for group in groups)):
+            renaming = {}
+            for literal in itertools.chain.from_iterable(order):
+                for arg in literal.arguments:
+                    if arg not in head_vars and arg not in renaming:
+                        renaming[arg] = f'V{len(renaming)}'
+            code = ','.join(sorted(
+                f'{literal.predicate}({",".join(renaming.get(arg, arg) for arg in literal.arguments)})'
+                for literal in body))
+            if body_str is None or code < body_str:
+                body_str = code
+        head_str = Literal.to_code(head) if head else ''
+        return head_str + ':-' + body_str
+
     @staticmethod
     def is_recursive(clause):
         (head, body) = clause
@@ -0,0 +1,45 @@
+"""Tests for the canonical form of clauses."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from popper.core import Clause, Literal
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CANONICAL = """
+from popper.core import Clause, Literal
+body = frozenset(Literal.from_string(x) for x in ['p(A,B)', 'p(A,C)', 'q(B,C)', 'r(C)'])
+print(Clause.to_canonical((Literal('f', ('A',)), body)))
+"""
+
+
+def clause(head, body):
+    return Literal.from_string(head), tuple(Literal.from_string(literal) for literal in body)
+
+
+@pytest.mark.parametrize('a, b', [
+    # renaming of body-only variables
+    (clause('f(A)', ['p(A,B)', 'q(B)']), clause('f(A)', ['q(X)', 'p(A,X)'])),
+    # tied literals, in both orders
+    (clause('f(A)', ['p(A,B)', 'p(A,C)', 'q(B,C)']), clause('f(A)', ['p(A,C)', 'p(A,B)', 'q(B,C)'])),
+])
+def test_to_canonical_is_order_independent(a, b):
+    assert Clause.to_canonical(a) == Clause.to_canonical(b)
+
+
+def test_to_canonical_keeps_distinct_clauses_apart():
+    assert Clause.to_canonical(clause('f(A)', ['p(A,B)', 'q(B)'])) != Clause.to_canonical(clause('f(A)', ['p(B,A)', 'q(B)']))
+
+
+def test_to_canonical_is_independent_of_hash_seed():
+    codes = set()
+    for seed in ('0', '1', '2', '3'):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [PACKAGE_ROOT, env.get('PYTHONPATH')]))
+        result = subprocess.run([sys.executable, '-c', CANONICAL], env=env, capture_output=True, text=True, check=True)
+        codes.add(result.stdout.strip())
+    assert codes == {'f(A):-p(A,V0),p(A,V1),q(V0,V1),r(V1)'}
@@ -117,19 +117,29 @@ def calc_score(conf_matrix):
     tp, fn, tn, fp = conf_matrix
     return tp + tn
 
-def popper(settings, stats):
+def popper(settings, stats, tester=None, sizes=None, exchange=None):
     solver = ClingoSolver(settings)
-    tester = Tester(settings)
-    settings.num_pos, settings.num_neg = len(tester.pos), len(tester.neg)
+    tester = Tester(settings) if tester is None else tester
+    settings.num_pos, settings.num_neg = tester.num_pos, tester.num_neg
     grounder = ClingoGrounder()
     constrainer = Constrain()
     best_score = None
 
-    for size in range(1, settings.max_literals + 1):
+    # sizes: the order in which program sizes are searched (portfolio schedules)
+    for size in sizes or range(1, settings.max_literals + 1):
+        if exchange is not None and exchange.stopped():
+            break
         stats.update_num_literals(size)
         solver.update_number_of_literals(size)
 
         while True:
+            # SHARE CONSTRAINTS WITH THE OTHER PORTFOLIO WORKERS
+            if exchange is not None:
+                with stats.duration('exchange'):
+                    if exchange.stopped():
+                        break
+                    solver.add_ground_clauses(*exchange.receive())
+
             # GENERATE HYPOTHESIS
             with stats.duration('generate'):
                 model = solver.get_model()
@@ -168,7 +178,13 @@ def popper(settings, stats):
 
             # UPDATE SOLVER
             with stats.duration('add'):
-                solver.add_ground_clauses(rules)
+                if exchange is None:
+                    solver.add_ground_clauses(rules)
+                else:
+                    solver.add_ground_clauses(*exchange.admit(rules))
+
+            if exchange is not None:
+                exchange.publish(rules)
 
     stats.register_completion()
     elapsed_time = stats.total_exec_time()
@@ -180,11 +196,16 @@ def show_hspace(settings):
     f = lambda i, m: print(f'% program {i}\n{format_program(generate_program(m)[0])}')
     ClingoSolver.get_hspace(settings, f)
 
-def learn_solution(settings):
-    stats = Stats(log_best_programs=settings.info)
+def learn_solution(settings, tester=None, stats=None):
+    if stats is None:
+        stats = Stats(log_best_programs=settings.info, trace_programs=settings.trace_programs)
     log_level = logging.DEBUG if settings.debug else logging.INFO
     logging.basicConfig(level=log_level, stream=sys.stderr, format='%(message)s')
-    timeout(popper, (settings, stats), timeout_duration=int(settings.timeout))
+    try:
+        timeout(popper, (settings, stats, tester), timeout_duration=int(settings.timeout))
+    finally:
+        # the trace matters most when the search times out
+        stats.close()
 
     if stats.solution:
         prog_stats = stats.solution
@@ -4,27 +4,37 @@ load_examples:-
     load_pos,
     load_neg.
 
+%% duplicate examples get one index and a weight (ex_weight(ID,W), W the
+%% number of copies), so every distinct atom is evaluated once
 load_pos:-
     current_predicate(pos/1),!,
     findall(X, pos(X), Pos),
-    assert_pos_aux(Pos,1).
+    weighted(Pos, Weighted),
+    assert_pos_aux(Weighted,1).
 load_pos.
 
 load_neg:-
     current_predicate(neg/1),!,
     findall(X, neg(X), Neg),
-    assert_neg_aux(Neg,-1).
+    weighted(Neg, Weighted),
+    assert_neg_aux(Weighted,-1).
 load_neg.
 
+weighted(Xs, Weighted):-
+    msort(Xs, Sorted),
+    clumped(Sorted, Weighted).
+
 assert_pos_aux([],_).
-assert_pos_aux([H|T],I1):-
+assert_pos_aux([H-W|T],I1):-
     assertz(pos_index(I1, H)),
+    assertz(ex_weight(I1, W)),
     I2 is I1+1,
     assert_pos_aux(T,I2).
 
 assert_neg_aux([],_).
-assert_neg_aux([H|T],I1):-
+assert_neg_aux([H-W|T],I1):-
     assertz(neg_index(I1, H)),
+    assertz(ex_weight(I1, W)),
     I2 is I1-1,
     assert_neg_aux(T,I2).
 
@@ -40,11 +50,87 @@ ex_index(ID,Atom):-
 test_ex(Atom):-
     functor(Atom,P,A),
     current_predicate(P/A),!,
-    timeout(T),
-    catch(call_with_time_limit(T, call(Atom)),time_limit_exceeded,false),!.
+    eval_ex(Atom).
 
 success_set(Xs):-
-    findall(ID, (ex_index(ID,Atom),test_ex(Atom)), Xs).
+    covered(ID, (ex_index(ID,Atom),test_ex(Atom)), Xs).
+
+%% ========== EVALUATION MODES ==========
+%% eval_mode/1 is asserted by the Tester (Settings.eval_mode):
+%%   time:       every example under call_with_time_limit(timeout) (default)
+%%   total_time: no timer per example, one limit of total_timeout around the
+%%               whole success set; if it fires, the set is recomputed with
+%%               a timer per example
+%%   inferences: every example under call_with_inference_limit, so coverage
+%%               does not depend on the load of the machine
+:- dynamic eval_mode/1, inference_limit/1, total_timeout/1.
+
+eval_ex(Goal):-
+    eval_mode(inferences),!,
+    inference_limit(N),
+    call_with_inference_limit(Goal, N, Result),
+    Result \== inference_limit_exceeded,!.
+eval_ex(Goal):-
+    eval_mode(total_time),
+    \+ nb_current(popper_eval_fallback, true),!,
+    call(Goal),!.
+eval_ex(Goal):-
+    timeout(T),
+    catch(call_with_time_limit(T, Goal),time_limit_exceeded,false),!.
+
+covered(Template, Goal, Xs):-
+    eval_mode(total_time),!,
+    total_timeout(T),
+    (   catch(call_with_time_limit(T, findall(Template, Goal, Xs0)), time_limit_exceeded, fail)
+    ->  Xs = Xs0
+    ;   setup_call_cleanup(
+            nb_setval(popper_eval_fallback, true),
+            findall(Template, Goal, Xs),
+            nb_setval(popper_eval_fallback, false))
+    ).
+covered(Template, Goal, Xs):-
+    findall(Template, Goal, Xs).
+
+%% ========== MODULE-SCOPED HYPOTHESES ==========
+%% A hypothesis is asserted into a temporary module of its own instead of
+%% user: the module inherits from user (BK, examples), is loaded and tested
+%% in one call and is dropped wholesale afterwards, so several hypotheses
+%% can be resident at once and the user predicates are never touched.
+
+test_hypothesis(Clauses, Xs):-
+    in_temporary_module(M, load_hypothesis(M, Clauses), success_set(M, Xs)).
+
+load_hypothesis(M, Clauses):-
+    forall(member(Clause, Clauses), assertz(M:Clause)).
+
+success_set(M, Xs):-
+    covered(ID, (ex_index(ID,Atom),test_ex(M,Atom)), Xs).
+
+test_ex(M, Atom):-
+    functor(Atom,P,A),
+    current_predicate(M:P/A),!,
+    eval_ex(M:Atom).
+
+%% ========== BATCHED COVERAGE ==========
+%% success_sets(+Groups, -Masks): for every clause group (a hypothesis) the
+%% examples it covers as [Pos,Neg], two hex atoms: bit I-1 of Pos is set if
+%% it covers pos_index(I,_), bit I-1 of Neg if it covers neg_index(-I,_).
+%% One query for many hypotheses, and no list of IDs to convert per group.
+
+success_sets(Groups, Masks):-
+    maplist(success_mask, Groups, Masks).
+
+success_mask(Clauses, [Pos,Neg]):-
+    in_temporary_module(M, load_hypothesis(M, Clauses), success_set(M, Xs)),
+    foldl(add_to_mask, Xs, 0-0, PosMask-NegMask),
+    format(atom(Pos), '~16r', [PosMask]),
+    format(atom(Neg), '~16r', [NegMask]).
+
+add_to_mask(ID, Pos0-Neg, Pos-Neg):-
+    ID > 0,!,
+    Pos is Pos0 \/ (1 << (ID-1)).
+add_to_mask(ID, Pos-Neg0, Pos-Neg):-
+    Neg is Neg0 \/ (1 << (-ID-1)).
 
 %% ========== FUNCTIONAL CHECKS ==========
 non_functional:-
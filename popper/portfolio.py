@@ -0,0 +1,220 @@
+import copy
+import logging
+import multiprocessing
+import queue
+import sys
+from time import perf_counter
+from . util import Stats, DurationHistogram, timeout, SCHEDULE_ASCENDING, SCHEDULE_MIXED
+from . loop import popper, calc_score
+
+# clingo --configuration presets, one per portfolio worker (cycled, with other seeds, beyond 7 workers)
+CLINGO_CONFIGURATIONS = ('auto', 'frumpy', 'jumpy', 'tweety', 'handy', 'crafty', 'trendy')
+EXCHANGE_INTERVAL = 0.05  # seconds between two batches of constraints sent by a worker
+STOP_GRACE = 5            # seconds a worker gets to report after the search is stopped
+
+class ConstraintExchange:
+    """
+    Shares the ground constraints of a portfolio worker with the other
+    workers. Ground constraints only depend on the program that was tested
+    and on max_vars/max_clauses, not on the clingo configuration or the size
+    being searched, so they are sound for every worker. Each worker has an
+    inbox; rules are sent in batches at most every EXCHANGE_INTERVAL seconds
+    and a rule already added (sent or received) is never added again.
+
+    clingo rejects a rule whose head was defined in an earlier solving step
+    ("redefinition of atom"), and an atom used in an earlier step without
+    being defined stays false even if rules for it are added later. The
+    included_clause/2 rules of a clause are defined by whichever worker met
+    it first, and may arrive after a constraint that uses them (batches of
+    different workers are not ordered). So every batch added to the solver
+    goes through admit(): it drops the rules of atoms already defined (the
+    ground rules of an atom only depend on the atom, so they are already
+    there) and declares the included_clause/2 atoms used but not yet
+    defined as externals, false until their rules arrive.
+    """
+    def __init__(self, index, inboxes, stop, interval=EXCHANGE_INTERVAL):
+        self.inbox = inboxes[index]
+        self.outboxes = [inbox for i, inbox in enumerate(inboxes) if i != index]
+        self.stop = stop
+        self.interval = interval
+        self.seen = set()
+        self.defined = set()
+        self.externals = set()
+        self.pending = []
+        self.last_sent = perf_counter()
+        self.sent = 0
+        self.received = 0
+
+    def stopped(self):
+        return self.stop.is_set()
+
+    def publish(self, rules):
+        for rule in rules:
+            if rule not in self.seen:
+                self.seen.add(rule)
+                self.pending.append(rule)
+        if self.pending and perf_counter() - self.last_sent >= self.interval:
+            self.flush()
+
+    def flush(self):
+        for outbox in self.outboxes:
+            outbox.put(self.pending)
+        self.sent += len(self.pending)
+        self.pending = []
+        self.last_sent = perf_counter()
+
+    def receive(self):
+        out = set()
+        while True:
+            try:
+                rules = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            for rule in rules:
+                if rule not in self.seen:
+                    self.seen.add(rule)
+                    out.add(rule)
+        self.received += len(out)
+        return self.admit(out)
+
+    def admit(self, rules):
+        """The rules of a batch that can be added, and the atoms to declare external first."""
+        out = [(head, body) for head, body in rules if not head or head[1:] not in self.defined]
+        self.defined.update(head[1:] for head, _ in out if head)
+        externals = set()
+        for _, body in out:
+            for literal in body:
+                if literal[1] == 'included_clause' and literal[1:] not in self.defined and literal[1:] not in self.externals:
+                    self.externals.add(literal[1:])
+                    externals.add(literal)
+        return out, externals
+
+    def close(self):
+        if self.stopped():
+            # nobody reads the inboxes any more: do not wait for the unread batches at exit
+            for outbox in self.outboxes:
+                outbox.cancel_join_thread()
+        elif self.pending:
+            # the other workers are still searching
+            self.flush()
+
+def size_schedule(max_literals, start=1):
+    """Sizes start..max_literals, then 1..start-1: every size is searched once."""
+    start = min(start, max_literals)
+    return list(range(start, max_literals + 1)) + list(range(1, start))
+
+def portfolio_members(settings, workers, schedule=SCHEDULE_ASCENDING):
+    """(clingo args, sizes) of every worker."""
+    base = settings.clingo_args.split() if isinstance(settings.clingo_args, str) else list(settings.clingo_args)
+    configured = any(arg.startswith('--configuration') for arg in base)
+    members = []
+    for i in range(workers):
+        args = list(base)
+        if not configured:
+            args.append(f'--configuration={CLINGO_CONFIGURATIONS[i % len(CLINGO_CONFIGURATIONS)]}')
+        repeat = i // len(CLINGO_CONFIGURATIONS) if not configured else i
+        if repeat:
+            # same preset again: randomise some decisions with another seed
+            args += [f'--seed={repeat}', '--rand-freq=0.01']
+        start = 1
+        if schedule == SCHEDULE_MIXED and i % 2 == 1:
+            start = 2 + i // 2
+        members.append((args, size_schedule(settings.max_literals, start)))
+    return members
+
+def portfolio_worker(settings, index, sizes, inboxes, stop, results):
+    logging.getLogger('popper').setLevel(logging.DEBUG if settings.debug else logging.WARNING)
+    stats = Stats()
+    exchange = ConstraintExchange(index, inboxes, stop)
+    result = {'worker': index, 'clingo_args': settings.clingo_args, 'start_size': sizes[0]}
+    try:
+        timeout(popper, (settings, stats, None, sizes, exchange), timeout_duration=int(settings.timeout))
+        if stats.solution:
+            stop.set()
+            result['status'] = 'solution'
+        elif exchange.stopped():
+            result['status'] = 'stopped'
+        elif stats.total_exec_time() >= settings.timeout:
+            result['status'] = 'timeout'
+        else:
+            result['status'] = 'exhausted'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f'{type(e).__name__}: {e}'
+    exchange.close()
+    result.update({
+        'solution': stats.solution,
+        'best': stats.best_program,
+        'exec_time': stats.total_exec_time(),
+        'size': stats.num_literals,
+        'programs': stats.total_programs,
+        'rules': stats.total_rules,
+        'ground_rules': stats.total_ground_rules,
+        'sent': exchange.sent,
+        'received': exchange.received,
+        'durations': stats.durations,
+    })
+    results.put(result)
+
+def merge_results(settings, results):
+    """A Stats of the whole portfolio: the first solution, else the best program of any worker."""
+    stats = Stats(log_best_programs=settings.info)
+    for result in results:
+        stats.total_programs += result['programs']
+        stats.total_rules += result['rules']
+        stats.total_ground_rules += result['ground_rules']
+        for operation, durations in result['durations'].items():
+            stats.durations.setdefault(operation, DurationHistogram()).merge(durations)
+    solutions = [result['solution'] for result in results if result['solution']]
+    if solutions:
+        stats.solution = solutions[0]
+    bests = [result['best'] for result in results if result['best']]
+    stats.best_programs = sorted(bests, key=lambda prog_stats: calc_score(prog_stats.conf_matrix))
+    return stats
+
+def learn_portfolio(settings, workers, schedule=SCHEDULE_ASCENDING):
+    """
+    Run workers Popper searches in parallel, each with its own clingo
+    configuration and size schedule (see portfolio_members), sharing their
+    constraints (ConstraintExchange). The first solution stops the others.
+    With SCHEDULE_MIXED a solution is not necessarily the smallest one.
+    Returns the code of the solution (or best program), the merged Stats and
+    the result of every worker.
+    """
+    log_level = logging.DEBUG if settings.debug else logging.INFO
+    logging.basicConfig(level=log_level, stream=sys.stderr, format='%(message)s')
+    ctx = multiprocessing.get_context('spawn')
+    members = portfolio_members(settings, workers, schedule)
+    inboxes = [ctx.Queue() for _ in members]
+    stop = ctx.Event()
+    results = ctx.Queue()
+    processes = []
+    for i, (clingo_args, sizes) in enumerate(members):
+        worker_settings = copy.copy(settings)
+        worker_settings.clingo_args = clingo_args
+        worker_settings.trace_programs = None
+        process = ctx.Process(target=portfolio_worker, args=(worker_settings, i, sizes, inboxes, stop, results), daemon=True)
+        process.start()
+        processes.append(process)
+
+    deadline = perf_counter() + settings.timeout + STOP_GRACE
+    collected = []
+    while len(collected) < len(processes):
+        try:
+            result = results.get(timeout=max(0.0, deadline - perf_counter()))
+        except queue.Empty:
+            break
+        collected.append(result)
+        if result['solution']:
+            stop.set()
+        if stop.is_set():
+            deadline = min(deadline, perf_counter() + STOP_GRACE)
+    stop.set()
+    for process in processes:
+        process.join(timeout=1)
+        if process.is_alive():
+            process.kill()
+
+    stats = merge_results(settings, collected)
+    best = stats.best_program
+    return (best.code if best else None), stats, collected
@@ -11,12 +11,14 @@ This tester is safe to use on the server in a federated setting.
 """
 
 from popper.core import Clause, Literal
+from popper.subsumption import SubsumptionChecker
 
 class StructuralTester:
     def __init__(self):
         # The real Popper Tester keeps caches for efficiency.
         # We keep these empty caches only to preserve API compatibility.
         self.already_checked_redundant_literals = set()
+        self.subsumption = SubsumptionChecker()
         self.seen_tests = {}
         self.seen_prog = {}
 
@@ -26,17 +28,18 @@ class StructuralTester:
 
     def check_redundant_literal(self, program):
         """
-        In Popper, this uses Prolog to check if a literal is redundant.
-        On the server we cannot evaluate semantics, so we ONLY return an empty list.
+        Clauses of the program that subsume themselves without one of their
+        literals. Theta-subsumption only looks at the rules, never at BK or
+        examples, so the server runs the same check as the clients.
         """
-        return []
+        return self.subsumption.check_redundant_literal(program, self.already_checked_redundant_literals)
 
     def check_redundant_clause(self, program):
         """
-        Normally detects redundant clauses using Prolog queries.
-        Not allowed in FILP, so always return empty.
+        Whether a clause of the program subsumes another one (structural,
+        same as the client Tester).
         """
-        return []
+        return self.subsumption.redundant_clause(program)
 
     def is_non_functional(self, program):
         """
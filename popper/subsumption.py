@@ -0,0 +1,122 @@
+"""
+Theta-subsumption for the redundancy checks, without Prolog.
+
+A clause C subsumes a clause D if C.theta is a subset of D for some
+substitution theta of the variables of C, the variables of D being read as
+constants (numbervars in lp/test.pl). The head is a literal of its own kind
+(not_<head> in lp/test.pl), so it only matches the head of the other clause.
+
+Literals are interned as (symbol, arguments) with one integer symbol per
+(predicate, arity, is_head). C can only subsume D if the symbols of C are a
+subset of those of D (signature pre-filter); the search then binds the
+literals of C with the fewest candidates in D first. Pairwise results are
+memoised, so a clause compared with the same clause again costs a lookup.
+"""
+
+from . core import Clause
+
+def is_variable(arg):
+    return isinstance(arg, str) and (arg[:1].isupper() or arg[:1] == '_')
+
+class EncodedClause:
+    __slots__ = ('literals', 'signature', 'index')
+
+    def __init__(self, literals):
+        self.literals = literals
+        self.signature = frozenset(symbol for symbol, _ in literals)
+        self.index = {}
+        for symbol, args in literals:
+            self.index.setdefault(symbol, []).append(args)
+
+class SubsumptionChecker:
+    def __init__(self, max_pairs=1000000):
+        self.symbols = {}
+        self.encoded = {}
+        self.pairs = {}
+        self.max_pairs = max_pairs
+
+    def symbol(self, predicate, arity, is_head):
+        key = (predicate, arity, is_head)
+        symbol = self.symbols.get(key)
+        if symbol is None:
+            symbol = self.symbols[key] = len(self.symbols)
+        return symbol
+
+    def literals(self, clause):
+        (head, body) = clause
+        literals = []
+        if head:
+            literals.append((self.symbol(head.predicate, head.arity, True), tuple(head.arguments)))
+        for literal in body:
+            literals.append((self.symbol(literal.predicate, literal.arity, False), tuple(literal.arguments)))
+        return tuple(literals)
+
+    def encode(self, literals):
+        encoded = self.encoded.get(literals)
+        if encoded is None:
+            encoded = self.encoded[literals] = EncodedClause(literals)
+        return encoded
+
+    def subsumes(self, c, d):
+        """Whether the interned clause c subsumes the interned clause d."""
+        key = (c, d)
+        result = self.pairs.get(key)
+        if result is None:
+            result = self._subsumes(self.encode(c), self.encode(d))
+            if len(self.pairs) >= self.max_pairs:
+                self.pairs.clear()
+                self.encoded.clear()
+            self.pairs[key] = result
+        return result
+
+    def _subsumes(self, c, d):
+        if not c.signature <= d.signature:
+            return False
+        # most constrained literals first
+        literals = sorted(c.literals, key=lambda literal: len(d.index[literal[0]]))
+        return self._match(literals, 0, d.index, {})
+
+    def _match(self, literals, i, index, theta):
+        if i == len(literals):
+            return True
+        symbol, args = literals[i]
+        for target in index[symbol]:
+            bound = []
+            for arg, value in zip(args, target):
+                if is_variable(arg):
+                    current = theta.get(arg)
+                    if current is None:
+                        theta[arg] = value
+                        bound.append(arg)
+                        continue
+                    if current == value:
+                        continue
+                elif arg == value:
+                    continue
+                break
+            else:
+                if self._match(literals, i + 1, index, theta):
+                    return True
+            for arg in bound:
+                del theta[arg]
+        return False
+
+    def redundant_literal(self, clause):
+        """Whether the clause subsumes itself without one of its literals."""
+        literals = self.literals(clause)
+        return any(self.subsumes(literals, literals[:i] + literals[i+1:]) for i in range(len(literals)))
+
+    def redundant_clause(self, program):
+        """Whether a clause of the program subsumes another one."""
+        clauses = [self.literals(clause) for clause in program]
+        return any(self.subsumes(c, d) for i, c in enumerate(clauses) for j, d in enumerate(clauses) if i != j)
+
+    def check_redundant_literal(self, program, already_checked):
+        """The clauses of the program with a redundant literal, skipping those in already_checked."""
+        for clause in program:
+            k = Clause.clause_hash(clause)
+            if k in already_checked:
+                continue
+            already_checked.add(k)
+            if self.redundant_literal(clause):
+                yield clause
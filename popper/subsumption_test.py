@@ -0,0 +1,83 @@
+"""Tests for the theta-subsumption redundancy checks."""
+
+import pytest
+
+from popper.core import Literal
+from popper.subsumption import SubsumptionChecker, is_variable
+
+
+def clause(code):
+    """(head, body) of a clause written as 'f(A):-p(A,B),q(B)'."""
+    head, body = code.split(':-')
+    literals = body.replace('),', ')|').split('|') if body else []
+    return Literal.from_string(head), tuple(Literal.from_string(literal) for literal in literals)
+
+
+@pytest.mark.parametrize('arg, expected', [('A', True), ('_G1', True), ('a', False), ('3', False), (3, False)])
+def test_is_variable(arg, expected):
+    assert is_variable(arg) == expected
+
+
+@pytest.mark.parametrize('c, d, expected', [
+    # renaming
+    ('f(A):-p(A,B)', 'f(X):-p(X,Y)', True),
+    # fewer body literals
+    ('f(A):-p(A,B)', 'f(A):-p(A,B),q(B)', True),
+    ('f(A):-p(A,B),q(B)', 'f(A):-p(A,B)', False),
+    # theta must be consistent across literals
+    ('f(A):-p(A,B),q(B)', 'f(A):-p(A,B),q(C)', False),
+    ('f(A):-p(A,B),q(C)', 'f(A):-p(A,B),q(B)', True),
+    # constants only match themselves
+    ('f(A):-p(A,a)', 'f(A):-p(A,b)', False),
+    ('f(A):-p(A,B)', 'f(A):-p(A,a)', True),
+    # the head only matches the head
+    ('f(A):-p(A)', 'g(A):-p(A)', False),
+    ('f(A):-f(A)', 'f(A):-p(A)', False),
+])
+def test_subsumes(c, d, expected):
+    checker = SubsumptionChecker()
+    assert checker.subsumes(checker.literals(clause(c)), checker.literals(clause(d))) == expected
+
+
+@pytest.mark.parametrize('code, expected', [
+    ('f(A):-p(A,B)', False),
+    ('f(A):-p(A,B),q(B)', False),
+    # p(A,C) maps onto p(A,B)
+    ('f(A):-p(A,B),p(A,C)', True),
+    ('f(A):-p(A,B),q(B),p(A,C),q(C)', True),
+    ('f(A):-p(A,B),q(B),p(A,C)', True),
+    ('f(A):-p(A,B),q(B),p(A,C),r(C)', False),
+])
+def test_redundant_literal(code, expected):
+    assert SubsumptionChecker().redundant_literal(clause(code)) == expected
+
+
+@pytest.mark.parametrize('program, expected', [
+    (['f(A):-p(A)', 'f(A):-q(A)'], False),
+    (['f(A):-p(A)', 'f(A):-p(A),q(A)'], True),
+    (['f(A):-p(A,B)', 'f(A):-p(A,a)'], True),
+    (['f(A):-p(A,B),q(B)', 'f(A):-p(A,B),r(B)'], False),
+    # different heads never subsume each other
+    (['f(A):-p(A)', 'g(A):-p(A),q(A)'], False),
+])
+def test_redundant_clause(program, expected):
+    assert SubsumptionChecker().redundant_clause([clause(code) for code in program]) == expected
+
+
+def test_check_redundant_literal_skips_checked_clauses():
+    checker = SubsumptionChecker()
+    redundant, plain = clause('f(A):-p(A,B),p(A,C)'), clause('f(A):-q(A)')
+    already_checked = set()
+
+    assert list(checker.check_redundant_literal([redundant, plain], already_checked)) == [redundant]
+    assert len(already_checked) == 2
+    assert list(checker.check_redundant_literal([redundant], already_checked)) == []
+
+
+def test_memo_is_bounded():
+    checker = SubsumptionChecker(max_pairs=2)
+    clauses = [checker.literals(clause(f'f(A):-p{i}(A)')) for i in range(4)]
+    for c in clauses:
+        checker.subsumes(c, clauses[0])
+    assert len(checker.pairs) <= 2
+    assert checker.subsumes(clauses[0], clauses[0])
@@ -3,52 +3,140 @@ from pyswip import Prolog
 import os
 import sys
 import time
+import hashlib
 import pkg_resources
 from contextlib import contextmanager
-from . core import Clause, Literal
+from . core import Clause
+from . subsumption import SubsumptionChecker
 from datetime import datetime
 
+def file_digest(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def atom_text(atom):
+    # pyswip normalises answers to str, older versions return Atom objects
+    return atom if isinstance(atom, str) else atom.value
+
 class Tester():
     def __init__(self, settings):
         self.settings = settings
         self.prolog = Prolog()
         self.eval_timeout = settings.eval_timeout
         self.already_checked_redundant_literals = set()
+        self.subsumption = SubsumptionChecker()
         self.seen_tests = {}
         self.seen_prog = {}
+        self.seen_masks = {}
 
         bk_pl_path = self.settings.bk_file
         exs_pl_path = self.settings.ex_file
         test_pl_path = pkg_resources.resource_filename(__name__, "lp/test.pl")
 
         for x in [exs_pl_path, bk_pl_path, test_pl_path]:
-
-            # Skip empty or invalid paths
-            if not x or not isinstance(x, str) or x.strip() == "":
-                print(f"[Tester] ⚠️ Skipping empty Prolog file path: '{x}'")
-                continue
-
-            # Skip files that do not exist
-            if not os.path.exists(x):
-                print(f"[Tester] ⚠️ File does not exist, skipping consult(): {x}")
-                continue
-
-            if os.name == 'nt': # if on Windows, SWI requires escaped directory separators
-                x = x.replace('\\', '\\\\')
-            print(f"[Tester] ✅ Consulting Prolog file: {x}")
-            self.prolog.consult(x)
-
-        # load examples
+            self.consult(x)
+        # (path, content digest) of the loaded BK, see switch()
+        self.loaded_bk = (bk_pl_path, file_digest(bk_pl_path))
+
+        self.index_examples()
+        self.assert_eval_settings()
+
+    def consult(self, x):
+        # Skip empty or invalid paths
+        if not x or not isinstance(x, str) or x.strip() == "":
+            print(f"[Tester] ⚠️ Skipping empty Prolog file path: '{x}'")
+            return
+
+        # Skip files that do not exist
+        if not os.path.exists(x):
+            print(f"[Tester] ⚠️ File does not exist, skipping consult(): {x}")
+            return
+
+        if os.name == 'nt': # if on Windows, SWI requires escaped directory separators
+            x = x.replace('\\', '\\\\')
+        print(f"[Tester] ✅ Consulting Prolog file: {x}")
+        self.prolog.consult(x)
+
+    def unload(self, x):
+        if not x or not os.path.exists(x):
+            return
+        if os.name == 'nt':
+            x = x.replace('\\', '\\\\')
+        list(self.prolog.query(f"unload_file('{x}')"))
+
+    def index_examples(self):
+        # the engine is shared by every Tester of the process: drop the
+        # indices of a previous Tester before loading the examples
+        for fact in ('pos_index(_,_)', 'neg_index(_,_)', 'ex_weight(_,_)'):
+            self.prolog.retractall(fact)
         list(self.prolog.query('load_examples'))
 
+        # one index per distinct example, weighted by its number of copies
         self.pos = [x['I'] for x in self.prolog.query('current_predicate(pos_index/2),pos_index(I,_)')]
         self.neg = [x['I'] for x in self.prolog.query('current_predicate(neg_index/2),neg_index(I,_)')]
-
+        self.weights = {x['I']: x['W'] for x in self.prolog.query('current_predicate(ex_weight/2),ex_weight(I,W)')}
+        self.num_pos = sum(self.weight(p) for p in self.pos)
+        self.num_neg = sum(self.weight(n) for n in self.neg)
+        self.unweighted = self.num_pos + self.num_neg == len(self.pos) + len(self.neg)
+
+    def assert_eval_settings(self):
+        for fact in ('timeout(_)', 'eval_mode(_)', 'inference_limit(_)', 'total_timeout(_)'):
+            self.prolog.retractall(fact)
         self.prolog.assertz(f'timeout({self.eval_timeout})')
+        self.prolog.assertz(f'eval_mode({self.settings.eval_mode})')
+        self.prolog.assertz(f'inference_limit({self.settings.eval_inferences})')
+        self.prolog.assertz(f'total_timeout({self.eval_timeout * max(1, len(self.pos) + len(self.neg))})')
+
+    def switch(self, settings):
+        """
+        Reuse this Tester, i.e. its Prolog engine with test.pl loaded, for the
+        task of settings (batch learning): the BK is only reloaded if its
+        content differs, the examples always are, and the caches are dropped.
+        """
+        self.unload(self.settings.ex_file)
+        digest = file_digest(settings.bk_file)
+        if digest != self.loaded_bk[1]:
+            self.unload(self.loaded_bk[0])
+            self.consult(settings.bk_file)
+            self.loaded_bk = (settings.bk_file, digest)
+        self.consult(settings.ex_file)
+
+        self.settings = settings
+        self.eval_timeout = settings.eval_timeout
+        self.already_checked_redundant_literals = set()
+        self.seen_tests = {}
+        self.seen_prog = {}
+        self.seen_masks = {}
+        self.index_examples()
+        self.assert_eval_settings()
+
+    def weight(self, ex):
+        return self.weights.get(ex, 1)
+
+    def weighted_count(self, mask, sign):
+        """Total weight of the examples in a pos (sign 1) or neg (sign -1) mask."""
+        if self.unweighted:
+            return bin(mask).count('1')
+        count, i = 0, 1
+        while mask:
+            if mask & 1:
+                count += self.weight(sign * i)
+            mask >>= 1
+            i += 1
+        return count
 
     def first_result(self, q):
         return list(self.prolog.query(q))[0]
 
+    @staticmethod
+    def hypothesis_term(rules):
+        """The rules as one Prolog list of clauses, e.g. [(f(A):-p(A))]."""
+        return f"[{','.join(f'({Clause.to_code(Clause.to_ordered(rule))})' for rule in rules)}]"
+
+    # asserts the rules into user, only for BK predicates that call the
+    # hypothesis (non_functional/1); testing uses module-scoped hypotheses
     @contextmanager
     def using(self, rules):
         current_clauses = set()
@@ -63,38 +151,70 @@ class Tester():
                 args = ','.join(['_'] * arity)
                 self.prolog.retractall(f'{predicate}({args})')
 
+    # redundancy checks are structural: theta-subsumption in Python (see
+    # subsumption.py) instead of redundant_literal/1 and redundant_clause/1
+    # in lp/test.pl, with already compared clauses memoised
     def check_redundant_literal(self, program):
-        for clause in program:
-            k = Clause.clause_hash(clause)
-            if k in self.already_checked_redundant_literals:
-                continue
-            self.already_checked_redundant_literals.add(k)
-            (head, body) = clause
-            C = f"[{','.join(('not_'+ Literal.to_code(head),) + tuple(Literal.to_code(lit) for lit in body))}]"
-            res = list(self.prolog.query(f'redundant_literal({C})'))
-            if res:
-                yield clause
+        return self.subsumption.check_redundant_literal(program, self.already_checked_redundant_literals)
 
     def check_redundant_clause(self, program):
-        # AC: if the overhead of this call becomes too high, such as when learning programs with lots of clauses, we can improve it by not comparing already compared clauses
-        prog = []
-        for (head, body) in program:
-            C = f"[{','.join(('not_'+ Literal.to_code(head),) + tuple(Literal.to_code(lit) for lit in body))}]"
-            prog.append(C)
-        prog = f"[{','.join(prog)}]"
-        return list(self.prolog.query(f'redundant_clause({prog})'))
+        return self.subsumption.redundant_clause(program)
 
     def is_non_functional(self, program):
         with self.using(program):
             return list(self.prolog.query(f'non_functional.'))
 
     def success_set(self, rules):
+        # one pyswip call: the hypothesis is loaded into a temporary module,
+        # tested and dropped by test_hypothesis/2 (lp/test.pl)
         prog_hash = frozenset(rule for rule in rules)
         if prog_hash not in self.seen_prog:
-            with self.using(rules):
-                self.seen_prog[prog_hash] = set(next(self.prolog.query('success_set(Xs)'))['Xs'])
+            query = f'test_hypothesis({self.hypothesis_term(rules)},Xs)'
+            self.seen_prog[prog_hash] = set(self.first_result(query)['Xs'])
         return self.seen_prog[prog_hash]
 
+    def success_masks(self, programs):
+        """
+        (pos mask, neg mask) of the examples covered by each program, bit i-1
+        set for pos_index i / neg_index -i. One success_sets/2 query for all
+        the programs that are not cached yet.
+        """
+        keys = [frozenset(rules) for rules in programs]
+        todo = {}
+        for key, rules in zip(keys, programs):
+            if key not in self.seen_masks and key not in todo:
+                todo[key] = rules
+        if todo:
+            query = f"success_sets([{','.join(self.hypothesis_term(rules) for rules in todo.values())}],Masks)"
+            for key, (pos, neg) in zip(todo, self.first_result(query)['Masks']):
+                self.seen_masks[key] = (int(atom_text(pos), 16), int(atom_text(neg), 16))
+        return [self.seen_masks[key] for key in keys]
+
+    def test_many(self, programs):
+        """
+        Confusion matrices (tp, fn, tn, fp) of the programs, as test() for each
+        of them, with one Prolog query for the whole batch. Separable programs
+        are tested clause by clause so clauses shared by programs are cached.
+        """
+        groups = []
+        for rules in programs:
+            if all(Clause.is_separable(rule) for rule in rules):
+                groups.append([[rule] for rule in rules])
+            else:
+                groups.append([rules])
+        masks = iter(self.success_masks([group for program_groups in groups for group in program_groups]))
+
+        conf_matrices = []
+        for program_groups in groups:
+            pos, neg = 0, 0
+            for _ in program_groups:
+                pos_mask, neg_mask = next(masks)
+                pos |= pos_mask
+                neg |= neg_mask
+            tp, fp = self.weighted_count(pos, 1), self.weighted_count(neg, -1)
+            conf_matrices.append((tp, self.num_pos - tp, self.num_neg - fp, fp))
+        return conf_matrices
+
     def test(self, rules):
         if all(Clause.is_separable(rule) for rule in rules):
             covered = set()
@@ -106,14 +226,14 @@ class Tester():
         tp, fn, tn, fp = 0, 0, 0, 0
         for p in self.pos:
             if p in covered:
-                tp +=1
+                tp += self.weight(p)
             else:
-                fn +=1
+                fn += self.weight(p)
         for n in self.neg:
             if n in covered:
-                fp +=1
+                fp += self.weight(n)
             else:
-                tn +=1
+                tn += self.weight(n)
 
         return tp, fn, tn, fp
 
@@ -0,0 +1,70 @@
+"""Tests for the batched coverage masks of the Tester."""
+
+from collections import namedtuple
+
+import pytest
+
+try:
+    from pyswip import Prolog
+    Prolog()
+except Exception as e:
+    pytest.skip(f'SWI-Prolog is not available: {e}', allow_module_level=True)
+
+from popper.core import Clause
+from popper.tester import Tester, atom_text
+from popper.util import Settings
+
+BK = """
+p(a). p(b).
+q(b). q(c).
+"""
+
+# f(b) twice: weight 2
+EXAMPLES = """
+pos(f(a)).
+pos(f(b)).
+pos(f(b)).
+neg(f(c)).
+neg(f(d)).
+"""
+
+
+@pytest.fixture(scope='module')
+def tester(tmp_path_factory):
+    path = tmp_path_factory.mktemp('task')
+    (path / 'bk.pl').write_text(BK)
+    (path / 'exs.pl').write_text(EXAMPLES)
+    (path / 'bias.pl').write_text('')
+    return Tester(Settings(str(path / 'bias.pl'), str(path / 'exs.pl'), str(path / 'bk.pl')))
+
+
+def test_atom_text():
+    Atom = namedtuple('Atom', ['value'])
+    assert atom_text('1f') == '1f'
+    assert atom_text(Atom('1f')) == '1f'
+
+
+def test_success_masks(tester):
+    # bit i-1 for pos_index i / neg_index -i, examples indexed in sorted order
+    programs = [[Clause.from_string('f(A):-p(A)')], [Clause.from_string('f(A):-q(A)')]]
+    assert tester.success_masks(programs) == [(0b11, 0b00), (0b10, 0b01)]
+    # cached: the same answer without a new query
+    assert tester.success_masks(programs[::-1]) == [(0b10, 0b01), (0b11, 0b00)]
+
+
+def test_test_many_matches_test(tester):
+    programs = [
+        [Clause.from_string('f(A):-p(A)')],
+        [Clause.from_string('f(A):-q(A)')],
+        [Clause.from_string('f(A):-p(A)'), Clause.from_string('f(A):-q(A)')],
+        [Clause.from_string('f(A):-p(A),q(A)')],
+    ]
+    assert tester.test_many(programs) == [(3, 0, 2, 0), (2, 1, 1, 1), (3, 0, 1, 1), (2, 1, 2, 0)]
+    assert tester.test_many(programs) == [tester.test(rules) for rules in programs]
+
+
+def test_second_tester_does_not_duplicate_examples(tester):
+    # one SWI-Prolog engine per process: a new Tester must not add to the indices
+    second = Tester(tester.settings)
+    assert (second.pos, second.neg, second.num_pos, second.num_neg) == ([1, 2], [-1, -2], 3, 2)
+    assert second.test_many([[Clause.from_string('f(A):-q(A)')]]) == [(2, 1, 1, 1)]
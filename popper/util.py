@@ -1,6 +1,8 @@
 import signal
 import argparse
 import os
+import json
+import math
 import logging
 import copy
 from time import perf_counter
@@ -10,14 +12,26 @@ from .constrain import Constrain
 
 TIMEOUT=600
 EVAL_TIMEOUT=0.001
+# how an example is bounded when testing a program (see lp/test.pl)
+EVAL_MODE_TIME='time'              # time limit per example (eval_timeout)
+EVAL_MODE_TOTAL_TIME='total_time'  # one time limit per program (eval_timeout * examples)
+EVAL_MODE_INFERENCES='inferences'  # inference limit per example, deterministic
+EVAL_MODES=(EVAL_MODE_TIME, EVAL_MODE_TOTAL_TIME, EVAL_MODE_INFERENCES)
+EVAL_INFERENCES=20000
 MAX_LITERALS=100
 MAX_SOLUTIONS=1
 CLINGO_ARGS=''
+# size schedules of the portfolio workers (see portfolio.py)
+SCHEDULE_ASCENDING='ascending'  # every worker searches sizes 1, 2, ..., max_literals
+SCHEDULE_MIXED='mixed'          # odd workers start at a larger size and wrap around
+SCHEDULES=(SCHEDULE_ASCENDING, SCHEDULE_MIXED)
 
 def parse_args():
     parser = argparse.ArgumentParser(description='Popper, an ILP engine based on learning from failures')
     parser.add_argument('kbpath', help = 'Path to the knowledge base one wants to learn on')
     parser.add_argument('--eval-timeout', type=float, default=EVAL_TIMEOUT, help='Prolog evaluation timeout in seconds')
+    parser.add_argument('--eval-mode', default=EVAL_MODE_TIME, choices=EVAL_MODES, help='Bound on the evaluation of examples: time limit per example, one time limit per program, or inference limit per example')
+    parser.add_argument('--eval-inferences', type=int, default=EVAL_INFERENCES, help='Prolog inference limit per example (--eval-mode inferences)')
     parser.add_argument('--timeout', type=float, default=TIMEOUT, help='Overall timeout (in seconds)')
     parser.add_argument('--max-literals', type=int, default=MAX_LITERALS, help='Maximum number of literals allowed in program')
     # parser.add_argument('--max-solutions', type=int, default=MAX_SOLUTIONS, help='Maximum number of solutions to print')
@@ -31,6 +45,9 @@ def parse_args():
     parser.add_argument('--ex-file', type=str, default='', help='Filename for the examples')
     parser.add_argument('--bk-file', type=str, default='', help='Filename for the background knowledge')
     parser.add_argument('--bias-file', type=str, default='', help='Filename for the bias')
+    parser.add_argument('--portfolio', type=int, default=0, help='Run this many searches in parallel with different Clingo configurations, sharing their constraints')
+    parser.add_argument('--portfolio-schedule', default=SCHEDULE_ASCENDING, choices=SCHEDULES, help='Program sizes searched by the portfolio workers (mixed: odd workers start at a larger size, the solution may not be the smallest)')
+    parser.add_argument('--trace-programs', type=str, default='', help='Stream every tested program and its confusion matrix to this file (JSONL)')
     return parser.parse_args()
 
 def timeout(func, args=(), kwargs={}, timeout_duration=1, default=None):
@@ -72,13 +89,18 @@ def parse_settings():
         debug = args.debug,
         stats = args.stats,
         eval_timeout = args.eval_timeout,
+        eval_mode = args.eval_mode,
+        eval_inferences = args.eval_inferences,
         test_all = args.test_all,
         timeout = args.timeout,
         max_literals = args.max_literals,
         clingo_args= [] if not args.clingo_args else args.clingo_args.split(' '),
         max_solutions = MAX_SOLUTIONS,
         functional_test = args.functional_test,
-        hspace = False if args.hspace == -1 else args.hspace
+        hspace = False if args.hspace == -1 else args.hspace,
+        trace_programs = args.trace_programs or None,
+        portfolio = args.portfolio,
+        portfolio_schedule = args.portfolio_schedule
     )
 
 class Settings:
@@ -96,7 +118,12 @@ class Settings:
             clingo_args = CLINGO_ARGS,
             max_solutions = MAX_SOLUTIONS,
             functional_test = False,
-            hspace=False):
+            hspace=False,
+            trace_programs=None,
+            eval_mode=EVAL_MODE_TIME,
+            eval_inferences=EVAL_INFERENCES,
+            portfolio=0,
+            portfolio_schedule=SCHEDULE_ASCENDING):
             
         self.bias_file = bias_file
         self.ex_file = ex_file
@@ -112,6 +139,11 @@ class Settings:
         self.max_solutions = max_solutions
         self.functional_test = functional_test
         self.hspace = hspace
+        self.trace_programs = trace_programs
+        self.eval_mode = eval_mode
+        self.eval_inferences = eval_inferences
+        self.portfolio = portfolio
+        self.portfolio_schedule = portfolio_schedule
 
 def format_program(program):
     return "\n".join(Clause.to_code(Clause.to_ordered(clause)) + '.' for clause in program)
@@ -126,6 +158,32 @@ def format_conf_matrix(conf_matrix):
         recall = f'{tp / (tp+fn):0.2f}'
     return f'% Precision:{precision}, Recall:{recall}, TP:{tp}, FN:{fn}, TN:{tn}, FP:{fp}\n'
 
+class ProgramTrace:
+    """
+    Stream of the tested programs, one JSON line per program:
+    {"n": program number, "size": max literals, "program": [clause, ...],
+    "cm": [tp, fn, tn, fp]}. Lines are buffered by the file object and
+    flushed at every new size, on a solution and on close().
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w')
+
+    def write(self, n, size, program, conf_matrix):
+        self.file.write(json.dumps({
+            'n': n,
+            'size': size,
+            'program': [Clause.to_code(clause) for clause in program],
+            'cm': list(conf_matrix)
+        }, separators=(',', ':')) + '\n')
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
 class Stats:
     def __init__(self,
                     log_best_programs=False,
@@ -137,9 +195,11 @@ class Stats:
                     final_exec_time = 0,
                     stages = None,
                     best_programs = None,
-                    solution = None):
+                    solution = None,
+                    trace_programs = None):
         self.exec_start = perf_counter()
         self.logger = logging.getLogger("popper")
+        self.program_trace = ProgramTrace(trace_programs) if trace_programs else None
 
         self.log_best_programs = log_best_programs
         self.num_literals = num_literals
@@ -155,7 +215,16 @@ class Stats:
     def __enter__(self):
         return self
 
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.program_trace is not None:
+            self.program_trace.close()
+
     def update_num_literals(self, size):
+        if self.program_trace is not None:
+            self.program_trace.flush()
         prev_stage = self.stages[-1] if self.stages else None
         programs_tried = self.total_programs - prev_stage.total_programs if prev_stage else 0
 
@@ -164,18 +233,22 @@ class Stats:
         
         self.stages.append(Stage(size, self.total_programs, programs_tried, total_exec_time, exec_time))
 
-        self.logger.debug(f'Programs tried: {programs_tried} Exec Time: {exec_time:0.3f}s Total Exec Time: {total_exec_time:0.3f}s\n')
+        self.logger.debug('Programs tried: %d Exec Time: %0.3fs Total Exec Time: %0.3fs\n', programs_tried, exec_time, total_exec_time)
 
-        self.logger.debug(f'{"*" * 20} MAX LITERALS: {size} {"*" * 20}')
+        self.logger.debug('%s MAX LITERALS: %d %s', "*" * 20, size, "*" * 20)
 
         self.num_literals = size
     
     def register_program(self, program, conf_matrix):
         self.total_programs +=1
-        
-        self.logger.debug(f'Program {self.total_programs}:')
-        self.logger.debug(format_program(program))
-        self.logger.debug(format_conf_matrix(conf_matrix))
+
+        # called for every hypothesis: only format what is actually emitted
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Program %d:', self.total_programs)
+            self.logger.debug(format_program(program))
+            self.logger.debug(format_conf_matrix(conf_matrix))
+        if self.program_trace is not None:
+            self.program_trace.write(self.total_programs, self.num_literals, program, conf_matrix)
     
     def register_best_program(self, program, conf_matrix):
         prog_stats = self.make_program_stats(program, conf_matrix)
@@ -205,16 +278,21 @@ class Stats:
     def register_solution(self, program, conf_matrix):
         prog_stats = self.make_program_stats(program, conf_matrix)
         self.solution = prog_stats
+        if self.program_trace is not None:
+            self.program_trace.flush()
 
     def register_completion(self):
         self.logger.info('NO MORE SOLUTIONS')
         self.final_exec_time = self.total_exec_time()
+        if self.program_trace is not None:
+            self.program_trace.flush()
 
     def register_rules(self, rules):
-        self.logger.debug('Rules:')
-        for rule in rules:
-            self.logger.debug(Constrain.format_constraint(rule))
-        self.logger.debug('\n')
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Rules:')
+            for rule in rules:
+                self.logger.debug(Constrain.format_constraint(rule))
+            self.logger.debug('\n')
 
         self.total_rules += len(rules)
     
@@ -238,7 +316,7 @@ class Stats:
         for summary in self.duration_summary():
             message += f'{summary.operation}:\n\tCalled: {summary.called} times \t ' + \
                        f'Total: {summary.total:0.2f} \t Mean: {summary.mean:0.3f} \t ' + \
-                       f'Max: {summary.maximum:0.3f}\n'
+                       f'Max: {summary.maximum:0.3f} \t P95: {summary.p95:0.3f}\n'
             if summary.operation != 'basic setup':
                 total_op_time += summary.total
         message += f'Total operation time: {total_op_time:0.2f}s\n'
@@ -248,11 +326,9 @@ class Stats:
     def duration_summary(self):
         summary = []
         for operation, durations in self.durations.items():
-            called = len(durations)
-            total = sum(durations)
-            mean = sum(durations)/len(durations)
-            maximum = max(durations)
-            summary.append(DurationSummary(operation.title(), called, total, mean, maximum))
+            summary.append(DurationSummary(operation.title(), durations.count, durations.total,
+                durations.mean, durations.maximum, durations.minimum,
+                durations.percentile(0.5), durations.percentile(0.95), durations.percentile(0.99)))
         return summary
 
     @contextmanager
@@ -265,9 +341,8 @@ class Stats:
             duration = end - start
 
             if operation not in self.durations:
-                self.durations[operation] = [duration]
-            else:
-                self.durations[operation].append(duration)
+                self.durations[operation] = DurationHistogram()
+            self.durations[operation].add(duration)
 
 class Stage:
     def __init__(self, num_literals, total_programs, programs, total_exec_time, exec_time):
@@ -288,10 +363,104 @@ class ProgramStats:
         
         self.is_solution = fn == fp == 0
 
+class DurationHistogram:
+    """
+    Streaming aggregate of the durations of one operation: count, total, min,
+    max and a log-bucketed histogram, so memory and summaries are O(1) in the
+    number of calls. Bucket i holds the durations in (GROWTH**(i-1), GROWTH**i];
+    a percentile is the geometric middle of its bucket (within ~9%).
+    """
+    GROWTH = 2 ** 0.25
+    MIN_DURATION = 1e-9
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+        self.buckets = {}
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        if duration < self.minimum:
+            self.minimum = duration
+        if duration > self.maximum:
+            self.maximum = duration
+        i = math.ceil(math.log(max(duration, self.MIN_DURATION), self.GROWTH))
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        for i, n in other.buckets.items():
+            self.buckets[i] = self.buckets.get(i, 0) + n
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def bounds(self):
+        """(upper bound, cumulative count) of the non-empty buckets, ascending."""
+        cumulative = 0
+        for i in sorted(self.buckets):
+            cumulative += self.buckets[i]
+            yield self.GROWTH ** i, cumulative
+
+    def count_at_most(self, exponent):
+        """Number of durations in the buckets up to GROWTH**exponent."""
+        return sum(n for i, n in self.buckets.items() if i <= exponent)
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for upper, cumulative in self.bounds():
+            if cumulative >= rank:
+                return min(max(upper / math.sqrt(self.GROWTH), self.minimum), self.maximum)
+        return self.maximum
+
 class DurationSummary:
-    def __init__(self, operation, called, total, mean, maximum):
+    def __init__(self, operation, called, total, mean, maximum, minimum=0.0, p50=0.0, p95=0.0, p99=0.0):
         self.operation = operation
         self.called = called
         self.total = total
         self.mean = mean
-        self.maximum = maximum
\ No newline at end of file
+        self.maximum = maximum
+        self.minimum = minimum
+        self.p50 = p50
+        self.p95 = p95
+        self.p99 = p99
+
+# exponents of GROWTH of the exported histogram buckets: every power of two
+# from 2**-17 (~7.6us) to 2**7 (128s), the same for every stage and scrape
+EXPORT_BUCKETS = tuple(range(-68, 29, 4))
+
+def export_duration_metrics(stats, path, prefix='popper'):
+    """
+    Write the stage durations of stats to path in the Prometheus text format
+    (node_exporter textfile collector): one histogram per stage, with the
+    fixed buckets of EXPORT_BUCKETS, plus min/max.
+    """
+    name = f'{prefix}_stage_duration_seconds'
+    lines = [f'# HELP {name} Duration of the Popper loop stages.', f'# TYPE {name} histogram']
+    for operation, durations in sorted(stats.durations.items()):
+        for exponent in EXPORT_BUCKETS:
+            upper = DurationHistogram.GROWTH ** exponent
+            lines.append(f'{name}_bucket{{stage="{operation}",le="{upper:.6g}"}} {durations.count_at_most(exponent)}')
+        lines.append(f'{name}_bucket{{stage="{operation}",le="+Inf"}} {durations.count}')
+        lines.append(f'{name}_sum{{stage="{operation}"}} {durations.total:.9g}')
+        lines.append(f'{name}_count{{stage="{operation}"}} {durations.count}')
+    for bound in ('min', 'max'):
+        lines.append(f'# TYPE {name}_{bound} gauge')
+        for operation, durations in sorted(stats.durations.items()):
+            value = durations.minimum if bound == 'min' else durations.maximum
+            lines.append(f'{name}_{bound}{{stage="{operation}"}} {value if durations.count else 0:.9g}')
+    lines.append(f'# TYPE {prefix}_programs_total counter')
+    lines.append(f'{prefix}_programs_total {stats.total_programs}')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, path)
\ No newline at end of file
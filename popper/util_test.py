@@ -0,0 +1,105 @@
+"""Tests for the duration histograms of Stats."""
+
+import math
+
+import pytest
+
+from popper.util import EXPORT_BUCKETS, DurationHistogram, Stats, export_duration_metrics
+
+GROWTH = DurationHistogram.GROWTH
+
+
+def test_bucket_boundaries():
+    histogram = DurationHistogram()
+    # bucket i holds (GROWTH**(i-1), GROWTH**i]: an upper bound is in its own bucket
+    for duration in (1.0, GROWTH, GROWTH * 1.0001, 0.0):
+        histogram.add(duration)
+
+    assert histogram.buckets == {0: 1, 1: 1, 2: 1, math.ceil(math.log(DurationHistogram.MIN_DURATION, GROWTH)): 1}
+    bounds = list(histogram.bounds())
+    assert [cumulative for _, cumulative in bounds] == [1, 2, 3, 4]
+    assert bounds[1:] == [(1.0, 2), (GROWTH, 3), (GROWTH ** 2, 4)]
+
+
+def test_summary():
+    histogram = DurationHistogram()
+    for duration in (0.002, 0.004, 0.006):
+        histogram.add(duration)
+
+    assert histogram.count == 3
+    assert histogram.total == pytest.approx(0.012)
+    assert histogram.mean == pytest.approx(0.004)
+    assert (histogram.minimum, histogram.maximum) == (0.002, 0.006)
+
+
+@pytest.mark.parametrize('q', [0.5, 0.9, 0.95, 0.99])
+def test_percentile_within_bucket_error(q):
+    durations = [0.0001 * 1.01 ** i for i in range(1000)]
+    histogram = DurationHistogram()
+    for duration in durations:
+        histogram.add(duration)
+
+    exact = sorted(durations)[math.ceil(q * len(durations)) - 1]
+    # the geometric middle of a bucket is within sqrt(GROWTH) of any duration in it
+    assert histogram.percentile(q) == pytest.approx(exact, rel=math.sqrt(GROWTH) - 1)
+
+
+def test_percentile_is_clamped_to_min_and_max():
+    histogram = DurationHistogram()
+    assert histogram.percentile(0.5) == 0.0
+    histogram.add(0.5)
+    assert histogram.percentile(0.0) == histogram.percentile(1.0) == 0.5
+
+
+def test_merge():
+    a, b, both = DurationHistogram(), DurationHistogram(), DurationHistogram()
+    for i, duration in enumerate([0.001, 0.01, 0.1, 1.0, 0.003]):
+        (a if i % 2 else b).add(duration)
+        both.add(duration)
+    a.merge(b)
+
+    assert (a.count, a.buckets, a.minimum, a.maximum) == (both.count, both.buckets, both.minimum, both.maximum)
+    assert a.total == pytest.approx(both.total)
+
+
+def test_stats_duration_summary_and_metrics(tmp_path):
+    stats = Stats()
+    for _ in range(3):
+        with stats.duration('test'):
+            pass
+    (summary,) = stats.duration_summary()
+    assert (summary.operation, summary.called) == ('Test', 3)
+    assert summary.minimum <= summary.p50 <= summary.p95 <= summary.maximum
+
+    path = tmp_path / 'popper.prom'
+    export_duration_metrics(stats, str(path))
+    lines = path.read_text().splitlines()
+    assert 'popper_stage_duration_seconds_count{stage="test"} 3' in lines
+    assert 'popper_stage_duration_seconds_bucket{stage="test",le="+Inf"} 3' in lines
+
+
+def test_metrics_buckets_are_fixed_and_cumulative(tmp_path):
+    stats = Stats()
+    for operation, durations in (('test', [0.001, 0.002, 0.5]), ('ground', [3.0])):
+        stats.durations[operation] = DurationHistogram()
+        for duration in durations:
+            stats.durations[operation].add(duration)
+
+    path = tmp_path / 'popper.prom'
+    export_duration_metrics(stats, str(path))
+    buckets = {}
+    for line in path.read_text().splitlines():
+        if line.startswith('popper_stage_duration_seconds_bucket'):
+            labels, value = line.split('} ')
+            stage, le = labels.split('stage="')[1].split('",le="')
+            buckets.setdefault(stage, []).append((le.rstrip('"'), int(value)))
+
+    # the same boundaries for every stage, whatever durations it saw
+    assert [le for le, _ in buckets['test']] == [le for le, _ in buckets['ground']]
+    assert len(buckets['test']) == len(EXPORT_BUCKETS) + 1
+    for stage, total in (('test', 3), ('ground', 1)):
+        counts = [count for _, count in buckets[stage]]
+        assert counts == sorted(counts) and counts[-1] == total
+    # 2**-10 < 0.001 <= 2**-9 < 0.002 <= 2**-8
+    le = {power: '%.6g' % GROWTH ** (4 * power) for power in (-10, -9, -8)}
+    assert [dict(buckets['test'])[le[power]] for power in (-10, -9, -8)] == [0, 1, 2]